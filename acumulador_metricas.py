@@ -0,0 +1,540 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Acumulador de Métricas
+======================
+Agregados das métricas de um colaborador que podem ser alimentados em
+blocos de linhas. A memória ocupada depende só da quantidade de datas e
+status distintos (nunca do número de linhas), o que permite processar abas
+muito grandes lendo-as em partes (leitor_excel.ler_aba_em_blocos).
+
+O resultado de metricas() é o mesmo dicionário produzido por
+AnalisadorExcel.calcular_metricas_colaborador.
+
+Os status são guardados pelos códigos do vocabulário de status
+(vocabulario_status): a distribuição é um array com um contador por código
+e os rótulos só são recuperados ao montar as métricas.
+
+As contagens por dia ficam em um cubo dia x status (um DataFrame com um
+dia normalizado por linha e um código de status por coluna, -1 para status
+vazio), montado com uma única contagem agrupada. Médias diárias, tendência
+e padrão semanal saem desse cubo. Quem precisa das contagens por dia (ex.:
+o histórico em execucao_diaria) pede o cubo com metricas(...,
+incluir_cubo=True); ele não entra nas métricas comuns, que são exportadas
+em JSON.
+
+acumular_por_grupo() preenche os agregados de todos os colaboradores de
+uma planilha em formato longo (uma coluna de colaborador) de uma só vez,
+com operações agrupadas sobre o DataFrame inteiro.
+"""
+
+import traceback
+
+import numpy as np
+import pandas as pd
+
+from regressao_lote import regressao_em_lote
+from esboco_quantis import EsbocoQuantis
+from vocabulario_status import obter_vocabulario_padrao
+
+# Tempos de resolução aceitos (em dias); fora disso são considerados erros
+TEMPO_MAXIMO_RESOLUCAO = 365
+
+# Capacidade padrão do esboço de quantis (erro de posto em torno de 1%)
+K_ESBOCO_PADRAO = 200
+
+# Seções calculadas a partir do cubo dia x status
+SECOES_CUBO = {'medias_diarias', 'tendencia', 'padrao_semanal'}
+
+# Dias da semana na ordem de desempate do padrão semanal
+DIAS_SEMANA = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _quantil(histograma, total, q):
+    """Quantil com interpolação linear (mesmo resultado de Series.quantile) a partir do histograma"""
+    acumulado = np.cumsum(histograma)
+    posicao = (total - 1) * q
+    inferior = int(np.floor(posicao))
+    superior = min(inferior + 1, total - 1)
+    a = float(np.searchsorted(acumulado, inferior, side='right'))
+    b = float(np.searchsorted(acumulado, superior, side='right'))
+    t = posicao - inferior
+    # Mesma fórmula de interpolação do NumPy
+    diferenca = b - a
+    return b - diferenca * (1 - t) if t >= 0.5 else a + diferenca * t
+
+
+class AcumuladorMetricas:
+    """Agregados mescláveis das métricas de um colaborador"""
+
+    def __init__(self, quantis_exatos=True, k_esboco=K_ESBOCO_PADRAO, vocabulario=None):
+        """
+        Args:
+            quantis_exatos (bool): Mediana e quartis dos tempos de resolução
+                pelo histograma exato (um contador por dia); com False, por
+                um esboço KLL de erro configurável e soma exata para a média
+            k_esboco (int): Capacidade do esboço (erro de posto ~1.7 / k)
+            vocabulario (VocabularioStatus, optional): Códigos dos status
+                (padrão: o vocabulário compartilhado)
+        """
+        self.vocabulario = obter_vocabulario_padrao() if vocabulario is None else vocabulario
+        self.total_registros = 0
+        # Contagem por código de status
+        self.contagem_status = np.zeros(len(self.vocabulario), dtype=np.int64)
+        self.nao_pendentes = 0
+        self.quantis_exatos = quantis_exatos
+        self.histograma_resolucao = np.zeros(TEMPO_MAXIMO_RESOLUCAO + 1, dtype=np.int64)
+        self.esboco_resolucao = None if quantis_exatos else EsbocoQuantis(k_esboco)
+        self.soma_resolucao = 0
+        # Cubo dia x código do status (-1 = status vazio) com a quantidade de registros
+        self.cubo = _cubo_vazio()
+        # Códigos de status na ordem em que apareceram (desempate da distribuição)
+        self.ordem_status = {}
+        # Seções cujo cálculo falhou em algum bloco (o resultado volta ao valor padrão)
+        self.falhas = set()
+
+    def adicionar(self, df):
+        """
+        Acumula um bloco de linhas.
+
+        Args:
+            df (DataFrame): Linhas com DATA já convertida e sem datas nulas,
+                STATUS e, opcionalmente, RESOLUCAO convertida
+        """
+        self.total_registros += len(df)
+
+        codigos = None
+        try:
+            codigos = self.vocabulario.codificar(df['STATUS'])
+            self.contagem_status = self.vocabulario.somar(self.contagem_status, self.vocabulario.contar(codigos))
+            for codigo in pd.unique(codigos[codigos >= 0]):
+                self.ordem_status.setdefault(int(codigo), None)
+        except Exception as e:
+            print(f"Erro ao calcular distribuição de status: {str(e)}")
+            self.falhas.add('status')
+
+        try:
+            if 'RESOLUCAO' in df.columns:
+                self._adicionar_resolucao(df)
+        except Exception as e:
+            print(f"Erro ao processar tempos de resolução: {str(e)}")
+            traceback.print_exc()
+            self.falhas.add('resolucao')
+
+        try:
+            # Status vazios contam como não pendentes
+            pendentes = self.vocabulario.pendentes()
+            self.nao_pendentes += int(((codigos < 0) | ~pendentes[codigos]).sum())
+        except Exception as e:
+            print(f"Erro ao calcular taxa de eficiência: {str(e)}")
+            self.falhas.add('eficiencia')
+
+        try:
+            if codigos is None:
+                # Sem os códigos, o cubo ainda serve à tendência e ao padrão semanal
+                self.falhas.add('medias_diarias')
+                codigos = np.full(len(df), -1, dtype=np.int64)
+            self.cubo = _somar_cubos(self.cubo, montar_cubo(df['DATA'], codigos))
+        except Exception as e:
+            print(f"Erro ao montar o cubo dia x status: {str(e)}")
+            traceback.print_exc()
+            self.falhas |= SECOES_CUBO
+
+    def mesclar(self, outro):
+        """
+        Soma os agregados de outro acumulador (ex.: de linhas lidas em outra execução).
+
+        Args:
+            outro (AcumuladorMetricas): Acumulador com linhas disjuntas das deste
+        """
+        self.total_registros += outro.total_registros
+        self.contagem_status = self.vocabulario.somar(self.contagem_status, outro.contagem_status)
+        self.nao_pendentes += outro.nao_pendentes
+        self.histograma_resolucao += outro.histograma_resolucao
+        if self.esboco_resolucao is not None:
+            self.esboco_resolucao.mesclar(outro.esboco_resolucao)
+            self.soma_resolucao += outro.soma_resolucao
+        self.cubo = _somar_cubos(self.cubo, outro.cubo)
+        for status in outro.ordem_status:
+            self.ordem_status.setdefault(status, None)
+        self.falhas |= outro.falhas
+        return self
+
+    def __getstate__(self):
+        # Os códigos só valem no vocabulário deste processo: grava os rótulos junto
+        estado = self.__dict__.copy()
+        estado['rotulos_status'] = list(estado.pop('vocabulario').rotulos)
+        return estado
+
+    def __setstate__(self, estado):
+        rotulos = estado.pop('rotulos_status')
+        self.__dict__.update(estado)
+        self.vocabulario = obter_vocabulario_padrao()
+        mapa = np.array([self.vocabulario.codigo(rotulo) for rotulo in rotulos], dtype=np.int64)
+
+        contagem = np.zeros(len(self.vocabulario), dtype=np.int64)
+        np.add.at(contagem, mapa[:len(self.contagem_status)], self.contagem_status)
+        self.contagem_status = contagem
+        self.ordem_status = {int(mapa[codigo]): None for codigo in self.ordem_status}
+        # Códigos que passaram a coincidir (ex.: grafia fixada depois) são somados
+        cubo = self.cubo.rename(columns=lambda codigo: int(mapa[codigo]) if codigo >= 0 else codigo)
+        self.cubo = cubo.T.groupby(level=0).sum().T.astype(np.int64)
+
+    def adicionar_tempos_resolucao(self, dias):
+        """Acumula tempos de resolução (em dias, já dentro do intervalo aceito)"""
+        if self.esboco_resolucao is None:
+            self.histograma_resolucao += np.bincount(dias, minlength=TEMPO_MAXIMO_RESOLUCAO + 1)
+        else:
+            self.esboco_resolucao.adicionar(dias)
+            self.soma_resolucao += int(dias.sum())
+
+    def _adicionar_resolucao(self, df):
+        """Acumula os tempos de resolução do bloco"""
+        df_resolvidos = df.dropna(subset=['RESOLUCAO'])
+        if df_resolvidos.empty:
+            return
+
+        try:
+            _, dias = _tempos_resolucao(df_resolvidos)
+            self.adicionar_tempos_resolucao(dias)
+        except Exception as e:
+            print(f"Erro ao calcular tempo de resolução: {str(e)}")
+            traceback.print_exc()
+            self.falhas.add('resolucao')
+
+    def _metricas_resolucao(self):
+        """Média, mediana e outliers (método IQR) dos tempos de resolução"""
+        if self.esboco_resolucao is not None:
+            return self._metricas_resolucao_esboco()
+
+        total = int(self.histograma_resolucao.sum())
+        if 'resolucao' in self.falhas or total == 0:
+            return None, None, 0
+
+        dias = np.arange(len(self.histograma_resolucao))
+        tempo_medio = round(float((dias * self.histograma_resolucao).sum()) / total, 1)
+        tempo_mediano = round(_quantil(self.histograma_resolucao, total, 0.5), 1)
+
+        Q1 = _quantil(self.histograma_resolucao, total, 0.25)
+        Q3 = _quantil(self.histograma_resolucao, total, 0.75)
+        IQR = Q3 - Q1
+        fora = (dias < (Q1 - 1.5 * IQR)) | (dias > (Q3 + 1.5 * IQR))
+        outliers = int(self.histograma_resolucao[fora].sum())
+        return tempo_medio, tempo_mediano, outliers
+
+    def _metricas_resolucao_esboco(self):
+        """Mesmas métricas de _metricas_resolucao, estimadas pelo esboço de quantis"""
+        esboco = self.esboco_resolucao
+        if 'resolucao' in self.falhas or esboco.total == 0:
+            return None, None, 0
+
+        tempo_medio = round(self.soma_resolucao / esboco.total, 1)
+        tempo_mediano = round(esboco.quantil(0.5), 1)
+
+        Q1 = esboco.quantil(0.25)
+        Q3 = esboco.quantil(0.75)
+        IQR = Q3 - Q1
+        abaixo = esboco.posto(Q1 - 1.5 * IQR, inclusivo=False)
+        acima = esboco.total - esboco.posto(Q3 + 1.5 * IQR)
+        return tempo_medio, tempo_mediano, abaixo + acima
+
+    def _tendencia(self):
+        """Tendência do volume diário"""
+        return tendencias_em_lote([self])[0]
+
+    def metricas(self, nome_colaborador, tendencia=None, incluir_cubo=False):
+        """
+        Monta o dicionário de métricas a partir dos agregados.
+
+        Args:
+            nome_colaborador (str): Nome do colaborador
+            tendencia (dict, optional): Tendência já calculada (ex.: por tendencias_em_lote)
+            incluir_cubo (bool, optional): Inclui o cubo dia x status
+                ('cubo_dia_status', ver cubo_dataframe)
+
+        Returns:
+            dict: Mesmo formato de calcular_metricas_colaborador
+        """
+        total_registros = self.total_registros
+
+        if 'status' in self.falhas:
+            distribuicao_status = {}
+            distribuicao_percentual = {}
+        else:
+            distribuicao_status = self.vocabulario.distribuicao(self.contagem_status, self.ordem_status)
+            # Converter para porcentagens
+            distribuicao_percentual = {k: round(v / total_registros * 100, 1) for k, v in distribuicao_status.items()}
+
+        tempo_medio_resolucao, tempo_mediano_resolucao, outliers_resolucao = self._metricas_resolucao()
+
+        taxa_eficiencia = None
+        if 'eficiencia' not in self.falhas:
+            taxa_eficiencia = round(self.nao_pendentes / total_registros, 3) if total_registros > 0 else 0
+
+        medias_diarias = {}
+        if 'medias_diarias' not in self.falhas:
+            # Média de cada status nos dias em que ele aparece
+            soma = self.cubo.sum()
+            dias = (self.cubo > 0).sum()
+            for codigo in self.ordem_status:
+                if dias.get(codigo, 0):
+                    medias_diarias[self.vocabulario.rotulo(codigo)] = round(float(soma[codigo] / dias[codigo]), 1)
+
+        padrao_semanal = {}
+        if 'padrao_semanal' not in self.falhas:
+            totais = self.cubo.sum(axis=1)
+            por_dia = totais.groupby(totais.index.day_name()).sum().reindex(DIAS_SEMANA).dropna()
+            padrao_semanal = {dia: int(n) for dia, n in por_dia.sort_values(ascending=False, kind='stable').items()}
+
+        metricas = {
+            'nome': nome_colaborador,
+            'total_registros': total_registros,
+            'distribuicao_status': distribuicao_status,
+            'distribuicao_percentual': distribuicao_percentual,
+            'tempo_medio_resolucao': tempo_medio_resolucao,
+            'tempo_mediano_resolucao': tempo_mediano_resolucao,
+            'outliers_resolucao': outliers_resolucao,
+            'taxa_eficiencia': taxa_eficiencia,
+            'medias_diarias': medias_diarias,
+            'tendencia': self._tendencia() if tendencia is None else tendencia,
+            'padrao_semanal': padrao_semanal
+        }
+
+        if incluir_cubo:
+            metricas['cubo_dia_status'] = {}
+            if not SECOES_CUBO & self.falhas:
+                metricas['cubo_dia_status'] = {
+                    'dias': [dia.strftime('%Y-%m-%d') for dia in self.cubo.index],
+                    'status': [self.vocabulario.rotulo(codigo) if codigo >= 0 else None for codigo in self.cubo.columns],
+                    'contagens': self.cubo.to_numpy().tolist()
+                }
+        return metricas
+
+
+def tendencias_em_lote(acumuladores):
+    """
+    Tendência do volume diário de vários acumuladores em uma única regressão.
+
+    O eixo x é o número de dias desde a primeira data de cada colaborador e
+    o eixo y, a quantidade de registros no dia.
+
+    Returns:
+        list: Dicionário de tendência de cada acumulador, na mesma ordem
+    """
+    tendencias = [{} for _ in acumuladores]
+    posicoes, dias, contagens = [], [], []
+    for posicao, acumulador in enumerate(acumuladores):
+        if 'tendencia' in acumulador.falhas:
+            tendencias[posicao] = {'direcao': 'estável', 'r2': 0}
+        elif len(acumulador.cubo) > 1:
+            # Registros por dia: linhas do cubo (já em ordem de data)
+            posicoes.append(posicao)
+            dias.append((acumulador.cubo.index - acumulador.cubo.index[0]).days)
+            contagens.append(acumulador.cubo.to_numpy().sum(axis=1))
+    if not posicoes:
+        return tendencias
+
+    try:
+        ajuste = regressao_em_lote(contagens, dias)
+    except Exception as e:
+        print(f"Erro ao analisar tendência: {str(e)}")
+        traceback.print_exc()
+        for posicao in posicoes:
+            tendencias[posicao] = {'direcao': 'estável', 'r2': 0}
+        return tendencias
+
+    for linha, posicao in enumerate(posicoes):
+        # Volume constante: sem correlação
+        corr = 0.0 if np.isnan(ajuste['correlacao'][linha]) else float(ajuste['correlacao'][linha])
+        r2 = 0.0 if np.isnan(ajuste['r2'][linha]) else max(0.0, float(ajuste['r2'][linha]))
+
+        # Determinar direção da tendência
+        if corr > 0.1:
+            direcao = 'crescente'
+        elif corr < -0.1:
+            direcao = 'decrescente'
+        else:
+            direcao = 'estável'
+
+        tendencias[posicao] = {
+            'direcao': direcao,
+            'correlacao': round(corr, 2),
+            'r2': round(r2, 2),
+            'slope': round(float(ajuste['slope'][linha]), 4),
+            'intercept': round(float(ajuste['intercept'][linha]), 2)
+        }
+    return tendencias
+
+
+def _cubo_vazio():
+    return pd.DataFrame(index=pd.DatetimeIndex([]), dtype=np.int64)
+
+
+def montar_cubo(datas, codigos_status, grupos=None):
+    """
+    Conta os registros por dia e código de status em uma única contagem agrupada.
+
+    Args:
+        datas (Series): Datas (datetime64) dos registros
+        codigos_status (ndarray): Código do status de cada registro (-1 = vazio)
+        grupos (ndarray, optional): Código do grupo de cada registro; com
+            ele, o índice do cubo passa a ser (grupo, dia)
+
+    Returns:
+        DataFrame: Dias normalizados (ordenados) x códigos de status
+    """
+    dias = datas.dt.normalize().to_numpy()
+    chaves = [dias, codigos_status] if grupos is None else [grupos, dias, codigos_status]
+    contagem = pd.Series(codigos_status).groupby(chaves).size()
+    return contagem.unstack(fill_value=0).astype(np.int64)
+
+
+def _somar_cubos(cubo, outro):
+    """Soma dois cubos dia x status (dias e status de ambos)"""
+    if outro.empty:
+        return cubo
+    if cubo.empty:
+        return outro
+    soma = cubo.add(outro, fill_value=0).fillna(0)
+    return soma.sort_index().sort_index(axis=1).astype(np.int64)
+
+
+def cubo_dataframe(cubo_dia_status):
+    """
+    Reconstrói o cubo dia x status das métricas ('cubo_dia_status', pedido com incluir_cubo=True).
+
+    Returns:
+        DataFrame: Um dia por linha (DatetimeIndex) e um status por coluna
+            (None = status vazio)
+    """
+    return pd.DataFrame(cubo_dia_status.get('contagens', []),
+                        index=pd.to_datetime(cubo_dia_status.get('dias', [])),
+                        columns=cubo_dia_status.get('status', []))
+
+
+def _tempos_resolucao(df_resolvidos):
+    """Tempos de resolução em dias e a máscara dos aceitos (negativos ou muito altos são erros)"""
+    # Converter para datetime se ainda não for
+    if not pd.api.types.is_datetime64_dtype(df_resolvidos['DATA']):
+        df_resolvidos.loc[:, 'DATA'] = pd.to_datetime(df_resolvidos['DATA'])
+    if not pd.api.types.is_datetime64_dtype(df_resolvidos['RESOLUCAO']):
+        df_resolvidos.loc[:, 'RESOLUCAO'] = pd.to_datetime(df_resolvidos['RESOLUCAO'])
+
+    tempo_resolucao = (df_resolvidos['RESOLUCAO'] - df_resolvidos['DATA']).dt.days
+    validos = ((tempo_resolucao >= 0) & (tempo_resolucao <= TEMPO_MAXIMO_RESOLUCAO)).to_numpy()
+    return validos, tempo_resolucao[validos].to_numpy(dtype=np.int64)
+
+
+def _adicionar_resolucao_por_grupo(acumuladores, df_resolvidos, codigos):
+    """Acumula os tempos de resolução de cada grupo"""
+    if df_resolvidos.empty:
+        return
+    validos, dias = _tempos_resolucao(df_resolvidos)
+    codigos = codigos[validos]
+    total_grupos = len(acumuladores)
+
+    if all(acumulador.esboco_resolucao is None for acumulador in acumuladores):
+        # Histogramas de todos os grupos em um único bincount (grupo x dia)
+        colunas = TEMPO_MAXIMO_RESOLUCAO + 1
+        matriz = np.bincount(codigos * colunas + dias, minlength=total_grupos * colunas)
+        for acumulador, histograma in zip(acumuladores, matriz.reshape(total_grupos, colunas)):
+            acumulador.histograma_resolucao += histograma
+        return
+
+    ordem = np.argsort(codigos, kind='stable')
+    limites = np.searchsorted(codigos[ordem], np.arange(total_grupos + 1))
+    for codigo, acumulador in enumerate(acumuladores):
+        selecionados = ordem[limites[codigo]:limites[codigo + 1]]
+        if len(selecionados):
+            acumulador.adicionar_tempos_resolucao(dias[selecionados])
+
+
+def acumular_por_grupo(df, coluna_grupo, **opcoes):
+    """
+    Acumula as métricas de todos os grupos (colaboradores) de uma só vez.
+
+    Equivale a chamar AcumuladorMetricas.adicionar com o recorte de cada
+    grupo, mas com uma passada agrupada por seção em vez de um filtro do
+    DataFrame inteiro por colaborador.
+
+    Args:
+        df (DataFrame): Linhas com DATA já convertida e sem datas nulas,
+            STATUS, a coluna de grupo e, opcionalmente, RESOLUCAO convertida
+        coluna_grupo (str): Coluna que identifica o colaborador
+        **opcoes: Repassadas a AcumuladorMetricas (ex.: quantis_exatos)
+
+    Returns:
+        dict: AcumuladorMetricas por grupo, na ordem de aparição (grupos nulos são ignorados)
+    """
+    codigos, grupos = pd.factorize(df[coluna_grupo], sort=False)
+    presentes = codigos >= 0
+    if not presentes.all():
+        df = df[presentes]
+        codigos = codigos[presentes]
+    total_grupos = len(grupos)
+    acumuladores = [AcumuladorMetricas(**opcoes) for _ in range(total_grupos)]
+
+    def falhar(secao, mensagem, e, grupos_afetados=None, detalhar=False):
+        print(f"{mensagem}: {str(e)}")
+        if detalhar:
+            traceback.print_exc()
+        for codigo, acumulador in enumerate(acumuladores):
+            if grupos_afetados is None or grupos_afetados[codigo]:
+                acumulador.falhas.add(secao)
+
+    for acumulador, total in zip(acumuladores, np.bincount(codigos, minlength=total_grupos)):
+        acumulador.total_registros = int(total)
+
+    vocabulario = acumuladores[0].vocabulario if acumuladores else obter_vocabulario_padrao()
+    codigos_status = None
+    try:
+        codigos_status = vocabulario.codificar(df['STATUS'])
+        com_status = codigos_status >= 0
+        # Distribuição de todos os grupos em um único bincount (grupo x status)
+        total_status = len(vocabulario)
+        matriz = np.bincount(codigos[com_status] * total_status + codigos_status[com_status],
+                             minlength=total_grupos * total_status).reshape(total_grupos, total_status)
+        for acumulador, contagem in zip(acumuladores, matriz):
+            acumulador.contagem_status = vocabulario.somar(acumulador.contagem_status, contagem)
+        primeiros = ~pd.DataFrame({'g': codigos[com_status], 's': codigos_status[com_status]}).duplicated().to_numpy()
+        for codigo, status in zip(codigos[com_status][primeiros], codigos_status[com_status][primeiros]):
+            acumuladores[codigo].ordem_status.setdefault(int(status), None)
+    except Exception as e:
+        falhar('status', "Erro ao calcular distribuição de status", e)
+
+    if 'RESOLUCAO' in df.columns:
+        resolvidos = df['RESOLUCAO'].notna().to_numpy()
+        com_resolucao = np.bincount(codigos[resolvidos], minlength=total_grupos) > 0
+        try:
+            _adicionar_resolucao_por_grupo(acumuladores, df[resolvidos], codigos[resolvidos])
+        except Exception as e:
+            # Grupos sem nenhuma resolução não chegam à conversão e não falham
+            falhar('resolucao', "Erro ao calcular tempo de resolução", e, com_resolucao, detalhar=True)
+
+    try:
+        pendentes = vocabulario.pendentes()
+        nao_pendentes = np.bincount(codigos, weights=(codigos_status < 0) | ~pendentes[codigos_status],
+                                    minlength=total_grupos)
+        for acumulador, n in zip(acumuladores, nao_pendentes):
+            acumulador.nao_pendentes += int(n)
+    except Exception as e:
+        falhar('eficiencia', "Erro ao calcular taxa de eficiência", e)
+
+    try:
+        if codigos_status is None:
+            falhar('medias_diarias', "Erro ao calcular médias diárias", ValueError('status não codificados'))
+            codigos_status = np.full(len(df), -1, dtype=np.int64)
+        # Cubos de todos os grupos em uma única contagem (grupo, dia) x status
+        cubos = montar_cubo(df['DATA'], codigos_status, codigos)
+        for codigo, cubo in cubos.groupby(level=0, sort=False):
+            cubo = cubo.droplevel(0)
+            # Só os status que o grupo tem
+            acumuladores[codigo].cubo = _somar_cubos(acumuladores[codigo].cubo, cubo.loc[:, cubo.to_numpy().any(axis=0)])
+    except Exception as e:
+        print(f"Erro ao montar o cubo dia x status: {str(e)}")
+        traceback.print_exc()
+        for acumulador in acumuladores:
+            acumulador.falhas |= SECOES_CUBO
+
+    return dict(zip(grupos, acumuladores))
@@ -1,13 +1,38 @@
 import pandas as pd
 import os
 
-def analisar_detalhes_colaborador(df, colaborador):
+from qualidade_situacao import calcular_qualidade_abas
+
+def colunas_detalhadas(colunas):
+    """Colunas SITUAÇÃO e DATA como a análise detalhada as reconhece (nomes exatos)"""
+    situacao_col = None
+    if 'SITUAÇÃO' in colunas:
+        situacao_col = 'SITUAÇÃO'
+    elif 'SITUACAO' in colunas:
+        situacao_col = 'SITUACAO'
+    return situacao_col, 'DATA' if 'DATA' in colunas else None
+
+def calcular_qualidade_detalhada(abas):
+    """
+    Calcula as métricas de qualidade de várias abas em uma única passada.
+    
+    Args:
+        abas (iterable): Pares (nome da aba, DataFrame)
+        
+    Returns:
+        DataFrame: Uma linha por colaborador (ver qualidade_situacao.calcular_qualidade)
+    """
+    return calcular_qualidade_abas(abas, seletor=colunas_detalhadas)
+
+def analisar_detalhes_colaborador(df, colaborador, qualidade=None):
     """
     Analisa detalhadamente as colunas do Excel para um colaborador específico.
     
     Args:
         df (DataFrame): DataFrame com os dados do colaborador
         colaborador (str): Nome do colaborador
+        qualidade (Series, optional): Linha do colaborador em calcular_qualidade_detalhada;
+            se omitida, as métricas de qualidade são calculadas só para esta aba
     """
     print(f"\n{'='*80}")
     print(f"Análise Detalhada: {colaborador}")
@@ -60,15 +85,16 @@ def analisar_detalhes_colaborador(df, colaborador):
     print("\n5. MÉTRICAS DE QUALIDADE:")
     
     if situacao_col:
+        if qualidade is None:
+            qualidade = calcular_qualidade_detalhada([(colaborador, df)]).iloc[0]
+        
         # Taxa de preenchimento
-        taxa_preenchimento = df[situacao_col].notna().mean() * 100
+        taxa_preenchimento = qualidade['taxa_preenchimento'] * 100
         print(f"Taxa de preenchimento: {taxa_preenchimento:.1f}%")
         
         # Taxa de padronização
-        valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE', 'CONCLUIDO']
-        valores_unicos = df[situacao_col].dropna().unique()
-        valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
-        taxa_padronizacao = ((len(valores_unicos) - len(valores_nao_padronizados)) / len(valores_unicos)) * 100 if len(valores_unicos) > 0 else 0
+        valores_nao_padronizados = qualidade['valores_nao_padronizados']
+        taxa_padronizacao = qualidade['taxa_padronizacao'] * 100
         print(f"Taxa de padronização: {taxa_padronizacao:.1f}%")
         
         if valores_nao_padronizados:
@@ -79,33 +105,14 @@ def analisar_detalhes_colaborador(df, colaborador):
 
         # 6. Score Final
         print("\n6. SCORE FINAL:")
-        consistencia_diaria = calcular_consistencia_diaria(df, situacao_col)
-        score_final = (
-            0.4 * taxa_preenchimento/100 +  # 40% preenchimento
-            0.3 * taxa_padronizacao/100 +   # 30% padronização
-            0.3 * consistencia_diaria       # 30% consistência
-        ) * 100
+        consistencia_diaria = qualidade['consistencia_diaria']
+        score_final = qualidade['score_qualidade']
         
         print(f"Score Final: {score_final:.1f} pontos")
         print(f"- Componente Preenchimento: {taxa_preenchimento * 0.4:.1f} pontos")
         print(f"- Componente Padronização: {taxa_padronizacao * 0.3:.1f} pontos")
         print(f"- Componente Consistência: {consistencia_diaria * 30:.1f} pontos")
 
-def calcular_consistencia_diaria(df, situacao_col):
-    """Calcula a consistência diária das atualizações"""
-    if 'DATA' not in df.columns:
-        return 0
-    
-    try:
-        atualizacoes = df.groupby(df['DATA'].dt.date)[situacao_col].count()
-        if len(atualizacoes) > 1:
-            std_atualizacoes = atualizacoes.std()
-            media_atualizacoes = atualizacoes.mean()
-            return 1 - min(1, std_atualizacoes / media_atualizacoes)
-    except:
-        pass
-    return 0
-
 # Executar análise
 if __name__ == "__main__":
     arquivo_julio = os.path.join("F:\\", "okok", "(JULIO) LISTAS INDIVIDUAIS.xlsx")
@@ -121,8 +128,10 @@ if __name__ == "__main__":
     for arquivo in [arquivo_julio, arquivo_leandro]:
         print(f"\nAnalisando arquivo: {os.path.basename(arquivo)}")
         xls = pd.ExcelFile(arquivo)
+        abas = [(colaborador, pd.read_excel(xls, sheet_name=colaborador))
+                for colaborador in colaboradores if colaborador in xls.sheet_names]
+        qualidade = calcular_qualidade_detalhada(abas)
         
-        for colaborador in colaboradores:
-            if colaborador in xls.sheet_names:
-                df = pd.read_excel(arquivo, sheet_name=colaborador)
-                analisar_detalhes_colaborador(df, colaborador)
\ No newline at end of file
+        for colaborador, df in abas:
+            analisar_detalhes_colaborador(df, colaborador,
+                                          qualidade.loc[colaborador] if colaborador in qualidade.index else None)
\ No newline at end of file
@@ -9,9 +9,12 @@ na qualidade da análise baseada na coluna "SITUAÇÃO" de cada colaborador.
 """
 
 import os
+import time
+import heapq
+import argparse
 import pandas as pd
 import numpy as np
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -20,33 +23,52 @@ import traceback
 
 # Importações locais
 from debug_excel import AnalisadorExcel
+from leitor_excel import ler_abas, prescan_planilha, aba_de_colaborador
+from memoria_compartilhada import publicar_dataframe, anexar_dataframe
+from transicoes_estado import contar_transicoes
+from qualidade_situacao import calcular_qualidade
+from vocabulario_status import SITUACOES_SEM_CONCLUIDO, obter_vocabulario_padrao
 from analise_360 import Analise360
 from data_analysis_pipeline import DataAnalysisPipeline
 
-def analisar_situacao_colaborador(nome_arquivo, nome_aba):
+def normalizar_coluna_situacao(col):
+    """Normaliza o nome de uma coluna para a análise de SITUAÇÃO"""
+    col_norm = str(col).strip().upper()
+    if col_norm in ['SITUAÇÂO', 'SITUAÇÃO']:
+        col_norm = 'SITUACAO'
+    return col_norm
+
+def colunas_analise_situacao(colunas):
+    """Colunas lidas por analisar_situacao_colaborador: SITUAÇÃO e as que contêm DATA"""
+    return [col for col in colunas
+            if normalizar_coluna_situacao(col) == 'SITUACAO' or 'DATA' in normalizar_coluna_situacao(col)]
+
+def _analisar_situacao_compartilhada(nome_arquivo, nome_aba, descritor):
+    """Executa analisar_situacao_colaborador no processo do pool sobre a aba em memória compartilhada"""
+    with anexar_dataframe(descritor) as df:
+        resultado = analisar_situacao_colaborador(nome_arquivo, nome_aba, df=df)
+        del df
+    return resultado
+
+def analisar_situacao_colaborador(nome_arquivo, nome_aba, df=None):
     """
     Analisa a qualidade dos registros na coluna SITUAÇÃO para um colaborador específico.
     
     Args:
         nome_arquivo (str): Caminho para o arquivo Excel
         nome_aba (str): Nome da aba/colaborador a ser analisada
+        df (DataFrame, optional): Dados da aba já carregados; se omitido, a aba é lida do arquivo
         
     Returns:
         dict: Dicionário com métricas de qualidade dos registros
     """
     try:
-        # Carregar dados do colaborador
-        df = pd.read_excel(nome_arquivo, sheet_name=nome_aba)
+        # Carregar dados do colaborador (apenas se não foram entregues já lidos)
+        if df is None:
+            df = pd.read_excel(nome_arquivo, sheet_name=nome_aba)
         
         # Normalizar nomes das colunas
-        colunas_normalizadas = []
-        for col in df.columns:
-            col_norm = str(col).strip().upper()
-            if col_norm in ['SITUAÇÂO', 'SITUAÇÃO']:
-                col_norm = 'SITUACAO'
-            colunas_normalizadas.append(col_norm)
-        
-        df.columns = colunas_normalizadas
+        df.columns = [normalizar_coluna_situacao(col) for col in df.columns]
         
         # Verificar se a coluna SITUACAO existe
         if 'SITUACAO' not in df.columns:
@@ -58,15 +80,9 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             }
         
         # Análise de qualidade da coluna SITUACAO
-        total_registros = len(df)
-        registros_vazios = df['SITUACAO'].isna().sum()
         valores_unicos = df['SITUACAO'].dropna().unique()
         contagem_valores = df['SITUACAO'].value_counts().to_dict()
         
-        # Verificar padrões de preenchimento
-        valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE']
-        valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
-        
         # Verificar se há atualizações diárias
         tem_data = False
         atualizacoes_diarias = {}
@@ -85,27 +101,27 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
                 except:
                     pass
         
-        # Calcular métricas de qualidade
-        taxa_preenchimento = (total_registros - registros_vazios) / total_registros if total_registros > 0 else 0
-        taxa_padronizacao = (len(valores_unicos) - len(valores_nao_padronizados)) / len(valores_unicos) if len(valores_unicos) > 0 else 0
-        
-        # Verificar consistência nas atualizações diárias
-        consistencia_diaria = 0
-        if atualizacoes_diarias:
-            # Calcular desvio padrão das atualizações diárias
-            std_atualizacoes = np.std(list(atualizacoes_diarias.values()))
-            media_atualizacoes = np.mean(list(atualizacoes_diarias.values()))
-            
-            # Coeficiente de variação (menor é melhor)
-            if media_atualizacoes > 0:
-                consistencia_diaria = 1 - min(1, std_atualizacoes / media_atualizacoes)
-        
-        # Calcular score geral de qualidade
-        score_qualidade = (
-            0.4 * taxa_preenchimento +  # 40% para preenchimento
-            0.3 * taxa_padronizacao +   # 30% para padronização
-            0.3 * consistencia_diaria   # 30% para consistência diária
-        ) * 100
+        # Calcular métricas de qualidade (mesmo motor da validação; aqui o
+        # vocabulário não inclui CONCLUIDO, o desvio diário é o do np.std e
+        # basta um dia com data)
+        registros = pd.DataFrame({
+            'COLABORADOR': nome_aba,
+            'SITUACAO': df['SITUACAO'].to_numpy(dtype=object),
+            'DATA': df[coluna_data].to_numpy() if atualizacoes_diarias else pd.NaT
+        })
+        qualidade = calcular_qualidade(
+            registros,
+            valores_padronizados=SITUACOES_SEM_CONCLUIDO,
+            ddof=0,
+            minimo_dias=1
+        ).iloc[0]
+        total_registros = int(qualidade['total_registros'])
+        registros_vazios = int(qualidade['registros_vazios'])
+        valores_nao_padronizados = qualidade['valores_nao_padronizados']
+        taxa_preenchimento = qualidade['taxa_preenchimento']
+        taxa_padronizacao = qualidade['taxa_padronizacao']
+        consistencia_diaria = qualidade['consistencia_diaria']
+        score_qualidade = qualidade['score_qualidade']
         
         # Análise de transições de estado (se houver coluna de data)
         analise_transicoes = {}
@@ -115,17 +131,7 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             
             # Verificar transições de estado
             if 'SITUACAO' in df_ordenado.columns and len(df_ordenado) > 1:
-                transicoes = []
-                situacao_anterior = None
-                
-                for idx, row in df_ordenado.iterrows():
-                    situacao_atual = row['SITUACAO']
-                    if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
-                        transicoes.append((situacao_anterior, situacao_atual))
-                    situacao_anterior = situacao_atual
-                
-                # Contar transições
-                contagem_transicoes = Counter(transicoes)
+                contagem_transicoes, _ = contar_transicoes(df_ordenado['SITUACAO'])
                 analise_transicoes = {f"{de} -> {para}": contagem for (de, para), contagem in contagem_transicoes.items()}
         
         # Análise de tempo médio em cada situação
@@ -180,7 +186,13 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             
         if valores_nao_padronizados:
             problemas.append(f"{len(valores_nao_padronizados)} valores não padronizados: {', '.join(valores_nao_padronizados)}")
-            sugestoes.append("Padronizar valores de SITUACAO para: PENDENTE, VERIFICADO, APROVADO, QUITADO, CANCELADO, EM ANÁLISE")
+            sugestoes.append(f"Padronizar valores de SITUACAO para: {', '.join(SITUACOES_SEM_CONCLUIDO)}")
+            # Grafias que o mapeamento de status já associa a um status canônico
+            vocabulario = obter_vocabulario_padrao()
+            correcoes = [f"{valor} -> {vocabulario.canonico(valor)}" for valor in valores_nao_padronizados
+                         if vocabulario.canonico(valor) not in (None, valor)]
+            if correcoes:
+                sugestoes.append(f"Corrigir grafias de SITUACAO: {', '.join(correcoes)}")
             
         if not tem_data:
             problemas.append("Não há coluna de DATA para análise temporal")
@@ -218,41 +230,205 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             'status': 'FALHA'
         }
 
-def analisar_arquivo_paralelo(arquivos):
+class ProgressoAnalise:
+    """Percentual concluído e tempo restante estimado, ponderados pelas linhas de cada aba"""
+    
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.total_abas = 0
+        self.total_linhas = 0
+        self.abas_concluidas = 0
+        self.linhas_concluidas = 0
+    
+    def adicionar(self, linhas):
+        """Registra uma aba a analisar (linhas estimadas pelo prescan)"""
+        self.total_abas += 1
+        self.total_linhas += linhas + 1
+    
+    def concluir(self, linhas):
+        """Registra uma aba concluída e retorna a situação atual"""
+        self.abas_concluidas += 1
+        self.linhas_concluidas += linhas + 1
+        return self.situacao()
+    
+    def situacao(self):
+        """
+        Returns:
+            dict: Abas concluídas, percentual, tempo decorrido e estimativa do
+                tempo restante (eta_segundos, None antes da primeira aba)
+        """
+        decorrido = time.monotonic() - self.inicio
+        fracao = min(1.0, self.linhas_concluidas / self.total_linhas) if self.total_linhas else 0.0
+        return {
+            'abas_concluidas': self.abas_concluidas,
+            'total_abas': self.total_abas,
+            'percentual': round(fracao * 100, 1),
+            'decorrido_segundos': round(decorrido, 1),
+            'eta_segundos': round(decorrido * (1 - fracao) / fracao, 1) if fracao > 0 else None
+        }
+
+# Tarefas em andamento por processo: mantém os processos ocupados sem que
+# todas as abas (e seus segmentos de memória) fiquem vivas ao mesmo tempo
+TAREFAS_POR_PROCESSO = 2
+
+def _aba_analisavel(aba):
+    """Abas de colaboradores, exceto as de resumo/índice"""
+    return aba_de_colaborador(aba) and aba.lower() not in ['resumo', 'índice', 'index', 'summary']
+
+def _abas_com_tamanho(nome, arquivo, abas, linhas):
+    """Acrescenta às abas lidas o tamanho usado para ordenar as tarefas"""
+    for sheet, df in abas:
+        yield linhas.get(sheet, len(df)), nome, arquivo, sheet, df
+
+def analisar_arquivo_paralelo(arquivos, jobs=None, memoria_compartilhada=True, progresso=None):
     """
     Analisa os arquivos Excel em paralelo.
     
+    Um prescan (prescan_planilha) lê apenas a estrutura de cada arquivo:
+    descarta as abas que não são de colaboradores (TESTE, RELATÓRIO GERAL,
+    nomes _xlnm) e estima as linhas das demais. As abas são então lidas no
+    processo principal das maiores para as menores, considerando todos os
+    arquivos, e cada aba (arquivo, colaborador) vira uma tarefa no pool de
+    processos, enviada assim que é lida; começar pelas maiores reduz o tempo
+    total do lote. No máximo TAREFAS_POR_PROCESSO * jobs tarefas ficam em
+    andamento: com a fila cheia, a leitura espera uma tarefa terminar. Os
+    resultados (e o progresso) são recebidos durante a leitura, à medida que
+    as tarefas terminam; uma aba que falhar é registrada com status FALHA
+    sem interromper as demais.
+    Com memória compartilhada, só as colunas usadas pela análise seguem para
+    os processos, sem pickle; cada segmento é removido assim que o resultado
+    da sua tarefa chega (e todos, ao fim do lote), de modo que o pico de
+    memória é o das abas em andamento, não o do lote inteiro.
+    
     Args:
         arquivos (dict): Dicionário com os caminhos dos arquivos
             {'julio': caminho_arquivo_julio, 'leandro': caminho_arquivo_leandro}
+        jobs (int, optional): Número de processos; padrão: todos os núcleos.
+            Com 1 as abas são analisadas no próprio processo
+        memoria_compartilhada (bool, optional): Entregar as abas por
+            memória compartilhada em vez de pickle
+        progresso (callable, optional): Chamado a cada aba concluída com
+            ProgressoAnalise.situacao() (percentual e eta_segundos)
     
     Returns:
-        dict: Resultados da análise
+        dict: Resultados da análise, na ordem dos arquivos e abas
     """
+    jobs = jobs or os.cpu_count() or 1
+    limite_tarefas = TAREFAS_POR_PROCESSO * jobs
     resultados = {}
+    posicoes = {}
+    tarefas = {}
+    segmentos = {}
+    acompanhamento = ProgressoAnalise()
+    
+    def concluir(chave, linhas, dados):
+        resultados[chave]['dados'] = dados
+        situacao = acompanhamento.concluir(linhas)
+        eta = f", restam ~{situacao['eta_segundos']:.0f}s" if situacao['eta_segundos'] is not None else ""
+        print(f"[{situacao['abas_concluidas']}/{situacao['total_abas']}] {situacao['percentual']:.1f}%{eta} "
+              f"{chave}: {dados.get('status')}")
+        if progresso is not None:
+            progresso(situacao)
+    
+    def receber(concluidas):
+        for futuro in concluidas:
+            chave, arquivo, sheet, tamanho = tarefas.pop(futuro)
+            try:
+                dados = futuro.result()
+            except Exception as e:
+                # Falha do processo (ex.: dados que não puderam ser enviados); as demais abas seguem
+                print(f"Erro ao analisar aba {sheet} de {os.path.basename(arquivo)}: {str(e)}")
+                dados = {
+                    'colaborador': sheet,
+                    'arquivo': arquivo,
+                    'erro': str(e),
+                    'status': 'FALHA'
+                }
+            if futuro in segmentos:
+                segmentos.pop(futuro).liberar()
+            concluir(chave, tamanho, dados)
+    
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
     
-    for nome, arquivo in arquivos.items():
-        print(f"Analisando arquivo: {os.path.basename(arquivo)}")
-        try:
-            if not os.path.exists(arquivo):
-                print(f"Arquivo não encontrado: {arquivo}")
-                continue
+    try:
+        fontes = []
+        for indice, (nome, arquivo) in enumerate(arquivos.items()):
+            print(f"Analisando arquivo: {os.path.basename(arquivo)}")
+            try:
+                if not os.path.exists(arquivo):
+                    print(f"Arquivo não encontrado: {arquivo}")
+                    continue
                 
-            xls = pd.ExcelFile(arquivo)
-            for sheet in xls.sheet_names:
-                if sheet.lower() not in ['resumo', 'índice', 'index', 'summary']:
-                    df = pd.read_excel(arquivo, sheet_name=sheet)
-                    resultados[f"{nome}_{sheet}"] = {
-                        'grupo': nome,
-                        'colaborador': sheet,
-                        'dados': analisar_situacao_colaborador(arquivo, sheet)
-                    }
+                # Prescan: abas de colaboradores, das maiores para as menores
+                linhas = {}
+                ordem = None
+                try:
+                    prescan = prescan_planilha(arquivo)
+                except Exception as e:
+                    # Sem prescan as abas ainda são lidas, só sem ordem por tamanho
+                    print(f"Prescan indisponível para {os.path.basename(arquivo)}: {str(e)}")
+                    prescan = None
+                if prescan is not None:
+                    ignoradas = [aba['aba'] for aba in prescan if not _aba_analisavel(aba['aba'])]
+                    if ignoradas:
+                        print(f"Abas ignoradas: {', '.join(ignoradas)}")
+                    colaboradores = [aba for aba in prescan if _aba_analisavel(aba['aba'])]
+                    ordem = [aba['aba'] for aba in sorted(colaboradores, key=lambda aba: -aba['linhas'])]
+                    linhas = {aba['aba']: aba['linhas'] for aba in colaboradores}
+                    posicoes.update({f"{nome}_{aba['aba']}": (indice, i) for i, aba in enumerate(prescan)})
+                    for aba in colaboradores:
+                        acompanhamento.adicionar(aba['linhas'])
                     
-        except Exception as e:
-            print(f"Erro ao analisar {arquivo}: {str(e)}")
-            traceback.print_exc()
-    
-    return resultados
+                # Cada arquivo é aberto e cada aba é lida uma única vez; os processos recebem os dados já lidos
+                abas = ler_abas(arquivo, filtro=_aba_analisavel, ordem=ordem)
+                fontes.append(_abas_com_tamanho(nome, arquivo, abas, linhas))
+                        
+            except Exception as e:
+                print(f"Erro ao analisar {arquivo}: {str(e)}")
+                traceback.print_exc()
+        
+        # Intercalar os arquivos para que as maiores abas de todo o lote sejam enviadas primeiro
+        for tamanho, nome, arquivo, sheet, df in heapq.merge(*fontes, key=lambda item: -item[0]):
+            chave = f"{nome}_{sheet}"
+            if chave not in posicoes:
+                # Arquivo sem prescan (ex.: .xls): tamanho conhecido só após a leitura
+                posicoes[chave] = (list(arquivos).index(nome), len(posicoes))
+                acompanhamento.adicionar(tamanho)
+            resultados[chave] = {
+                'grupo': nome,
+                'colaborador': sheet,
+                'dados': None
+            }
+            if executor is None:
+                concluir(chave, tamanho, analisar_situacao_colaborador(arquivo, sheet, df=df))
+                continue
+            
+            segmento = None
+            if memoria_compartilhada:
+                segmento = publicar_dataframe(df[colunas_analise_situacao(df.columns)])
+            if segmento is not None:
+                futuro = executor.submit(_analisar_situacao_compartilhada, arquivo, sheet, segmento.descritor)
+                segmentos[futuro] = segmento
+            else:
+                # Tipos que não cabem na memória compartilhada seguem por pickle
+                futuro = executor.submit(analisar_situacao_colaborador, arquivo, sheet, df)
+            tarefas[futuro] = (chave, arquivo, sheet, tamanho)
+            
+            # Receber o que já terminou; com a fila cheia, esperar uma vaga antes de ler a próxima aba
+            concluidas, _ = wait(tarefas, timeout=None if len(tarefas) >= limite_tarefas else 0,
+                                 return_when=FIRST_COMPLETED)
+            receber(concluidas)
+        
+        while tarefas:
+            concluidas, _ = wait(tarefas, return_when=FIRST_COMPLETED)
+            receber(concluidas)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        for segmento in segmentos.values():
+            segmento.liberar()
+    
+    return dict(sorted(resultados.items(), key=lambda item: posicoes[item[0]]))
 
 def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
     """
@@ -772,8 +948,13 @@ def gerar_relatorio_html(todos_resultados, colaboradores_validos, contagem_probl
         print(f"Erro ao gerar relatório HTML: {str(e)}")
         traceback.print_exc()
 
-def main():
-    """Função principal para executar a análise em paralelo"""
+def main(jobs=None):
+    """
+    Função principal para executar a análise em paralelo
+    
+    Args:
+        jobs (int, optional): Número de processos; padrão: todos os núcleos
+    """
     print("Iniciando análise paralela dos arquivos Excel...")
     
     # Definir caminhos dos arquivos
@@ -784,7 +965,7 @@ def main():
     resultados_julio = analisar_arquivo_paralelo({
         'julio': arquivo_julio,
         'leandro': arquivo_leandro
-    })
+    }, jobs=jobs)
     
     # Gerar relatório de melhorias
     relatorio = gerar_relatorio_melhorias(resultados_julio, resultados_julio)
@@ -803,4 +984,8 @@ def main():
     }
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Análise paralela da coluna SITUAÇÃO dos colaboradores")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Número de processos (padrão: todos os núcleos)")
+    args = parser.parse_args()
+    main(jobs=args.jobs)
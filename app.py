@@ -6,6 +6,8 @@ import glob
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file, abort, flash, redirect, url_for
 
+from arquivamento import arquivar_em_segundo_plano
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'chave_secreta_para_flash_messages'
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -23,10 +25,10 @@ class AnaliseManager:
         self.arquivos_analisados = []
         self.erros = []
         
-    def analisar_arquivo(self, arquivo_path, grupo="default"):
+    def analisar_arquivo(self, arquivo_path, grupo="default", conteudo=None):
         try:
-            # Verificar se o arquivo existe
-            if not os.path.exists(arquivo_path):
+            # Verificar se o arquivo existe (uploads chegam em memória e ainda podem estar sendo gravados)
+            if conteudo is None and not os.path.exists(arquivo_path):
                 return {
                     "status": "error",
                     "mensagem": f"Arquivo não encontrado: {arquivo_path}"
@@ -50,7 +52,7 @@ class AnaliseManager:
             
             # Criar analisador com tratamento de erros
             try:
-                analisador = AnalisadorExcel(arquivo_path)
+                analisador = AnalisadorExcel(arquivo_path, conteudo=conteudo)
                 colaboradores = analisador.analisar_arquivo()
                 
                 # Verificar se colaboradores é None ou vazio
@@ -273,9 +275,10 @@ def upload_file():
     if file:
         try:
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-            file.save(filepath)
+            conteudo = file.read()
+            arquivar_em_segundo_plano(conteudo, filepath)
             
-            resultado = analise_manager.analisar_arquivo(filepath, grupo)
+            resultado = analise_manager.analisar_arquivo(filepath, grupo, conteudo=conteudo)
             return jsonify(resultado)
         except Exception as e:
             return jsonify({"status": "error", "mensagem": f"Erro ao processar arquivo: {str(e)}"})
@@ -7,6 +7,8 @@ import traceback
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file, abort, flash, redirect, url_for
 
+from arquivamento import arquivar_em_segundo_plano
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'chave_secreta_para_flash_messages'
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -54,13 +56,13 @@ class AnaliseManager:
         except Exception as e:
             print(f"Erro ao carregar resultados salvos: {str(e)}")
         
-    def analisar_arquivo(self, arquivo_path, grupo="default"):
+    def analisar_arquivo(self, arquivo_path, grupo="default", conteudo=None):
         """Analisa um arquivo Excel e retorna os resultados"""
         print(f"Iniciando análise do arquivo: {arquivo_path} (grupo: {grupo})")
         
         try:
-            # Verificar se o arquivo existe
-            if not os.path.exists(arquivo_path):
+            # Verificar se o arquivo existe (uploads chegam em memória e ainda podem estar sendo gravados)
+            if conteudo is None and not os.path.exists(arquivo_path):
                 erro_msg = f"Arquivo não encontrado: {arquivo_path}"
                 print(erro_msg)
                 return {"status": "error", "mensagem": erro_msg}
@@ -82,7 +84,7 @@ class AnaliseManager:
             # Criar analisador e processar arquivo
             try:
                 print(f"Criando analisador para {arquivo_path}")
-                analisador = AnalisadorExcel(arquivo_path)
+                analisador = AnalisadorExcel(arquivo_path, conteudo=conteudo)
                 
                 print(f"Analisando arquivo {arquivo_path}")
                 colaboradores = analisador.analisar_arquivo()
@@ -284,14 +286,15 @@ def upload_file():
         
     if file:
         try:
-            # Salvar arquivo
+            # Analisar direto da memória; a cópia em disco é gravada em segundo plano
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-            file.save(filepath)
+            conteudo = file.read()
+            arquivar_em_segundo_plano(conteudo, filepath)
             
-            print(f"Arquivo salvo em {filepath}")
+            print(f"Arquivando em {filepath}")
             
             # Analisar arquivo
-            resultado = analise_manager.analisar_arquivo(filepath, grupo)
+            resultado = analise_manager.analisar_arquivo(filepath, grupo, conteudo=conteudo)
             
             # Forçar atualização do dashboard após upload
             if resultado["status"] == "success":
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Arquivamento de Uploads
+=======================
+Grava em disco, em segundo plano, os arquivos recebidos por upload.
+A análise é feita direto do conteúdo em memória; a cópia em disco serve de
+arquivo (listagem e reanálise de arquivos) e não atrasa a resposta.
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _obter_executor():
+    global _executor
+    if _executor is None:
+        # As threads do pool são aguardadas no fim do processo: uploads na fila não se perdem
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='arquivamento')
+    return _executor
+
+
+def _gravar(conteudo, caminho):
+    """Grava o arquivo de forma atômica (um arquivo parcial nunca aparece no diretório)"""
+    temporario = f'{caminho}.tmp'
+    try:
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with open(temporario, 'wb') as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+    except Exception as e:
+        logger.warning(f"Falha ao arquivar upload em {caminho}: {str(e)}")
+        return False
+    return True
+
+
+def arquivar_em_segundo_plano(conteudo, caminho):
+    """
+    Agenda a gravação de um upload em disco.
+
+    Args:
+        conteudo (bytes): Conteúdo do arquivo (não deve ser alterado depois)
+        caminho (str): Destino do arquivo (ex.: uploads/nome.xlsx)
+
+    Returns:
+        Future: Concluído com True quando o arquivo estiver gravado
+    """
+    return _obter_executor().submit(_gravar, conteudo, caminho)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Métricas
+=================
+Guarda as métricas já calculadas de cada aba, identificadas pela impressão
+digital da aba (leitor_excel.impressoes_abas). Ao reanalisar uma planilha,
+apenas as abas cuja impressão mudou precisam ser lidas e recalculadas; as
+demais reaproveitam as métricas gravadas.
+
+Também guarda o estado incremental de cada aba (agregados mescláveis e as
+linhas já processadas), identificado pelo arquivo e pela aba: como as
+listas só crescem, uma aba alterada normalmente só precisa das linhas novas.
+
+As chaves incluem a versão do mapeamento de grafias de status: fixar uma
+grafia (vocabulario_status.py --fixar/--manter) invalida as métricas e os
+estados calculados com a resolução anterior.
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+
+from cache_planilhas import obter_cache_padrao
+from vocabulario_status import obter_mapeamento_padrao
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o cálculo das métricas mudar, invalidando entradas antigas
+VERSAO_METRICAS = 7
+
+
+class CacheMetricas:
+    """Métricas por aba persistidas em disco (um arquivo por impressão)"""
+
+    def __init__(self, diretorio=os.path.join('cache_planilhas', 'metricas'), cache_planilhas=None,
+                 mapeamento=None):
+        """
+        Inicializa o cache.
+
+        Args:
+            diretorio (str, optional): Diretório onde as métricas são gravadas
+            cache_planilhas (CachePlanilhas, optional): Cache cujo limite de
+                tamanho (LRU) é aplicado após cada gravação; o diretório deve
+                estar dentro do dele
+            mapeamento (MapeamentoStatus, optional): Mapeamento de grafias
+                usado no cálculo; sua versão entra nas chaves
+        """
+        self.diretorio = diretorio
+        self.cache_planilhas = cache_planilhas
+        self.mapeamento = mapeamento
+        self.acertos = 0
+        self.falhas = 0
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Cache de métricas indisponível: {str(e)}")
+
+    def chave(self, origem, aba, impressao):
+        """
+        Monta a chave de uma aba.
+
+        Args:
+            origem (str): Identifica quem calculou as métricas (ex.: nome do analisador)
+            aba (str): Nome da aba
+            impressao (str): Impressão digital da aba
+
+        Returns:
+            str: Chave hexadecimal
+        """
+        texto = f"{origem}|{VERSAO_METRICAS}|{self._versao_mapeamento()}|{aba}|{impressao}"
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+    def chave_estado(self, origem, arquivo, aba):
+        """
+        Monta a chave do estado incremental de uma aba (não depende do conteúdo).
+
+        Args:
+            origem (str): Identifica quem calculou as métricas (ex.: nome do analisador)
+            arquivo (str): Nome do arquivo
+            aba (str): Nome da aba
+
+        Returns:
+            str: Chave hexadecimal
+        """
+        texto = f"{origem}|{VERSAO_METRICAS}|{self._versao_mapeamento()}|estado|{arquivo}|{aba}"
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+    def _versao_mapeamento(self):
+        return self.mapeamento.versao() if self.mapeamento is not None else ''
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f'{chave}.pkl')
+
+    def obter(self, chave):
+        """
+        Lê as métricas gravadas.
+
+        Returns:
+            tuple: (encontrado, métricas); métricas pode ser None quando a
+                aba não gerou métricas (ex.: aba vazia)
+        """
+        try:
+            with open(self._caminho(chave), 'rb') as f:
+                metricas = pickle.load(f)
+        except FileNotFoundError:
+            self.falhas += 1
+            return False, None
+        except Exception as e:
+            logger.warning(f"Entrada inválida no cache de métricas: {str(e)}")
+            self.falhas += 1
+            return False, None
+
+        try:
+            os.utime(self._caminho(chave), None)  # base da política LRU
+        except OSError:
+            pass
+        self.acertos += 1
+        return True, metricas
+
+    def salvar(self, chave, metricas):
+        """
+        Grava as métricas de uma aba.
+
+        Returns:
+            bool: True se as métricas foram gravadas
+        """
+        caminho = self._caminho(chave)
+        temporario = f'{caminho}.tmp'
+        try:
+            with open(temporario, 'wb') as f:
+                pickle.dump(metricas, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar métricas no cache: {str(e)}")
+            return False
+
+        if self.cache_planilhas is not None:
+            self.cache_planilhas.aplicar_limite()
+        return True
+
+    def limpar(self):
+        """Remove todas as entradas do cache"""
+        for entrada in os.scandir(self.diretorio):
+            if entrada.is_file():
+                os.remove(entrada.path)
+
+
+_cache_padrao = None
+
+
+def obter_cache_metricas_padrao():
+    """
+    Retorna o cache de métricas compartilhado.
+
+    Fica dentro do diretório do cache de planilhas (CACHE_PLANILHAS_DIR) e
+    conta no limite de tamanho dele.
+    """
+    global _cache_padrao
+    if _cache_padrao is None:
+        cache_planilhas = obter_cache_padrao()
+        _cache_padrao = CacheMetricas(os.path.join(cache_planilhas.diretorio, 'metricas'),
+                                      cache_planilhas=cache_planilhas,
+                                      mapeamento=obter_mapeamento_padrao())
+    return _cache_padrao
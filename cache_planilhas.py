@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Planilhas
+==================
+Cache persistente das abas já lidas, em formato colunar (Parquet).
+Cada aba é identificada pelo hash do conteúdo do arquivo + nome da aba,
+de modo que uma planilha inalterada é recarregada em milissegundos sem
+passar pelo openpyxl. O diretório tem limite de tamanho com remoção LRU.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow acompanha o streamlit
+    pa = None
+    pq = None
+
+# Incrementar quando o formato gravado mudar, invalidando entradas antigas
+VERSAO_FORMATO = 1
+
+# Registros gravados no diretório do cache que não são entradas descartáveis
+# (formatos de data aprendidos e grafias de status fixadas pelo usuário)
+ARQUIVOS_PRESERVADOS = ('formatos_datas.json', 'mapeamento_status.json')
+
+# Códigos de tipo usados para colunas object com valores mistos
+TIPO_NULO, TIPO_TEXTO, TIPO_INTEIRO, TIPO_REAL, TIPO_DATA, TIPO_BOOL, TIPO_HORA = range(7)
+
+
+def hash_conteudo(origem, tamanho_bloco=1024 * 1024):
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    Args:
+        origem (str | bytes): Caminho do arquivo ou conteúdo em memória
+        tamanho_bloco (int, optional): Tamanho dos blocos lidos do disco
+
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+    sha = hashlib.sha256()
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        sha.update(origem)
+        return sha.hexdigest()
+
+    with open(origem, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _codigo_tipo(valor):
+    """Classifica um valor de célula em um dos tipos suportados pelo cache"""
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)) or valor is pd.NaT:
+        return TIPO_NULO
+    if isinstance(valor, str):
+        return TIPO_TEXTO
+    if isinstance(valor, (bool, np.bool_)):
+        return TIPO_BOOL
+    if isinstance(valor, (int, np.integer)):
+        return TIPO_INTEIRO if -2**63 <= int(valor) < 2**63 else None
+    if isinstance(valor, (float, np.floating)):
+        return TIPO_REAL
+    if isinstance(valor, datetime):
+        return TIPO_DATA if valor.tzinfo is None else None
+    if isinstance(valor, time):
+        return TIPO_HORA if valor.tzinfo is None else None
+    return None
+
+
+def _codificar_coluna_mista(serie, prefixo):
+    """
+    Decompõe uma coluna object em vetores tipados (um por tipo de valor).
+
+    Returns:
+        dict | None: Colunas planas prontas para o Parquet, ou None se houver tipo não suportado
+    """
+    valores = serie.to_numpy(dtype=object)
+    somente_textos = pd.api.types.infer_dtype(valores, skipna=True) in ('string', 'empty')
+    if somente_textos:
+        # Coluna só de textos e nulos (o caso comum): classificação vetorizada
+        tipos = np.where(pd.isna(valores), TIPO_NULO, TIPO_TEXTO).astype(np.int8)
+    else:
+        tipos = np.empty(len(valores), dtype=np.int8)
+        for i, valor in enumerate(valores):
+            codigo = _codigo_tipo(valor)
+            if codigo is None:
+                return None
+            tipos[i] = codigo
+
+    def faixa(codigo, conversor, vazio, dtype):
+        mascara = tipos == codigo
+        faixa_valores = np.full(len(valores), vazio, dtype=dtype)
+        if somente_textos and codigo == TIPO_TEXTO:
+            faixa_valores[mascara] = valores[mascara]
+        elif mascara.any():
+            faixa_valores[mascara] = [conversor(v) for v in valores[mascara]]
+        return faixa_valores
+
+    return {
+        f'{prefixo}__tipo': tipos,
+        f'{prefixo}__texto': faixa(TIPO_TEXTO, str, None, object),
+        f'{prefixo}__inteiro': faixa(TIPO_INTEIRO, int, 0, np.int64),
+        f'{prefixo}__real': faixa(TIPO_REAL, float, np.nan, np.float64),
+        f'{prefixo}__data': faixa(TIPO_DATA, lambda v: np.datetime64(v, 'us'), np.datetime64('NaT', 'us'), 'datetime64[us]'),
+        f'{prefixo}__bool': faixa(TIPO_BOOL, bool, False, bool),
+        f'{prefixo}__hora': faixa(TIPO_HORA, lambda v: ((v.hour * 60 + v.minute) * 60 + v.second) * 10**6 + v.microsecond, 0, np.int64),
+    }
+
+
+def _decodificar_coluna_mista(tabela, prefixo):
+    """Reconstrói a coluna object original a partir dos vetores tipados"""
+    tipos = tabela[f'{prefixo}__tipo'].to_numpy()
+    resultado = np.full(len(tipos), np.nan, dtype=object)
+
+    def preencher(codigo, coluna, conversor):
+        mascara = tipos == codigo
+        if mascara.any():
+            valores = conversor(tabela[f'{prefixo}__{coluna}'].to_numpy()[mascara])
+            destino = np.empty(len(valores), dtype=object)
+            destino[:] = valores
+            resultado[mascara] = destino
+
+    # Conversões feitas por vetor, sem laço Python por célula
+    preencher(TIPO_TEXTO, 'texto', lambda a: a)
+    preencher(TIPO_INTEIRO, 'inteiro', lambda a: a.astype(np.int64).tolist())
+    preencher(TIPO_REAL, 'real', lambda a: a.astype(np.float64).tolist())
+    preencher(TIPO_DATA, 'data', lambda a: a.astype('datetime64[us]').astype(object))
+    preencher(TIPO_BOOL, 'bool', lambda a: a.astype(bool).tolist())
+    preencher(TIPO_HORA, 'hora', lambda a: [(datetime.min + timedelta(microseconds=int(us))).time() for us in a])
+    return resultado
+
+
+def codificar_dataframe(df):
+    """
+    Converte um DataFrame de aba em uma tabela plana compatível com Parquet.
+
+    Colunas com tipo nativo (números, datas) são gravadas diretamente;
+    colunas object com valores mistos são decompostas em vetores tipados.
+    Datas dentro de colunas mistas usam resolução de microssegundos, que
+    cobre os anos 1 a 9999 aceitos pelo Excel.
+
+    Returns:
+        tuple: (DataFrame plano, metadados) ou (None, None) se a aba não puder ser codificada
+    """
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        return None, None
+    if not all(isinstance(nome, (str, int, float)) for nome in df.columns):
+        return None, None
+
+    planas = {}
+    colunas = []
+    for posicao, (nome, serie) in enumerate(df.items()):
+        prefixo = f'c{posicao}'
+        if serie.dtype == object:
+            partes = _codificar_coluna_mista(serie, prefixo)
+            if partes is None:
+                return None, None
+            planas.update(partes)
+            colunas.append({'nome': nome, 'codificacao': 'mista'})
+        else:
+            planas[prefixo] = serie.to_numpy()
+            colunas.append({'nome': nome, 'codificacao': 'nativa', 'dtype': str(serie.dtype)})
+
+    metadados = {
+        'versao': VERSAO_FORMATO,
+        'colunas': colunas,
+        'linhas': len(df)
+    }
+    return pd.DataFrame(planas, index=pd.RangeIndex(len(df))), metadados
+
+
+def decodificar_dataframe(tabela, metadados):
+    """Reconstrói o DataFrame original a partir da tabela plana e dos metadados"""
+    dados = {}
+    for posicao, coluna in enumerate(metadados['colunas']):
+        prefixo = f'c{posicao}'
+        if coluna['codificacao'] == 'mista':
+            dados[posicao] = _decodificar_coluna_mista(tabela, prefixo)
+        else:
+            dados[posicao] = tabela[prefixo].astype(coluna['dtype']).to_numpy()
+
+    df = pd.DataFrame(dados, index=pd.RangeIndex(metadados['linhas']))
+    df.columns = [coluna['nome'] for coluna in metadados['colunas']]
+    return df
+
+
+class CachePlanilhas:
+    """
+    Cache persistente de abas em Parquet, indexado por hash do arquivo e nome da aba.
+    Mantém o diretório abaixo de um limite de tamanho removendo as entradas
+    menos recentemente usadas.
+    """
+
+    def __init__(self, diretorio='cache_planilhas', limite_bytes=512 * 1024 * 1024):
+        """
+        Inicializa o cache.
+
+        Args:
+            diretorio (str, optional): Diretório onde as abas são gravadas
+            limite_bytes (int, optional): Tamanho máximo do diretório de cache
+        """
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self.acertos = 0
+        self.falhas = 0
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    @property
+    def disponivel(self):
+        """Indica se o formato colunar pode ser usado (pyarrow instalado)"""
+        return pq is not None
+
+    def chave_arquivo(self, origem):
+        """Retorna a chave de cache (hash do conteúdo) de um arquivo"""
+        return hash_conteudo(origem)
+
+    def _caminho(self, chave, aba=None):
+        if aba is None:
+            return os.path.join(self.diretorio, f'{chave}.json')
+        sufixo = hashlib.sha1(str(aba).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.diretorio, f'{chave}_{sufixo}.parquet')
+
+    def _tocar(self, caminho):
+        """Marca a entrada como usada agora (base da política LRU)"""
+        try:
+            os.utime(caminho, None)
+        except OSError:
+            pass
+
+    def obter_abas(self, chave):
+        """
+        Retorna a lista de abas registrada para um arquivo.
+
+        Returns:
+            list | None: Nomes das abas na ordem do arquivo, ou None se desconhecido
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if manifesto.get('versao') != VERSAO_FORMATO:
+            return None
+        self._tocar(caminho)
+        return manifesto.get('abas')
+
+    def salvar_abas(self, chave, abas):
+        """Registra a lista de abas de um arquivo"""
+        try:
+            with open(self._caminho(chave), 'w', encoding='utf-8') as f:
+                json.dump({'versao': VERSAO_FORMATO, 'abas': list(abas)}, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar manifesto do cache: {str(e)}")
+
+    def _caminho_textos(self, chave):
+        return os.path.join(self.diretorio, 'textos', f'{chave}.txt')
+
+    def obter_hash_textos(self, chave):
+        """
+        Lê o hash dos textos compartilhados de uma aba (ver leitor_excel.impressoes_abas).
+
+        Returns:
+            str | None: Hash gravado, ou None se desconhecido
+        """
+        caminho = self._caminho_textos(chave)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                valor = f.read().strip()
+        except OSError:
+            return None
+        self._tocar(caminho)
+        return valor or None
+
+    def salvar_hash_textos(self, chave, valor):
+        """Grava o hash dos textos compartilhados de uma aba"""
+        caminho = self._caminho_textos(chave)
+        temporario = f'{caminho}.tmp'
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(valor)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar hash de textos no cache: {str(e)}")
+
+    def obter(self, chave, aba):
+        """
+        Lê uma aba do cache.
+
+        Args:
+            chave (str): Hash do conteúdo do arquivo
+            aba (str): Nome da aba
+
+        Returns:
+            DataFrame | None: Dados da aba, ou None se não estiver em cache
+        """
+        if not self.disponivel:
+            return None
+
+        caminho = self._caminho(chave, aba)
+        if not os.path.exists(caminho):
+            self.falhas += 1
+            return None
+
+        try:
+            tabela = pq.read_table(caminho)
+            metadados = json.loads(tabela.schema.metadata[b'cache_planilhas'])
+            if metadados.get('versao') != VERSAO_FORMATO:
+                self.falhas += 1
+                return None
+            df = decodificar_dataframe(tabela.to_pandas(), metadados)
+        except Exception as e:
+            logger.warning(f"Entrada de cache inválida para a aba {aba}: {str(e)}")
+            self.falhas += 1
+            return None
+
+        self._tocar(caminho)
+        self.acertos += 1
+        return df
+
+    def salvar(self, chave, aba, df):
+        """
+        Grava uma aba no cache e aplica o limite de tamanho.
+
+        Returns:
+            bool: True se a aba foi gravada
+        """
+        if not self.disponivel:
+            return False
+
+        try:
+            plano, metadados = codificar_dataframe(df)
+            if plano is None:
+                logger.info(f"Aba {aba} contém tipos não suportados pelo cache; ignorando")
+                return False
+
+            tabela = pa.Table.from_pandas(plano, preserve_index=False)
+            esquema = tabela.schema.with_metadata({
+                **(tabela.schema.metadata or {}),
+                b'cache_planilhas': json.dumps(metadados, ensure_ascii=False).encode('utf-8')
+            })
+            caminho = self._caminho(chave, aba)
+            temporario = f'{caminho}.tmp'
+            pq.write_table(tabela.replace_schema_metadata(esquema.metadata), temporario)
+            os.replace(temporario, caminho)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar aba {aba} no cache: {str(e)}")
+            return False
+
+        self.aplicar_limite()
+        return True
+
+    def _arquivos(self):
+        """Todos os arquivos sob o diretório do cache (inclui metricas/ e manifestos)"""
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                yield caminho, info
+
+    def tamanho_total(self):
+        """Retorna o tamanho ocupado pelo cache em bytes"""
+        return sum(info.st_size for _, info in self._arquivos())
+
+    def aplicar_limite(self):
+        """
+        Remove as entradas menos recentemente usadas até respeitar o limite.
+
+        Conta todos os arquivos sob o diretório: abas em Parquet, manifestos
+        e as métricas de cache_metricas. Os registros persistentes
+        (ARQUIVOS_PRESERVADOS), suas travas (.lock) e gravações em andamento
+        (.tmp) contam no total, mas nunca são removidos.
+        """
+        entradas = []
+        total = 0
+        for caminho, info in self._arquivos():
+            total += info.st_size
+            nome = os.path.basename(caminho)
+            if nome in ARQUIVOS_PRESERVADOS or nome.endswith(('.tmp', '.lock')):
+                continue
+            entradas.append((info.st_mtime, info.st_size, caminho))
+
+        if total <= self.limite_bytes:
+            return 0
+
+        removidas = 0
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.limite_bytes:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+                removidas += 1
+            except OSError:
+                continue
+
+        logger.info(f"Cache de planilhas: {removidas} entradas removidas (LRU)")
+        return removidas
+
+    def limpar(self):
+        """Remove todas as entradas do cache"""
+        for entrada in os.scandir(self.diretorio):
+            if entrada.is_file():
+                os.remove(entrada.path)
+
+
+_cache_padrao = None
+
+
+def obter_cache_padrao():
+    """
+    Retorna o cache compartilhado pelos analisadores.
+
+    O diretório e o limite podem ser ajustados pelas variáveis de ambiente
+    CACHE_PLANILHAS_DIR e CACHE_PLANILHAS_LIMITE_MB.
+    """
+    global _cache_padrao
+    if _cache_padrao is None:
+        _cache_padrao = CachePlanilhas(
+            diretorio=os.environ.get('CACHE_PLANILHAS_DIR', 'cache_planilhas'),
+            limite_bytes=int(os.environ.get('CACHE_PLANILHAS_LIMITE_MB', '512')) * 1024 * 1024
+        )
+    return _cache_padrao
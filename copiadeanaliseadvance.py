@@ -2,12 +2,12 @@ import pandas as pd
 import numpy as np
 from debug_excel import AnalisadorExcel
 from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
 from datetime import datetime, timedelta
 import warnings
 import os
 import json
+from normalizador_datas import converter_com_formatos, obter_formatos_padrao
+from regressao_lote import regressao_em_lote
 warnings.filterwarnings('ignore')
 
 class AnalisadorAvancado:
@@ -21,6 +21,7 @@ class AnalisadorAvancado:
             self.ultima_analise = None
             self.historico_analises = []
             self.resultados_preditivos = {}
+            self.arquivo_atual = ''
             
         except Exception as e:
             raise RuntimeError(f"Erro ao inicializar analisador: {str(e)}")
@@ -37,6 +38,7 @@ class AnalisadorAvancado:
             self.ultima_analise = datetime.now()
             
             # Ler todas as abas do arquivo Excel
+            self.arquivo_atual = caminho_arquivo
             excel_file = pd.ExcelFile(caminho_arquivo)
             
             # Lista de colaboradores para processar
@@ -377,16 +379,10 @@ class AnalisadorAvancado:
         }
         
         try:
-            # Para cada grupo, realizar previsões
+            # Coletar os históricos de todos os colaboradores
+            historicos = {}
             for grupo_nome, grupo_metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
-                if not grupo_metricas:
-                    continue
-                
-                print(f"\nPrevisões para grupo {grupo_nome}:")
-                
-                # Para cada colaborador, construir modelo preditivo
                 for colaborador in grupo_metricas.keys():
-                    # Coletar dados históricos deste colaborador
                     dados_historicos = []
                     datas = []
                     
@@ -400,32 +396,45 @@ class AnalisadorAvancado:
                             dados_historicos.append(metricas_grupo[colaborador].get('taxa_eficiencia', 0))
                             datas.append(idx)  # Usar índice como proxy para tempo
                     
+                    historicos[(grupo_nome, colaborador)] = (datas, dados_historicos)
+            
+            # Ajustar os modelos de todos os colaboradores com pelo menos 3 pontos em uma única regressão
+            modelados = [chave for chave, (datas, _) in historicos.items() if len(datas) >= 3]
+            ajuste = regressao_em_lote([historicos[chave][1] for chave in modelados],
+                                       [historicos[chave][0] for chave in modelados]) if modelados else None
+            linha_modelo = {chave: linha for linha, chave in enumerate(modelados)}
+            
+            # Para cada grupo, realizar previsões
+            for grupo_nome, grupo_metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
+                if not grupo_metricas:
+                    continue
+                
+                print(f"\nPrevisões para grupo {grupo_nome}:")
+                
+                for colaborador in grupo_metricas.keys():
+                    datas, dados_historicos = historicos[(grupo_nome, colaborador)]
+                    
                     # Se temos pelo menos 3 pontos de dados, podemos fazer previsão
                     if len(dados_historicos) >= 3:
-                        # Preparar dados para modelo
-                        X = np.array(datas).reshape(-1, 1)
-                        y = np.array(dados_historicos)
-                        
-                        # Criar e treinar modelo
-                        modelo = LinearRegression()
-                        modelo.fit(X, y)
+                        linha = linha_modelo[(grupo_nome, colaborador)]
+                        coeficiente = float(ajuste['slope'][linha])
+                        intercepto = float(ajuste['intercept'][linha])
                         
                         # Fazer previsão para próximos 3 períodos
-                        proximos_periodos = np.array([len(datas), len(datas)+1, len(datas)+2]).reshape(-1, 1)
-                        previsoes = modelo.predict(proximos_periodos)
+                        proximos_periodos = np.array([len(datas), len(datas)+1, len(datas)+2])
+                        previsoes = coeficiente * proximos_periodos + intercepto
                         
-                        # Calcular qualidade do modelo
-                        y_pred = modelo.predict(X)
-                        r2 = r2_score(y, y_pred)
+                        # Calcular qualidade do modelo (histórico constante: ajuste perfeito)
+                        r2 = 1.0 if np.isnan(ajuste['r2'][linha]) else float(ajuste['r2'][linha])
                         
                         # Armazenar resultados
                         resultados_preditivos[grupo_nome][colaborador] = {
                             "historico": dados_historicos,
                             "previsoes": previsoes.tolist(),
                             "r2": r2,
-                            "tendencia": "crescente" if modelo.coef_[0] > 0 else "decrescente",
-                            "coeficiente": float(modelo.coef_[0]),
-                            "intercepto": float(modelo.intercept_)
+                            "tendencia": "crescente" if coeficiente > 0 else "decrescente",
+                            "coeficiente": coeficiente,
+                            "intercepto": intercepto
                         }
                         
                         # Exibir resultados
@@ -861,8 +870,13 @@ class AnalisadorAvancado:
     def processar_dados_colaborador(self, nome, df):
         """Processa os dados de um colaborador específico"""
         try:
-            # Converter datas para datetime
-            df['Data'] = pd.to_datetime(df['DATA'], format='%d/%m/%Y', errors='coerce')
+            # Converter datas para datetime (formatos detectados por coluna)
+            formatos = obter_formatos_padrao()
+            df['Data'] = converter_com_formatos(
+                df['DATA'], formatos,
+                formatos.chave(self.arquivo_atual, nome, 'DATA'),
+                alternativo=lambda resto: pd.to_datetime(resto, format='%d/%m/%Y', errors='coerce')
+            )
             
             # Remover registros com datas inválidas
             df = df.dropna(subset=['Data'])
@@ -899,11 +913,9 @@ class AnalisadorAvancado:
             # Análise de tendências
             df_tendencia = df.groupby('Data').size().reset_index()
             if len(df_tendencia) > 1:
-                X = np.arange(len(df_tendencia)).reshape(-1, 1)
-                y = df_tendencia[0].values
-                reg = LinearRegression().fit(X, y)
-                r2 = reg.score(X, y)
-                tendencia = 'crescente' if reg.coef_[0] > 0 else 'decrescente'
+                ajuste = regressao_em_lote(df_tendencia[0].to_numpy())
+                r2 = 1.0 if np.isnan(ajuste['r2'][0]) else float(ajuste['r2'][0])
+                tendencia = 'crescente' if ajuste['slope'][0] > 0 else 'decrescente'
             else:
                 tendencia = 'estável'
                 r2 = 0
@@ -6,9 +6,13 @@ import seaborn as sns
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
-from collections import defaultdict, Counter
+from collections import defaultdict
 import streamlit as st
 
+from leitor_excel import ler_abas
+from transicoes_estado import contar_transicoes
+from vocabulario_status import SITUACOES_SEM_CONCLUIDO
+
 # Configuração da página
 st.set_page_config(
     page_title="Dashboard Interativo de Colaboradores",
@@ -33,24 +37,18 @@ def normalizar_coluna(coluna):
 @st.cache_data
 def carregar_dados(arquivo):
     try:
-        # Carregar todas as abas do arquivo Excel
-        xls = pd.ExcelFile(arquivo)
-        
-        # Filtrar abas válidas (excluir abas de teste ou relatório geral)
-        abas_validas = [aba for aba in xls.sheet_names if aba not in ["", "TESTE", "RELATÓRIO GERAL"]]
+        # Abrir o arquivo uma única vez, filtrando abas de teste ou relatório geral
+        abas = ler_abas(arquivo, filtro=lambda aba: aba not in ["", "TESTE", "RELATÓRIO GERAL"])
         
         dados_colaboradores = {}
-        for aba in abas_validas:
-            # Carregar dados da aba
-            df = pd.read_excel(arquivo, sheet_name=aba)
-            
+        for aba, df in abas:
             # Normalizar nomes das colunas
             df.columns = [normalizar_coluna(col) for col in df.columns]
             
             # Armazenar dados do colaborador
             dados_colaboradores[aba] = df
         
-        return dados_colaboradores, abas_validas
+        return dados_colaboradores, list(dados_colaboradores)
     except Exception as e:
         st.error(f"Erro ao carregar dados do arquivo {os.path.basename(arquivo)}: {str(e)}")
         return {}, []
@@ -78,7 +76,8 @@ def analisar_colaborador(df, nome_colaborador):
         registros_vazios = df['SITUACAO'].isna().sum()
         
         # Valores padronizados
-        valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE', 'ANÁLISE', 'PRIORIDADE']
+        # O painel também aceita ANÁLISE e PRIORIDADE como preenchimento padronizado
+        valores_padronizados = SITUACOES_SEM_CONCLUIDO + ('ANÁLISE', 'PRIORIDADE')
         valores_unicos = [v for v in df['SITUACAO'].dropna().unique()]
         valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
     
@@ -100,23 +99,14 @@ def analisar_colaborador(df, nome_colaborador):
                 }
                 
                 # Análise de transições se houver SITUACAO
-                transicoes = []
+                contagem_transicoes = {}
                 tempos_por_situacao = {}
                 
                 if 'SITUACAO' in df.columns:
                     df_ordenado = df.sort_values(by=col_data)
                     
-                    # Verificar transições de estado
-                    situacao_anterior = None
-                    
-                    for idx, row in df_ordenado.iterrows():
-                        situacao_atual = row['SITUACAO']
-                        if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
-                            transicoes.append((situacao_anterior, situacao_atual))
-                        situacao_anterior = situacao_atual
-                    
-                    # Contar transições
-                    contagem_transicoes = Counter(transicoes)
+                    # Contar transições de estado
+                    contagem_transicoes, _ = contar_transicoes(df_ordenado['SITUACAO'])
                     
                     # Tempo médio em cada situação
                     df_ordenado['data_anterior'] = df_ordenado[col_data].shift(1)
@@ -20,6 +20,8 @@ import re
 
 # Importações para processar os arquivos
 from debug_excel_fixed import AnalisadorExcel
+from leitor_excel import conteudo_em_bytes
+from arquivamento import arquivar_em_segundo_plano
 
 # Configuração da página
 st.set_page_config(
@@ -153,18 +155,16 @@ class DashboardGerenciador:
     def processar_arquivo(self, arquivo_carregado, grupo):
         """Processa um arquivo Excel carregado pelo usuário"""
         try:
-            # Salvar o arquivo temporariamente
+            # A análise usa o conteúdo em memória; a cópia em uploads/ é gravada em segundo plano
             arquivo_path = os.path.join('uploads', arquivo_carregado.name)
-            with open(arquivo_path, 'wb') as f:
-                f.write(arquivo_carregado.getbuffer())
-            
-            st.success(f"Arquivo salvo em {arquivo_path}")
+            conteudo = conteudo_em_bytes(arquivo_carregado.getbuffer())
+            arquivar_em_segundo_plano(conteudo, arquivo_path)
             
             # Analisar o arquivo
             st.info(f"Iniciando análise do arquivo: {arquivo_path} (grupo: {grupo})")
             
             # Criar analisador
-            analisador = AnalisadorExcel(arquivo_path)
+            analisador = AnalisadorExcel(arquivo_path, conteudo=conteudo)
             
             # Analisar arquivo
             colaboradores = analisador.analisar_arquivo()
@@ -4,6 +4,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import os
 
+from leitor_excel import ler_abas
+
 # Configuração da página
 st.set_page_config(page_title="Dashboard de Atividades", layout="wide", initial_sidebar_state="expanded")
 
@@ -18,13 +20,13 @@ def get_data():
         st.write("Tentando ler planilhas de:", base_path)
         st.write("Arquivos encontrados:", os.listdir(base_path))
         
-        # Ler planilha do Julio
-        df_julio = pd.read_excel(planilha_julio)
+        # Ler planilha do Julio (primeira aba, servida pelo cache quando inalterada)
+        _, df_julio = next(ler_abas(planilha_julio))
         df_julio['Grupo'] = 'JULIO'
         st.success("Planilha do Julio carregada com sucesso!")
         
         # Ler planilha do Leandro
-        df_leandro = pd.read_excel(planilha_leandro)
+        _, df_leandro = next(ler_abas(planilha_leandro))
         df_leandro['Grupo'] = 'LEANDRO'
         st.success("Planilha do Leandro carregada com sucesso!")
         
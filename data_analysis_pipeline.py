@@ -220,35 +220,34 @@ class DataAnalysisPipeline:
             raise
     
     def _store_results(self):
-        """Store analysis results in the database."""
+        """Store analysis results in the database (one transaction per run)."""
         logger.info("Storing results in database")
         
         try:
-            # Store summary metrics for Julio's group
-            for colaborador, metricas in self.analisador.metricas_julio.items():
-                if metricas:
-                    self.db_manager.store_metrics(
-                        colaborador=colaborador,
-                        grupo="Julio",
-                        data=datetime.now(),
-                        total_registros=metricas.get('total_registros', 0),
-                        taxa_eficiencia=metricas.get('taxa_eficiencia', 0),
-                        tendencia=metricas.get('tendencia', {}).get('direcao', 'estável')
-                    )
+            data = datetime.now()
+            registros = []
+            for grupo, metricas_grupo in (("Julio", self.analisador.metricas_julio),
+                                          ("Leandro", self.analisador.metricas_leandro)):
+                for colaborador, metricas in metricas_grupo.items():
+                    if not metricas:
+                        continue
+                    # Without an efficiency (e.g. no STATUS column) the row cannot be stored
+                    if metricas.get('taxa_eficiencia') is None:
+                        logger.warning(f"Skipping metrics for {colaborador} ({grupo}): no efficiency rate")
+                        continue
+                    registros.append({
+                        'colaborador': colaborador,
+                        'grupo': grupo,
+                        'data': data,
+                        'total_registros': metricas.get('total_registros') or 0,
+                        'taxa_eficiencia': metricas['taxa_eficiencia'],
+                        'tendencia': (metricas.get('tendencia') or {}).get('direcao') or 'estável'
+                    })
             
-            # Store summary metrics for Leandro's group
-            for colaborador, metricas in self.analisador.metricas_leandro.items():
-                if metricas:
-                    self.db_manager.store_metrics(
-                        colaborador=colaborador,
-                        grupo="Leandro",
-                        data=datetime.now(),
-                        total_registros=metricas.get('total_registros', 0),
-                        taxa_eficiencia=metricas.get('taxa_eficiencia', 0),
-                        tendencia=metricas.get('tendencia', {}).get('direcao', 'estável')
-                    )
-            
-            logger.info("Results stored in database")
+            if self.db_manager.store_metrics_bulk(registros):
+                logger.info(f"Results stored in database ({len(registros)} records)")
+            else:
+                logger.error("Metrics for this run could not be stored; continuing without them")
             
         except Exception as e:
             logger.error(f"Database storage failed: {str(e)}")
@@ -11,75 +11,549 @@ Provides a clean interface for data persistence across analysis runs.
 import sqlite3
 import logging
 import json
-from datetime import datetime
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Number of connections kept open per database
+DEFAULT_POOL_SIZE = 4
+
+# Rollup granularities, finest first. The SQL expression maps metricas.data
+# to the first day of its bucket (ISO weeks start on Monday).
+ROLLUP_PERIODS = (
+    ('dia', "date({col})"),
+    ('semana', "date({col}, 'weekday 0', '-6 days')"),
+    ('mes', "date({col}, 'start of month')"),
+)
+
+# Fewest points a history chart should get when the period is chosen automatically
+ROLLUP_MIN_BUCKETS = 7
+
+# Applied to every pooled connection. WAL lets readers run while a writer
+# commits; NORMAL only fsyncs at checkpoints, which is safe under WAL.
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -16000),       # 16 MB page cache (negative = KiB)
+    ('mmap_size', 268435456),     # 256 MB memory-mapped I/O
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', 5000),       # ms to wait for a competing writer
+)
+
+def _number(value, cast=float):
+    """Convert a metric value (possibly a NumPy scalar or None) for storage."""
+    if value is None:
+        return None
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value  # NaN is stored as NULL
+
+
+def _text(value):
+    """Bind only text (e.g. a trend direction); anything else is stored as NULL."""
+    return value if isinstance(value, str) else None
+
+
+def _latest_days(conn, grupo, colaborador, first_day, last_day):
+    """
+    Day x status counts currently stored for a collaborator.
+    
+    Only the latest stored version of each day counts (see _insert_history).
+    
+    Returns:
+        dict: dia -> {status: quantidade}
+    """
+    cursor = conn.execute('''
+    SELECT d.dia, d.status, d.quantidade
+    FROM execucao_diaria d
+    WHERE d.colaborador = ? AND d.dia BETWEEN ? AND ?
+      AND d.execucao_id = (
+          SELECT MAX(v.execucao_id)
+          FROM execucao_diaria v
+          JOIN execucoes e ON e.id = v.execucao_id
+          WHERE v.colaborador = d.colaborador AND v.dia = d.dia AND e.grupo = ?
+      )
+    ''', (colaborador, first_day, last_day, grupo))
+    
+    days = {}
+    for dia, status, quantidade in cursor.fetchall():
+        days.setdefault(dia, {})[status] = quantidade
+    return days
+
+
+def _insert_history(conn, data, grupo, metricas, origem_id=None):
+    """
+    Write one analysis run into the normalized history tables.
+    
+    Each run carries the cumulative day x status counts of the whole sheet.
+    Only the days whose counts differ from the latest stored version of that
+    day (same group and collaborator) are written, so execucao_diaria grows
+    with the days that changed, not with runs x days. A day that disappears
+    from a later run keeps its last stored version.
+    
+    Args:
+        conn (sqlite3.Connection): Connection inside an open transaction
+        data (str): ISO timestamp of the run
+        grupo (str): Group name
+        metricas (dict): Metrics per collaborator, as produced by
+            AnalisadorExcel.calcular_metricas_colaborador
+        origem_id (int, optional): analise_historica row being backfilled
+    
+    Returns:
+        int: Id of the new execucoes row
+    """
+    cursor = conn.execute('''
+    INSERT INTO execucoes (data, grupo, analise_historica_id)
+    VALUES (?, ?, ?)
+    ''', (data, grupo, origem_id))
+    execucao_id = cursor.lastrowid
+    
+    colaboradores, status, diarias = [], [], []
+    for colaborador, m in metricas.items():
+        if not isinstance(m, dict) or not m:
+            continue
+        
+        tendencia = m.get('tendencia') or {}
+        if not isinstance(tendencia, dict):
+            tendencia = {'direcao': tendencia}
+        colaboradores.append((
+            execucao_id, str(colaborador),
+            _number(m.get('total_registros'), int),
+            _number(m.get('taxa_eficiencia')),
+            _number(m.get('tempo_medio_resolucao')),
+            _number(m.get('tempo_mediano_resolucao')),
+            _number(m.get('outliers_resolucao'), int),
+            _text(tendencia.get('direcao')),
+            _number(tendencia.get('slope')),
+            _number(tendencia.get('r2')),
+        ))
+        
+        # Entries without a count carry no information and are dropped
+        for nome, quantidade in (m.get('distribuicao_status') or {}).items():
+            quantidade = _number(quantidade, int)
+            if quantidade is not None:
+                status.append((execucao_id, str(colaborador), str(nome), quantidade))
+        
+        # Day x status cube: only the non-zero cells of the changed days are stored
+        cubo = m.get('cubo_dia_status') or {}
+        days = {}
+        for dia, contagens in zip(cubo.get('dias', []), cubo.get('contagens', [])):
+            if not isinstance(dia, str):
+                continue
+            counts = days.setdefault(dia, {})
+            for nome, quantidade in zip(cubo.get('status', []), contagens):
+                quantidade = _number(quantidade, int)
+                if quantidade:
+                    counts[_text(nome)] = counts.get(_text(nome), 0) + quantidade
+        if days:
+            stored = _latest_days(conn, grupo, str(colaborador), min(days), max(days))
+            for dia, counts in sorted(days.items()):
+                if counts and counts != stored.get(dia):
+                    diarias.extend((execucao_id, str(colaborador), dia, nome, quantidade)
+                                   for nome, quantidade in counts.items())
+    
+    conn.executemany('''
+    INSERT INTO execucao_colaborador (execucao_id, colaborador, total_registros, taxa_eficiencia,
+        tempo_medio_resolucao, tempo_mediano_resolucao, outliers_resolucao,
+        tendencia, tendencia_slope, tendencia_r2)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', colaboradores)
+    conn.executemany('''
+    INSERT INTO execucao_status (execucao_id, colaborador, status, quantidade)
+    VALUES (?, ?, ?, ?)
+    ''', status)
+    conn.executemany('''
+    INSERT INTO execucao_diaria (execucao_id, colaborador, dia, status, quantidade)
+    VALUES (?, ?, ?, ?, ?)
+    ''', diarias)
+    return execucao_id
+
+
+def _backfill_history(conn):
+    """
+    Copy the JSON blobs of analise_historica into the normalized tables.
+    
+    Each entry is written under its own savepoint: an entry that cannot be
+    read or stored is rolled back and skipped with a warning, so a single
+    bad blob never blocks the migration.
+    """
+    rows = conn.execute('''
+    SELECT id, data, grupo, metricas FROM analise_historica
+    WHERE id NOT IN (SELECT analise_historica_id FROM execucoes WHERE analise_historica_id IS NOT NULL)
+    ORDER BY id
+    ''').fetchall()
+    
+    backfilled = 0
+    for origem_id, data, grupo, metricas_json in rows:
+        try:
+            metricas = json.loads(metricas_json)
+        except (TypeError, ValueError):
+            logger.warning(f"Skipping unreadable analysis history entry {origem_id}")
+            continue
+        if not isinstance(metricas, dict):
+            logger.warning(f"Skipping analysis history entry {origem_id}: unexpected format")
+            continue
+        
+        conn.execute("SAVEPOINT backfill_entry")
+        try:
+            _insert_history(conn, data, grupo, metricas, origem_id)
+        except (sqlite3.Error, ValueError, TypeError, AttributeError) as e:
+            conn.execute("ROLLBACK TO backfill_entry")
+            conn.execute("RELEASE backfill_entry")
+            logger.warning(f"Skipping analysis history entry {origem_id}: {str(e)}")
+            continue
+        conn.execute("RELEASE backfill_entry")
+        backfilled += 1
+    
+    if rows:
+        logger.info(f"Backfilled {backfilled} of {len(rows)} analysis history entries")
+
+
+def _rollup_statements():
+    """SQL for migration 5: rollup tables, their insert trigger and backfill."""
+    statements = [
+        '''
+        CREATE TABLE metricas_rollup_colaborador (
+            periodo TEXT NOT NULL,
+            inicio DATE NOT NULL,
+            colaborador TEXT NOT NULL,
+            grupo TEXT NOT NULL,
+            registros INTEGER NOT NULL,
+            soma_eficiencia REAL NOT NULL,
+            soma_total_registros INTEGER NOT NULL,
+            PRIMARY KEY (periodo, colaborador, grupo, inicio)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE metricas_rollup_grupo (
+            periodo TEXT NOT NULL,
+            inicio DATE NOT NULL,
+            grupo TEXT NOT NULL,
+            registros INTEGER NOT NULL,
+            soma_eficiencia REAL NOT NULL,
+            soma_total_registros INTEGER NOT NULL,
+            PRIMARY KEY (periodo, grupo, inicio)
+        ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX idx_rollup_colaborador_grupo ON metricas_rollup_colaborador (periodo, grupo, inicio)",
+        "CREATE INDEX idx_rollup_colaborador_inicio ON metricas_rollup_colaborador (periodo, inicio)",
+        "CREATE INDEX idx_rollup_grupo_inicio ON metricas_rollup_grupo (periodo, inicio)",
+    ]
+    
+    # The trigger runs inside the inserting statement's transaction, so the
+    # rollups can never disagree with metricas
+    colaborador_values = ",\n            ".join(
+        f"('{periodo}', {bucket.format(col='NEW.data')}, NEW.colaborador, NEW.grupo, 1, "
+        f"NEW.taxa_eficiencia, NEW.total_registros)"
+        for periodo, bucket in ROLLUP_PERIODS
+    )
+    grupo_values = ",\n            ".join(
+        f"('{periodo}', {bucket.format(col='NEW.data')}, NEW.grupo, 1, NEW.taxa_eficiencia, NEW.total_registros)"
+        for periodo, bucket in ROLLUP_PERIODS
+    )
+    accumulate = '''
+        registros = registros + excluded.registros,
+        soma_eficiencia = soma_eficiencia + excluded.soma_eficiencia,
+        soma_total_registros = soma_total_registros + excluded.soma_total_registros'''
+    statements.append(f'''
+    CREATE TRIGGER trg_metricas_rollup AFTER INSERT ON metricas
+    BEGIN
+        INSERT INTO metricas_rollup_colaborador
+            (periodo, inicio, colaborador, grupo, registros, soma_eficiencia, soma_total_registros)
+        VALUES {colaborador_values}
+        ON CONFLICT (periodo, colaborador, grupo, inicio) DO UPDATE SET {accumulate};
+        
+        INSERT INTO metricas_rollup_grupo
+            (periodo, inicio, grupo, registros, soma_eficiencia, soma_total_registros)
+        VALUES {grupo_values}
+        ON CONFLICT (periodo, grupo, inicio) DO UPDATE SET {accumulate};
+    END
+    ''')
+    
+    # Backfill from the rows stored before this migration
+    for periodo, bucket in ROLLUP_PERIODS:
+        inicio = bucket.format(col='data')
+        statements.append(f'''
+        INSERT INTO metricas_rollup_colaborador
+        SELECT '{periodo}', {inicio}, colaborador, grupo, COUNT(*), SUM(taxa_eficiencia), SUM(total_registros)
+        FROM metricas GROUP BY 2, colaborador, grupo
+        ''')
+        statements.append(f'''
+        INSERT INTO metricas_rollup_grupo
+        SELECT '{periodo}', {inicio}, grupo, COUNT(*), SUM(taxa_eficiencia), SUM(total_registros)
+        FROM metricas GROUP BY 2, grupo
+        ''')
+    
+    return statements
+
+
+def _bucket_start(periodo, dia):
+    """First day of the rollup bucket containing dia (mirrors ROLLUP_PERIODS)."""
+    if periodo == 'semana':
+        return dia - timedelta(days=dia.weekday())
+    if periodo == 'mes':
+        return dia.replace(day=1)
+    return dia
+
+
+def _cover_window(start, end):
+    """
+    Split the days start..end (inclusive) into the coarsest whole buckets.
+    
+    Whole months are used where they fit, then whole ISO weeks, then days.
+    
+    Returns:
+        dict: periodo -> list of bucket start dates (ISO strings)
+    """
+    buckets = {periodo: [] for periodo, _ in ROLLUP_PERIODS}
+    dia = start
+    while dia <= end:
+        proximo_mes = (dia.replace(day=28) + timedelta(days=4)).replace(day=1)
+        if dia.day == 1 and proximo_mes - timedelta(days=1) <= end:
+            buckets['mes'].append(dia.isoformat())
+            dia = proximo_mes
+        elif dia.weekday() == 0 and dia + timedelta(days=6) <= end:
+            buckets['semana'].append(dia.isoformat())
+            dia += timedelta(days=7)
+        else:
+            buckets['dia'].append(dia.isoformat())
+            dia += timedelta(days=1)
+    return buckets
+
+
+# Schema history as (version, description, statements). A statement is SQL
+# or a callable receiving the connection. Append new migrations at the end;
+# never edit one that has already shipped.
+SCHEMA_MIGRATIONS = [
+    (1, "base tables", [
+        '''
+        CREATE TABLE IF NOT EXISTS metricas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            colaborador TEXT NOT NULL,
+            grupo TEXT NOT NULL,
+            data TIMESTAMP NOT NULL,
+            total_registros INTEGER NOT NULL,
+            taxa_eficiencia REAL NOT NULL,
+            tendencia TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS analise_historica (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TIMESTAMP NOT NULL,
+            grupo TEXT NOT NULL,
+            metricas TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS configuracoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chave TEXT UNIQUE NOT NULL,
+            valor TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    (2, "indexes for the history, trend and group queries", [
+        "CREATE INDEX IF NOT EXISTS idx_metricas_colaborador_data ON metricas (colaborador, data)",
+        "CREATE INDEX IF NOT EXISTS idx_metricas_grupo_data ON metricas (grupo, data)",
+        "CREATE INDEX IF NOT EXISTS idx_metricas_data ON metricas (data)",
+        "CREATE INDEX IF NOT EXISTS idx_analise_historica_grupo_data ON analise_historica (grupo, data)",
+    ]),
+    (3, "normalized analysis history", [
+        '''
+        CREATE TABLE execucoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TIMESTAMP NOT NULL,
+            grupo TEXT NOT NULL,
+            analise_historica_id INTEGER UNIQUE REFERENCES analise_historica (id),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE execucao_colaborador (
+            execucao_id INTEGER NOT NULL REFERENCES execucoes (id),
+            colaborador TEXT NOT NULL,
+            total_registros INTEGER,
+            taxa_eficiencia REAL,
+            tempo_medio_resolucao REAL,
+            tempo_mediano_resolucao REAL,
+            outliers_resolucao INTEGER,
+            tendencia TEXT,
+            tendencia_slope REAL,
+            tendencia_r2 REAL,
+            PRIMARY KEY (execucao_id, colaborador)
+        )
+        ''',
+        '''
+        CREATE TABLE execucao_status (
+            execucao_id INTEGER NOT NULL REFERENCES execucoes (id),
+            colaborador TEXT NOT NULL,
+            status TEXT NOT NULL,
+            quantidade INTEGER NOT NULL,
+            PRIMARY KEY (execucao_id, colaborador, status)
+        )
+        ''',
+        '''
+        CREATE TABLE execucao_diaria (
+            execucao_id INTEGER NOT NULL REFERENCES execucoes (id),
+            colaborador TEXT NOT NULL,
+            dia DATE NOT NULL,
+            status TEXT,
+            quantidade INTEGER NOT NULL
+        )
+        ''',
+        "CREATE INDEX idx_execucoes_grupo_data ON execucoes (grupo, data)",
+        "CREATE INDEX idx_execucoes_data ON execucoes (data)",
+        "CREATE INDEX idx_execucao_colaborador_colaborador ON execucao_colaborador (colaborador, execucao_id)",
+        "CREATE INDEX idx_execucao_diaria_execucao ON execucao_diaria (execucao_id, colaborador, dia)",
+        "CREATE INDEX idx_execucao_diaria_colaborador_dia ON execucao_diaria (colaborador, dia)",
+    ]),
+    (4, "backfill the normalized history from the JSON blobs", [
+        _backfill_history,
+    ]),
+    (5, "day, week and month rollups of metricas", _rollup_statements()),
+    (6, "index the day x status history by day", [
+        "CREATE INDEX idx_execucao_diaria_dia ON execucao_diaria (dia, colaborador)",
+    ]),
+]
+
 class DatabaseManager:
     """
     Manages database operations for the analytics system.
     Handles schema creation, data storage, and retrieval.
     """
     
-    def __init__(self, db_path):
+    def __init__(self, db_path, pool_size=DEFAULT_POOL_SIZE):
         """
         Initialize the database manager.
         
         Args:
             db_path (str): Path to the SQLite database file
+            pool_size (int, optional): Maximum number of open connections.
+                An in-memory database always uses a single connection.
         """
         self.db_path = db_path
+        self.pool_size = 1 if db_path == ':memory:' else max(1, pool_size)
+        self._pool = queue.LifoQueue(maxsize=self.pool_size)
+        self._pool_lock = threading.Lock()
+        self._open_connections = 0
         self._initialize_db()
     
+    def _create_connection(self):
+        """Open a connection usable from any thread and apply the tuning pragmas."""
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        for pragma, value in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a pooled connection for the duration of a with block.
+        
+        A new connection is opened only while fewer than pool_size exist;
+        otherwise the caller waits for one to be returned. Uncommitted work
+        is rolled back before the connection goes back to the pool.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = self._open_connections < self.pool_size
+                if create:
+                    self._open_connections += 1
+            if create:
+                try:
+                    conn = self._create_connection()
+                except Exception:
+                    with self._pool_lock:
+                        self._open_connections -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            self._pool.put(conn)
+    
+    def close(self):
+        """Close every idle pooled connection."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._pool_lock:
+                self._open_connections -= 1
+    
     def _initialize_db(self):
-        """Create the database schema if it doesn't exist."""
+        """Create the database schema or bring an existing one up to date."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Create metrics table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS metricas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                colaborador TEXT NOT NULL,
-                grupo TEXT NOT NULL,
-                data TIMESTAMP NOT NULL,
-                total_registros INTEGER NOT NULL,
-                taxa_eficiencia REAL NOT NULL,
-                tendencia TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Create analysis_history table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS analise_historica (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                data TIMESTAMP NOT NULL,
-                grupo TEXT NOT NULL,
-                metricas TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Create configuration table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS configuracoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chave TEXT UNIQUE NOT NULL,
-                valor TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            conn.commit()
-            logger.info("Database initialized successfully")
-            
+            with self._connection() as conn:
+                version = self._migrate(conn)
+                logger.info(f"Database initialized successfully (schema version {version})")
+                
         except Exception as e:
             logger.error(f"Database initialization failed: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+    
+    def _migrate(self, conn):
+        """
+        Apply the pending SCHEMA_MIGRATIONS in order.
+        
+        The current version is kept in PRAGMA user_version. Each migration
+        runs in its own transaction together with the version bump, so a
+        failed migration leaves the schema at the previous version. The
+        transaction takes the write lock up front (BEGIN IMMEDIATE) and the
+        version is reread under it, so when several processes open the
+        database at once only the first applies a migration and the others
+        find it already done.
+        
+        Args:
+            conn (sqlite3.Connection): Connection to migrate
+        
+        Returns:
+            int: Schema version after the migrations
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        for target, description, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if target <= version:
+                conn.commit()
+                continue
+            try:
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version={target}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            version = target
+            logger.info(f"Database migrated to version {target}: {description}")
+        
+        return version
     
     def store_metrics(self, colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia):
         """
@@ -97,59 +571,181 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (colaborador, grupo, data.isoformat(), total_registros, taxa_eficiencia, tendencia))
-            
-            conn.commit()
-            logger.info(f"Metrics stored for {colaborador} in group {grupo}")
-            return True
-            
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (colaborador, grupo, data.isoformat(), total_registros, taxa_eficiencia, tendencia))
+                
+                conn.commit()
+                logger.info(f"Metrics stored for {colaborador} in group {grupo}")
+                return True
+                
         except Exception as e:
             logger.error(f"Failed to store metrics: {str(e)}")
             return False
-        finally:
-            if conn:
-                conn.close()
+    
+    def store_metrics_bulk(self, records):
+        """
+        Store metrics for many collaborators in a single transaction.
+        
+        Args:
+            records (iterable): Dicts with the keyword arguments of
+                store_metrics (colaborador, grupo, data, total_registros,
+                taxa_eficiencia, tendencia)
+        
+        Returns:
+            bool: True if every record was stored, False otherwise (in which
+                case nothing is stored)
+        """
+        try:
+            rows = [
+                (r['colaborador'], r['grupo'], r['data'].isoformat(),
+                 r['total_registros'], r['taxa_eficiencia'], r['tendencia'])
+                for r in records
+            ]
+            
+            with self._connection() as conn:
+                conn.executemany('''
+                INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                
+                conn.commit()
+                logger.info(f"Metrics stored for {len(rows)} collaborators")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Failed to store metrics in bulk: {str(e)}")
+            return False
     
     def store_analysis_history(self, data, grupo, metricas):
         """
         Store a complete analysis history entry.
         
+        The run is written to the normalized history tables: one execucoes
+        row, one execucao_colaborador row per collaborator, plus its status
+        distribution (execucao_status) and day x status counts
+        (execucao_diaria), all in one transaction.
+        
         Args:
             data (datetime): Date of the analysis
             grupo (str): Group name
-            metricas (dict): Metrics data
+            metricas (dict): Metrics per collaborator, as produced by
+                AnalisadorExcel.calcular_metricas_colaborador; the day x
+                status counts are stored only when they carry
+                'cubo_dia_status' (AcumuladorMetricas.metricas with
+                incluir_cubo=True)
         
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Convert metrics to JSON string
-            metricas_json = json.dumps(metricas, ensure_ascii=False)
-            
-            cursor.execute('''
-            INSERT INTO analise_historica (data, grupo, metricas)
-            VALUES (?, ?, ?)
-            ''', (data.isoformat(), grupo, metricas_json))
-            
-            conn.commit()
-            logger.info(f"Analysis history stored for group {grupo}")
-            return True
-            
+            with self._connection() as conn:
+                _insert_history(conn, data.isoformat(), grupo, metricas)
+                
+                conn.commit()
+                logger.info(f"Analysis history stored for group {grupo}")
+                return True
+                
         except Exception as e:
             logger.error(f"Failed to store analysis history: {str(e)}")
             return False
-        finally:
-            if conn:
-                conn.close()
+    
+    def get_collaborator_history(self, colaborador, runs=90):
+        """
+        Get a collaborator's metrics over the latest analysis runs.
+        
+        Args:
+            colaborador (str): Collaborator name
+            runs (int, optional): Number of most recent runs to return
+        
+        Returns:
+            list: One dict per run (newest first) with data, grupo and the
+                typed metric columns of execucao_colaborador
+        """
+        try:
+            with self._connection() as conn:
+                conn.row_factory = sqlite3.Row
+                
+                cursor = conn.execute('''
+                SELECT e.data, e.grupo, c.total_registros, c.taxa_eficiencia,
+                       c.tempo_medio_resolucao, c.tempo_mediano_resolucao,
+                       c.outliers_resolucao, c.tendencia
+                FROM execucao_colaborador c
+                JOIN execucoes e ON e.id = c.execucao_id
+                WHERE c.colaborador = ?
+                ORDER BY c.execucao_id DESC
+                LIMIT ?
+                ''', (colaborador, runs))
+                
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Failed to retrieve collaborator history: {str(e)}")
+            return []
+    
+    def get_status_mix(self, grupo=None, start_date=None, end_date=None):
+        """
+        Get the status distribution of the records per group and week.
+        
+        Built from execucao_diaria using the latest stored version of each
+        collaborator's day, so a record is counted once however many runs
+        saw it. Weeks are those of the record dates, not of the runs.
+        
+        Args:
+            grupo (str, optional): Filter by group name
+            start_date (date, optional): First record day to include
+            end_date (date, optional): Last record day to include
+        
+        Returns:
+            list: Dicts with grupo, semana (Monday of the week), status and
+                quantidade, ordered by grupo, semana and status
+        """
+        try:
+            with self._connection() as conn:
+                conn.row_factory = sqlite3.Row
+                
+                filters = ""
+                params = []
+                
+                if grupo:
+                    filters += " AND e.grupo = ?"
+                    params.append(grupo)
+                
+                if start_date:
+                    filters += " AND d.dia >= ?"
+                    params.append(start_date.strftime('%Y-%m-%d'))
+                
+                if end_date:
+                    filters += " AND d.dia <= ?"
+                    params.append(end_date.strftime('%Y-%m-%d'))
+                
+                query = f'''
+                WITH ultimas AS (
+                    SELECT e.grupo, d.colaborador, d.dia, MAX(d.execucao_id) AS execucao_id
+                    FROM execucao_diaria d
+                    JOIN execucoes e ON e.id = d.execucao_id
+                    WHERE 1=1 {filters}
+                    GROUP BY e.grupo, d.colaborador, d.dia
+                )
+                SELECT ultimas.grupo, date(ultimas.dia, 'weekday 0', '-6 days') AS semana,
+                       d.status, SUM(d.quantidade) AS quantidade
+                FROM ultimas
+                JOIN execucao_diaria d ON d.execucao_id = ultimas.execucao_id
+                    AND d.colaborador = ultimas.colaborador AND d.dia = ultimas.dia
+                GROUP BY ultimas.grupo, semana, d.status
+                ORDER BY ultimas.grupo, semana, d.status
+                '''
+                
+                cursor = conn.execute(query, params)
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Failed to retrieve status mix: {str(e)}")
+            return []
     
     def get_metrics_history(self, colaborador=None, grupo=None, start_date=None, end_date=None, limit=10):
         """
@@ -166,44 +762,41 @@ class DatabaseManager:
             list: List of metrics records
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM metricas WHERE 1=1"
-            params = []
-            
-            if colaborador:
-                query += " AND colaborador = ?"
-                params.append(colaborador)
-            
-            if grupo:
-                query += " AND grupo = ?"
-                params.append(grupo)
-            
-            if start_date:
-                query += " AND data >= ?"
-                params.append(start_date.isoformat())
-            
-            if end_date:
-                query += " AND data <= ?"
-                params.append(end_date.isoformat())
-            
-            query += " ORDER BY data DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            results = [dict(row) for row in cursor.fetchall()]
-            
-            logger.info(f"Retrieved {len(results)} metrics records")
-            return results
-            
+            with self._connection() as conn:
+                conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+                cursor = conn.cursor()
+                
+                query = "SELECT * FROM metricas WHERE 1=1"
+                params = []
+                
+                if colaborador:
+                    query += " AND colaborador = ?"
+                    params.append(colaborador)
+                
+                if grupo:
+                    query += " AND grupo = ?"
+                    params.append(grupo)
+                
+                if start_date:
+                    query += " AND data >= ?"
+                    params.append(start_date.isoformat())
+                
+                if end_date:
+                    query += " AND data <= ?"
+                    params.append(end_date.isoformat())
+                
+                query += " ORDER BY data DESC LIMIT ?"
+                params.append(limit)
+                
+                cursor.execute(query, params)
+                results = [dict(row) for row in cursor.fetchall()]
+                
+                logger.info(f"Retrieved {len(results)} metrics records")
+                return results
+                
         except Exception as e:
             logger.error(f"Failed to retrieve metrics history: {str(e)}")
             return []
-        finally:
-            if conn:
-                conn.close()
     
     def get_efficiency_trend(self, colaborador, days=30):
         """
@@ -217,80 +810,201 @@ class DatabaseManager:
             dict: Trend data with dates and efficiency values
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT data, taxa_eficiencia 
-            FROM metricas 
-            WHERE colaborador = ? 
-            AND data >= date('now', ?) 
-            ORDER BY data ASC
-            ''', (colaborador, f'-{days} days'))
-            
-            results = [dict(row) for row in cursor.fetchall()]
-            
-            # Format the results
-            trend_data = {
-                "dates": [row["data"] for row in results],
-                "efficiency": [row["taxa_eficiencia"] for row in results]
-            }
-            
-            return trend_data
-            
+            with self._connection() as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                SELECT data, taxa_eficiencia 
+                FROM metricas 
+                WHERE colaborador = ? 
+                AND data >= date('now', ?) 
+                ORDER BY data ASC
+                ''', (colaborador, f'-{days} days'))
+                
+                results = [dict(row) for row in cursor.fetchall()]
+                
+                # Format the results
+                trend_data = {
+                    "dates": [row["data"] for row in results],
+                    "efficiency": [row["taxa_eficiencia"] for row in results]
+                }
+                
+                return trend_data
+                
         except Exception as e:
             logger.error(f"Failed to retrieve efficiency trend: {str(e)}")
             return {"dates": [], "efficiency": []}
-        finally:
-            if conn:
-                conn.close()
+    
+    def get_efficiency_rollup(self, days=30, grupo=None, colaborador=None, per_collaborator=False, periodo=None):
+        """
+        Get efficiency history per rollup bucket for charts.
+        
+        Reads the day/week/month rollups instead of the raw metricas rows, so
+        the cost grows with the number of buckets, not with stored history.
+        
+        Args:
+            days (int, optional): Number of days to look back
+            grupo (str, optional): Filter by group name
+            colaborador (str, optional): Filter by collaborator name (implies
+                per_collaborator)
+            per_collaborator (bool, optional): One series per collaborator
+                instead of one per group
+            periodo (str, optional): 'dia', 'semana' or 'mes'. By default the
+                coarsest one that still gives ROLLUP_MIN_BUCKETS points
+        
+        Returns:
+            list: Dicts with periodo, inicio (bucket start), grupo,
+                colaborador (per collaborator only), registros,
+                taxa_eficiencia (mean) and total_registros, ordered by inicio
+        """
+        if periodo is None:
+            periodo = self._choose_period(days)
+        start = _bucket_start(periodo, date.today() - timedelta(days=days))
+        per_collaborator = per_collaborator or colaborador is not None
+        
+        try:
+            with self._connection() as conn:
+                conn.row_factory = sqlite3.Row
+                
+                table = 'metricas_rollup_colaborador' if per_collaborator else 'metricas_rollup_grupo'
+                columns = 'grupo, colaborador' if per_collaborator else 'grupo'
+                query = f'''
+                SELECT periodo, inicio, {columns}, registros,
+                       soma_eficiencia / registros AS taxa_eficiencia,
+                       soma_total_registros AS total_registros
+                FROM {table}
+                WHERE periodo = ? AND inicio >= ?
+                '''
+                params = [periodo, start.isoformat()]
+                
+                if colaborador:
+                    query += " AND colaborador = ?"
+                    params.append(colaborador)
+                
+                if grupo:
+                    query += " AND grupo = ?"
+                    params.append(grupo)
+                
+                query += f" ORDER BY inicio, {columns}"
+                
+                cursor = conn.execute(query, params)
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Failed to retrieve efficiency rollup: {str(e)}")
+            return []
+    
+    def get_efficiency_summary(self, start_date, end_date=None, grupo=None, colaborador=None):
+        """
+        Get the mean efficiency and record total over a date window.
+        
+        The window is covered by the coarsest whole rollup buckets (months,
+        then ISO weeks, then days), so the result equals an aggregation of
+        the raw metricas rows in the window.
+        
+        Args:
+            start_date (date): First day of the window
+            end_date (date, optional): Last day of the window (default today)
+            grupo (str, optional): Filter by group name
+            colaborador (str, optional): Filter by collaborator name
+        
+        Returns:
+            dict: registros, taxa_eficiencia (mean, None without records),
+                total_registros and buckets (rollup rows read)
+        """
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        end_date = end_date or date.today()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        summary = {"registros": 0, "taxa_eficiencia": None, "total_registros": 0, "buckets": 0}
+        
+        try:
+            with self._connection() as conn:
+                table = 'metricas_rollup_colaborador' if colaborador else 'metricas_rollup_grupo'
+                soma_eficiencia = 0.0
+                
+                for periodo, inicios in _cover_window(start_date, end_date).items():
+                    if not inicios:
+                        continue
+                    
+                    query = f'''
+                    SELECT COUNT(*), SUM(registros), SUM(soma_eficiencia), SUM(soma_total_registros)
+                    FROM {table}
+                    WHERE periodo = ? AND inicio IN ({", ".join("?" * len(inicios))})
+                    '''
+                    params = [periodo] + inicios
+                    
+                    if colaborador:
+                        query += " AND colaborador = ?"
+                        params.append(colaborador)
+                    
+                    if grupo:
+                        query += " AND grupo = ?"
+                        params.append(grupo)
+                    
+                    buckets, registros, eficiencia, total = conn.execute(query, params).fetchone()
+                    summary["buckets"] += buckets
+                    summary["registros"] += registros or 0
+                    summary["total_registros"] += total or 0
+                    soma_eficiencia += eficiencia or 0.0
+                
+                if summary["registros"]:
+                    summary["taxa_eficiencia"] = soma_eficiencia / summary["registros"]
+                return summary
+                
+        except Exception as e:
+            logger.error(f"Failed to retrieve efficiency summary: {str(e)}")
+            return summary
+    
+    @staticmethod
+    def _choose_period(days):
+        """Coarsest rollup period that still gives ROLLUP_MIN_BUCKETS buckets."""
+        for periodo, bucket_days in (('mes', 30), ('semana', 7)):
+            if days // bucket_days >= ROLLUP_MIN_BUCKETS:
+                return periodo
+        return 'dia'
     
     def get_group_comparison(self):
         """
         Get comparison data between Julio and Leandro groups.
         
+        Read from the monthly group rollups (metricas_rollup_grupo), so the
+        cost does not grow with the stored history.
+        
         Returns:
             dict: Comparison metrics between groups
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get average efficiency by group
-            cursor.execute('''
-            SELECT grupo, AVG(taxa_eficiencia) as avg_eficiencia
-            FROM metricas
-            GROUP BY grupo
-            ''')
-            
-            efficiency_results = cursor.fetchall()
-            efficiency_by_group = {row[0]: row[1] for row in efficiency_results}
-            
-            # Get total records by group
-            cursor.execute('''
-            SELECT grupo, SUM(total_registros) as total
-            FROM metricas
-            GROUP BY grupo
-            ''')
-            
-            total_results = cursor.fetchall()
-            total_by_group = {row[0]: row[1] for row in total_results}
-            
-            # Compile the comparison data
-            comparison = {
-                "efficiency": efficiency_by_group,
-                "total_records": total_by_group
-            }
-            
-            return comparison
-            
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                
+                # Monthly rollups: one row per group and month instead of
+                # every stored metric
+                cursor.execute('''
+                SELECT grupo, SUM(soma_eficiencia) / SUM(registros) as avg_eficiencia,
+                       SUM(soma_total_registros) as total
+                FROM metricas_rollup_grupo
+                WHERE periodo = 'mes'
+                GROUP BY grupo
+                ''')
+                
+                results = cursor.fetchall()
+                efficiency_by_group = {row[0]: row[1] for row in results}
+                total_by_group = {row[0]: row[2] for row in results}
+                
+                # Compile the comparison data
+                comparison = {
+                    "efficiency": efficiency_by_group,
+                    "total_records": total_by_group
+                }
+                
+                return comparison
+                
         except Exception as e:
             logger.error(f"Failed to retrieve group comparison: {str(e)}")
             return {"efficiency": {}, "total_records": {}}
-        finally:
-            if conn:
-                conn.close()
     
     def save_configuration(self, key, value):
         """
@@ -304,28 +1018,25 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Convert value to JSON if it's not a string
-            if not isinstance(value, str):
-                value = json.dumps(value)
-            
-            cursor.execute('''
-            INSERT OR REPLACE INTO configuracoes (chave, valor, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (key, value))
-            
-            conn.commit()
-            logger.info(f"Configuration saved: {key}")
-            return True
-            
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                
+                # Convert value to JSON if it's not a string
+                if not isinstance(value, str):
+                    value = json.dumps(value)
+                
+                cursor.execute('''
+                INSERT OR REPLACE INTO configuracoes (chave, valor, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', (key, value))
+                
+                conn.commit()
+                logger.info(f"Configuration saved: {key}")
+                return True
+                
         except Exception as e:
             logger.error(f"Failed to save configuration: {str(e)}")
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def get_configuration(self, key, default=None):
         """
@@ -339,29 +1050,26 @@ class DatabaseManager:
             any: Configuration value
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT valor FROM configuracoes WHERE chave = ?
-            ''', (key,))
-            
-            result = cursor.fetchone()
-            
-            if result:
-                value = result[0]
-                try:
-                    # Try to parse as JSON
-                    return json.loads(value)
-                except:
-                    # Return as is if not JSON
-                    return value
-            else:
-                return default
-            
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                SELECT valor FROM configuracoes WHERE chave = ?
+                ''', (key,))
+                
+                result = cursor.fetchone()
+                
+                if result:
+                    value = result[0]
+                    try:
+                        # Try to parse as JSON
+                        return json.loads(value)
+                    except:
+                        # Return as is if not JSON
+                        return value
+                else:
+                    return default
+                
         except Exception as e:
             logger.error(f"Failed to retrieve configuration: {str(e)}")
             return default
-        finally:
-            if conn:
-                conn.close()
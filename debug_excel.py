@@ -6,19 +6,61 @@ from datetime import datetime, timedelta
 import warnings
 import traceback
 import json
+import hashlib
 import streamlit as st
 import base64
+from collections import Counter
+
+from normalizador_datas import converter_datas, resumir_falhas, obter_formatos_padrao
+from leitor_excel import (ler_abas, abrir_planilha, impressoes_abas, linhas_abas, abrir_planilha_streaming,
+                          ler_aba_em_blocos, ProjecaoColunas, conteudo_em_bytes,
+                          CACHE_PADRAO, TAMANHO_BLOCO_PADRAO, LIMITE_STREAMING_PADRAO)
+from acumulador_metricas import AcumuladorMetricas, acumular_por_grupo, tendencias_em_lote
+from cache_metricas import obter_cache_metricas_padrao
+from arquivamento import arquivar_em_segundo_plano
 
 # Suprimir avisos específicos do pandas
 warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
 
+
+def _hash_linhas(hashes_linhas):
+    """Resumo dos hashes por linha de um trecho da aba"""
+    return hashlib.sha1(np.ascontiguousarray(hashes_linhas).tobytes()).hexdigest()
+
+
 class AnalisadorExcel:
-    def __init__(self, file_path):
+    # Colunas usadas pelas métricas (nomes já normalizados); as demais não são lidas
+    COLUNAS_METRICAS = {'DATA': ['DATA'], 'STATUS': ['STATUS'], 'RESOLUCAO': ['RESOLUCAO']}
+
+    def __init__(self, file_path, cache_metricas=CACHE_PADRAO, streaming=None,
+                 limite_streaming=LIMITE_STREAMING_PADRAO, tamanho_bloco=TAMANHO_BLOCO_PADRAO, conteudo=None,
+                 quantis_exatos=True):
         self.file_path = file_path
+        # Arquivo já em memória (ex.: upload): lido daqui, e file_path serve só de nome
+        self.conteudo = None if conteudo is None else conteudo_em_bytes(conteudo)
+        self.origem = file_path if self.conteudo is None else self.conteudo
+        # Com False, mediana e quartis de resolução vêm do esboço de quantis (validação com True)
+        self.quantis_exatos = quantis_exatos
         self.colaboradores = {}
         self.erros = []
+        # Métricas por aba reaproveitadas entre análises (None desativa)
+        if cache_metricas is CACHE_PADRAO:
+            cache_metricas = obter_cache_metricas_padrao()
+        self.cache_metricas = cache_metricas
+        # Leitura em blocos: True sempre, False nunca, None quando a aba passa de limite_streaming linhas
+        self.streaming = streaming
+        self.limite_streaming = limite_streaming
+        self.tamanho_bloco = tamanho_bloco
+        self.projecao = ProjecaoColunas(self.COLUNAS_METRICAS, obrigatorios=['DATA', 'STATUS'])
         print(f"Criando analisador para {os.path.basename(file_path)}")
         
+    def _chave_metricas(self, sheet_name, impressao):
+        """Chave das métricas de uma aba no cache (analisador + arquivo + aba + impressão)"""
+        origem = f"{type(self).__module__}.{type(self).__qualname__}|{os.path.basename(self.file_path)}"
+        if not self.quantis_exatos:
+            origem += '|esboco'
+        return self.cache_metricas.chave(origem, sheet_name, impressao)
+        
     def normalizar_coluna(self, nome_coluna):
         """Normaliza o nome da coluna para um formato padrão"""
         if not isinstance(nome_coluna, str):
@@ -85,11 +127,19 @@ class AnalisadorExcel:
             print(f"Erro ao processar data '{valor}': {str(e)}")
             return None
     
-    def calcular_metricas_colaborador(self, df, nome_colaborador):
-        """Calcula métricas para um colaborador específico"""
+    def calcular_metricas_colaborador(self, df, nome_colaborador, acumulador=None):
+        """
+        Calcula métricas para um colaborador específico.
+        
+        Com um acumulador (agregados de uma execução anterior), df contém
+        apenas as linhas novas, que são somadas a ele.
+        """
         try:
+            if acumulador is None:
+                acumulador = AcumuladorMetricas(quantis_exatos=self.quantis_exatos)
+            
             # Verificar se há dados suficientes
-            if df.empty:
+            if df.empty and acumulador.total_registros == 0:
                 print(f"Sem dados para {nome_colaborador}")
                 return None
                 
@@ -102,211 +152,171 @@ class AnalisadorExcel:
                 print(f"Erro ao processar dados de {nome_colaborador}: {colunas_faltantes}")
                 return None
             
-            # Criar cópia segura do DataFrame para evitar SettingWithCopyWarning
-            df_analise = df.copy()
-            
-            # Converter colunas de data
-            try:
-                # Usar .loc para evitar SettingWithCopyWarning
-                df_analise.loc[:, 'DATA'] = df_analise['DATA'].apply(self.corrigir_formato_data)
-                
-                # Verificar se a conversão funcionou
-                if df_analise['DATA'].isna().all():
-                    print(f"Erro: Todas as datas são nulas para {nome_colaborador}")
+            if not df.empty:
+                # Converter colunas de data
+                falhas = {'DATA': Counter(), 'RESOLUCAO': Counter()}
+                try:
+                    df_analise = self._preparar_datas(df, nome_colaborador, falhas)
+                except Exception as e:
+                    print(f"Erro ao processar datas para {nome_colaborador}: {str(e)}")
+                    traceback.print_exc()
                     return None
+                self._exibir_falhas_datas(nome_colaborador, falhas)
                 
-                # Remover linhas com datas nulas
-                df_analise = df_analise.dropna(subset=['DATA'])
-                
-                # Converter coluna RESOLUCAO se existir
-                if 'RESOLUCAO' in df_analise.columns:
-                    df_analise.loc[:, 'RESOLUCAO'] = df_analise['RESOLUCAO'].apply(self.corrigir_formato_data)
-            except Exception as e:
-                print(f"Erro ao processar datas para {nome_colaborador}: {str(e)}")
-                traceback.print_exc()
-                return None
-            
-            # Calcular total de registros
-            total_registros = len(df_analise)
-            
-            # Calcular distribuição de status
-            try:
-                distribuicao_status = df_analise['STATUS'].value_counts().to_dict()
-                # Converter para porcentagens
-                distribuicao_percentual = {k: round(v / total_registros * 100, 1) for k, v in distribuicao_status.items()}
-            except Exception as e:
-                print(f"Erro ao calcular distribuição de status: {str(e)}")
-                distribuicao_status = {}
-                distribuicao_percentual = {}
-            
-            # Calcular tempo médio de resolução
-            tempo_medio_resolucao = None
-            tempo_mediano_resolucao = None
-            outliers_resolucao = 0
+                if not df_analise.empty:
+                    acumulador.adicionar(df_analise)
             
-            try:
-                if 'RESOLUCAO' in df_analise.columns:
-                    # Calcular diferença entre data de resolução e data de criação
-                    df_resolvidos = df_analise.dropna(subset=['RESOLUCAO'])
-                    
-                    if not df_resolvidos.empty:
-                        # Usar método seguro para calcular a diferença
-                        try:
-                            # Converter para datetime se ainda não for
-                            if not pd.api.types.is_datetime64_dtype(df_resolvidos['DATA']):
-                                df_resolvidos.loc[:, 'DATA'] = pd.to_datetime(df_resolvidos['DATA'])
-                            if not pd.api.types.is_datetime64_dtype(df_resolvidos['RESOLUCAO']):
-                                df_resolvidos.loc[:, 'RESOLUCAO'] = pd.to_datetime(df_resolvidos['RESOLUCAO'])
-                            
-                            # Calcular diferença em dias
-                            df_resolvidos.loc[:, 'tempo_resolucao'] = (df_resolvidos['RESOLUCAO'] - df_resolvidos['DATA']).dt.days
-                            
-                            # Remover valores negativos ou extremamente altos (provavelmente erros)
-                            df_resolvidos = df_resolvidos[(df_resolvidos['tempo_resolucao'] >= 0) & (df_resolvidos['tempo_resolucao'] <= 365)]
-                            
-                            if not df_resolvidos.empty:
-                                tempo_medio_resolucao = round(df_resolvidos['tempo_resolucao'].mean(), 1)
-                                tempo_mediano_resolucao = round(df_resolvidos['tempo_resolucao'].median(), 1)
-                                
-                                # Identificar outliers (método IQR)
-                                Q1 = df_resolvidos['tempo_resolucao'].quantile(0.25)
-                                Q3 = df_resolvidos['tempo_resolucao'].quantile(0.75)
-                                IQR = Q3 - Q1
-                                outliers_resolucao = len(df_resolvidos[(df_resolvidos['tempo_resolucao'] < (Q1 - 1.5 * IQR)) | 
-                                                                      (df_resolvidos['tempo_resolucao'] > (Q3 + 1.5 * IQR))])
-                        except Exception as e:
-                            print(f"Erro ao calcular tempo de resolução: {str(e)}")
-                            traceback.print_exc()
-            except Exception as e:
-                print(f"Erro ao processar tempos de resolução: {str(e)}")
-                traceback.print_exc()
+            # Verificar se a conversão funcionou
+            if acumulador.total_registros == 0:
+                print(f"Erro: Todas as datas são nulas para {nome_colaborador}")
+                return None
             
-            # Calcular taxa de eficiência (registros resolvidos / total)
-            taxa_eficiencia = None
-            try:
-                if 'STATUS' in df_analise.columns:
-                    # Considerar como resolvidos os status diferentes de PENDENTE, ANÁLISE, PRIORIDADE
-                    status_pendentes = ['PENDENTE', 'ANÁLISE', 'PRIORIDADE', 'PRIORIDADE TOTAL']
-                    resolvidos = df_analise[~df_analise['STATUS'].isin(status_pendentes)]
-                    taxa_eficiencia = round(len(resolvidos) / total_registros, 3) if total_registros > 0 else 0
-            except Exception as e:
-                print(f"Erro ao calcular taxa de eficiência: {str(e)}")
+            return acumulador.metricas(nome_colaborador)
+        except Exception as e:
+            print(f"Erro ao calcular métricas para {nome_colaborador}: {str(e)}")
+            traceback.print_exc()
+            return None
+    
+    def calcular_metricas_incrementais(self, df, nome_colaborador):
+        """
+        Calcula as métricas da aba processando só as linhas acrescentadas desde a última análise.
+        
+        O estado persistido guarda os agregados, a quantidade de linhas já
+        processadas e um hash dessas linhas. Se as primeiras linhas da aba
+        ainda são as mesmas (a aba só cresceu) e as colunas têm os mesmos
+        tipos, apenas as linhas seguintes são convertidas e acumuladas; caso
+        contrário a aba inteira é recalculada.
+        """
+        if self.cache_metricas is None:
+            return self.calcular_metricas_colaborador(df, nome_colaborador)
+        
+        origem = f"{type(self).__module__}.{type(self).__qualname__}"
+        chave = self.cache_metricas.chave_estado(origem, os.path.basename(self.file_path), nome_colaborador)
+        hashes_linhas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        colunas = [(str(col), str(dtype)) for col, dtype in df.dtypes.items()]
+        
+        inicio = 0
+        acumulador = AcumuladorMetricas(quantis_exatos=self.quantis_exatos)
+        _, estado = self.cache_metricas.obter(chave)
+        if (estado and estado['colunas'] == colunas and estado['linhas'] <= len(df)
+                and estado['acumulador'].quantis_exatos == self.quantis_exatos
+                and estado['hash_linhas'] == _hash_linhas(hashes_linhas[:estado['linhas']])):
+            inicio = estado['linhas']
+            acumulador = estado['acumulador']
+            print(f"{nome_colaborador}: {len(df) - inicio} linhas novas de {len(df)}")
+        
+        metricas = self.calcular_metricas_colaborador(df.iloc[inicio:], nome_colaborador, acumulador)
+        if metricas is not None:
+            self.cache_metricas.salvar(chave, {
+                'linhas': len(df),
+                'hash_linhas': _hash_linhas(hashes_linhas),
+                'colunas': colunas,
+                'acumulador': acumulador
+            })
+        return metricas
+    
+    def calcular_metricas_streaming(self, planilha, nome_colaborador):
+        """Calcula as métricas lendo a aba em blocos de linhas (memória limitada ao bloco)"""
+        try:
+            acumulador = AcumuladorMetricas(quantis_exatos=self.quantis_exatos)
+            falhas = {'DATA': Counter(), 'RESOLUCAO': Counter()}
+            linhas_lidas = 0
             
-            # Calcular médias diárias por status
-            medias_diarias = {}
-            try:
-                if 'DATA' in df_analise.columns and 'STATUS' in df_analise.columns:
-                    # Agrupar por data e status
-                    df_analise.loc[:, 'data_apenas'] = df_analise['DATA'].dt.date
-                    agrupado = df_analise.groupby(['data_apenas', 'STATUS']).size().reset_index(name='contagem')
-                    
-                    # Calcular média por status
-                    for status in df_analise['STATUS'].unique():
-                        status_data = agrupado[agrupado['STATUS'] == status]
-                        if not status_data.empty:
-                            media = round(status_data['contagem'].mean(), 1)
-                            medias_diarias[status] = media
-            except Exception as e:
-                print(f"Erro ao calcular médias diárias: {str(e)}")
-                traceback.print_exc()
+            for bloco in ler_aba_em_blocos(planilha, nome_colaborador, self.tamanho_bloco, colunas=self.projecao):
+                bloco.columns = [self.normalizar_coluna(col) for col in bloco.columns]
+                
+                # Verificar colunas necessárias no primeiro bloco
+                if linhas_lidas == 0:
+                    colunas_faltantes = {'DATA', 'STATUS'} - set(bloco.columns)
+                    if colunas_faltantes:
+                        print(f"Erro ao processar dados de {nome_colaborador}: {colunas_faltantes}")
+                        return None
+                linhas_lidas += len(bloco)
+                
+                try:
+                    df_analise = self._preparar_datas(bloco, nome_colaborador, falhas)
+                except Exception as e:
+                    print(f"Erro ao processar datas para {nome_colaborador}: {str(e)}")
+                    traceback.print_exc()
+                    return None
+                acumulador.adicionar(df_analise)
             
-            # Analisar tendência
-            tendencia = {}
-            try:
-                if 'DATA' in df_analise.columns:
-                    # Agrupar por data
-                    df_analise.loc[:, 'data_apenas'] = df_analise['DATA'].dt.date
-                    contagem_diaria = df_analise.groupby('data_apenas').size().reset_index(name='contagem')
-                    
-                    if len(contagem_diaria) > 1:
-                        # Converter datas para números (dias desde a primeira data)
-                        primeira_data = contagem_diaria['data_apenas'].min()
-                        contagem_diaria.loc[:, 'dias'] = (contagem_diaria['data_apenas'] - primeira_data).dt.days
-                        
-                        # Calcular coeficiente de correlação
-                        corr = np.corrcoef(contagem_diaria['dias'], contagem_diaria['contagem'])[0, 1]
-                        
-                        # Determinar direção da tendência
-                        if corr > 0.1:
-                            direcao = 'crescente'
-                        elif corr < -0.1:
-                            direcao = 'decrescente'
-                        else:
-                            direcao = 'estável'
-                            
-                            # Calcular R²
-                            if len(contagem_diaria) > 2:
-                                x = contagem_diaria['dias'].values.reshape(-1, 1)
-                                y = contagem_diaria['contagem'].values
-                                
-                                # Calcular regressão linear manualmente
-                                n = len(x)
-                                x_mean = np.mean(x)
-                                y_mean = np.mean(y)
-                                
-                                numerator = np.sum((x - x_mean) * (y - y_mean))
-                                denominator = np.sum((x - x_mean) ** 2)
-                                
-                                if denominator != 0:
-                                    slope = numerator / denominator
-                                    intercept = y_mean - slope * x_mean
-                                    
-                                    y_pred = slope * x + intercept
-                                    r2 = max(0, 1 - np.sum((y - y_pred.flatten()) ** 2) / np.sum((y - y_mean) ** 2))
-                                else:
-                                    slope = 0
-                                    intercept = y_mean
-                                    r2 = 0
-                            else:
-                                slope = 0
-                                intercept = 0
-                                r2 = 0
-                            
-                            tendencia = {
-                                'direcao': direcao,
-                                'correlacao': round(corr, 2),
-                                'r2': round(r2, 2),
-                                'slope': round(float(slope), 4),
-                                'intercept': round(float(intercept), 2)
-                            }
-            except Exception as e:
-                print(f"Erro ao analisar tendência: {str(e)}")
-                traceback.print_exc()
-                tendencia = {'direcao': 'estável', 'r2': 0}
+            if linhas_lidas == 0:
+                print(f"Sem dados para {nome_colaborador}")
+                return None
             
-            # Analisar padrão semanal
-            padrao_semanal = {}
-            try:
-                if 'DATA' in df_analise.columns:
-                    # Extrair dia da semana
-                    df_analise.loc[:, 'dia_semana'] = df_analise['DATA'].dt.day_name()
-                    
-                    # Contar registros por dia da semana
-                    padrao_semanal = df_analise['dia_semana'].value_counts().to_dict()
-            except Exception as e:
-                print(f"Erro ao analisar padrão semanal: {str(e)}")
-            
-            # Compilar todas as métricas
-            metricas = {
-                'nome': nome_colaborador,
-                'total_registros': total_registros,
-                'distribuicao_status': distribuicao_status,
-                'distribuicao_percentual': distribuicao_percentual,
-                'tempo_medio_resolucao': tempo_medio_resolucao,
-                'tempo_mediano_resolucao': tempo_mediano_resolucao,
-                'outliers_resolucao': outliers_resolucao,
-                'taxa_eficiencia': taxa_eficiencia,
-                'medias_diarias': medias_diarias,
-                'tendencia': tendencia,
-                'padrao_semanal': padrao_semanal
-            }
+            self._exibir_falhas_datas(nome_colaborador, falhas)
+            if acumulador.total_registros == 0:
+                print(f"Erro: Todas as datas são nulas para {nome_colaborador}")
+                return None
             
-            return metricas
+            print(f"{nome_colaborador}: {linhas_lidas} linhas lidas em blocos de {self.tamanho_bloco}")
+            return acumulador.metricas(nome_colaborador)
         except Exception as e:
             print(f"Erro ao calcular métricas para {nome_colaborador}: {str(e)}")
             traceback.print_exc()
             return None
     
+    def calcular_metricas_por_colaborador(self, df, coluna_colaborador, nome_aba=''):
+        """
+        Calcula as métricas de todos os colaboradores de uma planilha em formato longo de uma só vez.
+        
+        nome_aba é a aba de onde df foi lido; identifica as colunas de data no
+        registro de formatos (FormatosDatas).
+        """
+        try:
+            colunas_faltantes = {'DATA', 'STATUS'} - set(df.columns)
+            if colunas_faltantes:
+                print(f"Erro ao processar dados de {os.path.basename(self.file_path)}: {colunas_faltantes}")
+                return {}
+            
+            # Datas convertidas uma única vez para o arquivo inteiro
+            falhas = {'DATA': Counter(), 'RESOLUCAO': Counter()}
+            df_analise = self._preparar_datas(df, nome_aba, falhas)
+            self._exibir_falhas_datas(os.path.basename(self.file_path), falhas)
+            
+            acumuladores = acumular_por_grupo(df_analise, coluna_colaborador, quantis_exatos=self.quantis_exatos)
+            # Uma única regressão para as tendências de todos os colaboradores
+            tendencias = dict(zip(acumuladores, tendencias_em_lote(list(acumuladores.values()))))
+            metricas = {}
+            for colaborador in df[coluna_colaborador].dropna().unique():
+                if colaborador in acumuladores:
+                    metricas[colaborador] = acumuladores[colaborador].metricas(colaborador, tendencias[colaborador])
+                else:
+                    print(f"Erro: Todas as datas são nulas para {colaborador}")
+            return metricas
+        except Exception as e:
+            print(f"Erro ao calcular métricas por colaborador: {str(e)}")
+            traceback.print_exc()
+            return {}
+    
+    def _preparar_datas(self, df, nome_colaborador, falhas):
+        """Converte DATA e RESOLUCAO e remove as linhas sem data"""
+        # Criar cópia segura do DataFrame para evitar SettingWithCopyWarning
+        df_analise = df.copy()
+        formatos = obter_formatos_padrao()
+        
+        # Usar .loc para evitar SettingWithCopyWarning
+        df_analise.loc[:, 'DATA'] = converter_datas(
+            df_analise['DATA'], falhas['DATA'],
+            formatos=formatos, chave=formatos.chave(self.file_path, nome_colaborador, 'DATA'))
+        
+        # Remover linhas com datas nulas
+        df_analise = df_analise.dropna(subset=['DATA'])
+        
+        # Converter coluna RESOLUCAO se existir
+        if 'RESOLUCAO' in df_analise.columns:
+            df_analise.loc[:, 'RESOLUCAO'] = converter_datas(
+                df_analise['RESOLUCAO'], falhas['RESOLUCAO'],
+                formatos=formatos, chave=formatos.chave(self.file_path, nome_colaborador, 'RESOLUCAO'))
+        return df_analise
+    
+    def _exibir_falhas_datas(self, nome_colaborador, falhas):
+        """Exibe o resumo agregado das datas que não puderam ser convertidas"""
+        for coluna, contagem in falhas.items():
+            if contagem:
+                print(f"{nome_colaborador}: {resumir_falhas(contagem, coluna)}")
+    
     def exibir_metricas_colaborador(self, metricas):
         """Exibe as métricas calculadas para um colaborador"""
         if not metricas:
@@ -360,7 +370,7 @@ class AnalisadorExcel:
             print(f"Analisando arquivo {self.file_path}")
             
             # Verificar se o arquivo existe
-            if not os.path.exists(self.file_path):
+            if self.conteudo is None and not os.path.exists(self.file_path):
                 print(f"Arquivo não encontrado: {self.file_path}")
                 self.erros.append({
                     'arquivo': os.path.basename(self.file_path),
@@ -368,9 +378,28 @@ class AnalisadorExcel:
                 })
                 return []
                 
-            # Ler o arquivo Excel com tratamento de erros
+            # Reaproveitar as métricas das abas cujo XML não mudou
+            impressoes = None
+            reaproveitadas = {}
+            if self.cache_metricas is not None:
+                impressoes = impressoes_abas(self.origem)
+                for sheet_name, impressao in (impressoes or {}).items():
+                    encontrado, metricas = self.cache_metricas.obter(self._chave_metricas(sheet_name, impressao))
+                    if encontrado:
+                        reaproveitadas[sheet_name] = metricas
+                if reaproveitadas:
+                    print(f"{len(reaproveitadas)} de {len(impressoes)} abas inalteradas; métricas reaproveitadas")
+            
+            # Abas grandes são lidas em blocos, sem materializar a aba inteira
+            linhas = {}
+            if self.streaming is not False:
+                linhas = linhas_abas(self.origem, filtro=lambda aba: aba not in reaproveitadas) or {}
+            grandes = [aba for aba, n in linhas.items() if self.streaming or n > self.limite_streaming]
+            
+            # Abrir o arquivo Excel uma única vez (ou servir as abas do cache)
             try:
-                xls = pd.ExcelFile(self.file_path)
+                abas = ler_abas(self.origem, filtro=lambda aba: aba not in reaproveitadas and aba not in grandes,
+                                erros=self.erros, colunas=self.projecao)
             except Exception as e:
                 print(f"Erro ao abrir arquivo Excel: {str(e)}")
                 self.erros.append({
@@ -379,39 +408,27 @@ class AnalisadorExcel:
                 })
                 return []
                 
-            # Processar cada aba
-            nomes_colaboradores = []
+            # Processar apenas as abas novas ou alteradas
+            calculadas = {}
             
-            for sheet_name in xls.sheet_names:
+            for sheet_name, df in abas:
                 print(f"Analisando dados de: {sheet_name}")
                 
                 try:
-                    # Ler a aba com tratamento de erros
-                    try:
-                        df = pd.read_excel(self.file_path, sheet_name=sheet_name)
-                    except Exception as e:
-                        print(f"Erro ao ler aba {sheet_name}: {str(e)}")
-                        self.erros.append({
-                            'aba': sheet_name,
-                            'erro': f'Erro ao ler aba: {str(e)}'
-                        })
-                        continue
-                    
                     # Verificar se há dados
                     if df.empty:
                         print(f"Aba {sheet_name} está vazia.")
-                        continue
+                        metricas = None
+                    else:
+                        # Normalizar nomes das colunas
+                        df.columns = [self.normalizar_coluna(col) for col in df.columns]
                         
-                    # Normalizar nomes das colunas
-                    df.columns = [self.normalizar_coluna(col) for col in df.columns]
+                        # Calcular métricas para o colaborador (só as linhas novas, se a aba apenas cresceu)
+                        metricas = self.calcular_metricas_incrementais(df, sheet_name)
                     
-                    # Calcular métricas para o colaborador
-                    metricas = self.calcular_metricas_colaborador(df, sheet_name)
-                    
-                    if metricas:
-                        self.colaboradores[sheet_name] = metricas
-                        nomes_colaboradores.append(sheet_name)
-                        self.exibir_metricas_colaborador(metricas)
+                    calculadas[sheet_name] = metricas
+                    if impressoes and sheet_name in impressoes:
+                        self.cache_metricas.salvar(self._chave_metricas(sheet_name, impressoes[sheet_name]), metricas)
                         
                 except Exception as e:
                     print(f"Erro ao processar aba {sheet_name}: {str(e)}")
@@ -422,6 +439,43 @@ class AnalisadorExcel:
                     })
                     continue
             
+            if grandes:
+                planilha = abrir_planilha_streaming(self.origem)
+                try:
+                    for sheet_name in grandes:
+                        print(f"Analisando dados de: {sheet_name} (em blocos, ~{linhas[sheet_name]} linhas)")
+                        
+                        try:
+                            metricas = self.calcular_metricas_streaming(planilha, sheet_name)
+                            
+                            calculadas[sheet_name] = metricas
+                            if impressoes and sheet_name in impressoes:
+                                self.cache_metricas.salvar(self._chave_metricas(sheet_name, impressoes[sheet_name]), metricas)
+                                
+                        except Exception as e:
+                            print(f"Erro ao processar aba {sheet_name}: {str(e)}")
+                            traceback.print_exc()
+                            self.erros.append({
+                                'aba': sheet_name,
+                                'erro': str(e)
+                            })
+                            continue
+                finally:
+                    planilha.close()
+            
+            # Reunir as métricas na ordem das abas do arquivo
+            nomes_colaboradores = []
+            
+            for sheet_name in (impressoes or linhas or calculadas):
+                metricas = reaproveitadas.get(sheet_name, calculadas.get(sheet_name))
+                if metricas:
+                    self.colaboradores[sheet_name] = metricas
+                    nomes_colaboradores.append(sheet_name)
+                    self.exibir_metricas_colaborador(metricas)
+            
+            if calculadas:
+                print(obter_formatos_padrao().resumo())
+            
             # Calcular métricas comparativas
             self.calcular_metricas_comparativas()
             
@@ -912,16 +966,10 @@ class AnalisadorExcel:
     def processar_arquivo_bytes(self, bytes_data, grupo, nome_arquivo):
         """Processa um arquivo Excel a partir de bytes"""
         try:
-            # Criar diretório de uploads se não existir
-            os.makedirs('uploads', exist_ok=True)
-            
-            # Salvar arquivo temporariamente
-            temp_path = os.path.join('uploads', nome_arquivo)
-            with open(temp_path, 'wb') as f:
-                f.write(bytes_data)
-            
-            # Processar o arquivo
-            analisador = AnalisadorExcel(temp_path)
+            # Processar o arquivo direto da memória; a cópia em uploads/ é gravada em segundo plano
+            conteudo = conteudo_em_bytes(bytes_data)
+            arquivar_em_segundo_plano(conteudo, os.path.join('uploads', nome_arquivo))
+            analisador = AnalisadorExcel(nome_arquivo, conteudo=conteudo)
             analisador.processar_arquivo()
             
             # Verificar se há colaboradores
@@ -956,13 +1004,15 @@ class AnalisadorExcel:
             print(f"Analisando arquivo {os.path.basename(self.file_path)}")
             
             # Verificar se o arquivo existe
-            if not os.path.exists(self.file_path):
+            if self.conteudo is None and not os.path.exists(self.file_path):
                 print(f"Arquivo não encontrado: {self.file_path}")
                 return
             
-            # Ler o arquivo Excel
+            # Ler o arquivo Excel (primeira aba)
             try:
-                df = pd.read_excel(self.file_path)
+                xls = abrir_planilha(self.origem)
+                nome_aba = xls.sheet_names[0]
+                df = pd.read_excel(xls, sheet_name=nome_aba)
             except Exception as e:
                 print(f"Erro ao ler o arquivo Excel: {str(e)}")
                 traceback.print_exc()
@@ -987,18 +1037,8 @@ class AnalisadorExcel:
                 print("Coluna de colaborador não encontrada")
                 return
             
-            # Agrupar por colaborador
-            colaboradores_unicos = df[coluna_colaborador].dropna().unique()
-            
-            for colaborador in colaboradores_unicos:
-                # Filtrar dados do colaborador
-                df_colaborador = df[df[coluna_colaborador] == colaborador]
-                
-                # Calcular métricas
-                metricas = self.calcular_metricas_colaborador(df_colaborador, colaborador)
-                
-                if metricas:
-                    self.colaboradores[colaborador] = metricas
+            # Métricas de todos os colaboradores em uma passada agrupada
+            self.colaboradores.update(self.calcular_metricas_por_colaborador(df, coluna_colaborador, nome_aba))
             
             print(f"Processamento concluído. {len(self.colaboradores)} colaboradores encontrados.")
         
@@ -7,14 +7,32 @@ import warnings
 import traceback
 import json
 
+from leitor_excel import ler_abas, ProjecaoColunas, conteudo_em_bytes
+from normalizador_datas import converter_datas, obter_formatos_padrao
+
 # Suprimir avisos específicos do pandas
 warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
 
 class AnalisadorExcel:
-    def __init__(self, file_path):
+    # Mapeamento de possíveis nomes para cada tipo de coluna
+    MAPEAMENTOS_COLUNAS = {
+        'data': ['DATA', 'DT', 'DATE', 'DATA CRIACAO', 'DATA CRIAÇÃO', 'DATA DE CRIACAO', 'DATA DE CRIAÇÃO'],
+        'status': ['STATUS', 'SITUACAO', 'SITUAÇÃO', 'ESTADO'],
+        'responsavel': ['RESPONSAVEL', 'RESPONSÁVEL', 'ATRIBUIDO', 'ATRIBUÍDO', 'ATENDENTE'],
+        'id': ['ID', 'CODIGO', 'CÓDIGO', 'NUMERO', 'NÚMERO', '#'],
+        'descricao': ['DESCRICAO', 'DESCRIÇÃO', 'ASSUNTO', 'TEMA', 'TITULO', 'TÍTULO']
+    }
+
+    def __init__(self, file_path, conteudo=None):
         self.file_path = file_path
+        # Arquivo já em memória (ex.: upload): lido daqui, e file_path serve só de nome
+        self.conteudo = None if conteudo is None else conteudo_em_bytes(conteudo)
+        self.origem = file_path if self.conteudo is None else self.conteudo
         self.colaboradores = {}
         self.erros = []
+        # Só as colunas mapeadas são lidas; sem data ou status a aba é lida inteira para a detecção por conteúdo
+        self.projecao = ProjecaoColunas(self.MAPEAMENTOS_COLUNAS, obrigatorios=['data', 'status'],
+                                        normalizar=self.normalizar_coluna)
         print(f"Criando analisador para {file_path}")
         
     def normalizar_coluna(self, nome_coluna):
@@ -83,17 +101,8 @@ class AnalisadorExcel:
         colunas_mapeadas = {}
         colunas_df = [self.normalizar_coluna(col) for col in df.columns]
         
-        # Mapeamento de possíveis nomes para cada tipo de coluna
-        mapeamentos = {
-            'data': ['DATA', 'DT', 'DATE', 'DATA CRIACAO', 'DATA CRIAÇÃO', 'DATA DE CRIACAO', 'DATA DE CRIAÇÃO'],
-            'status': ['STATUS', 'SITUACAO', 'SITUAÇÃO', 'ESTADO'],
-            'responsavel': ['RESPONSAVEL', 'RESPONSÁVEL', 'ATRIBUIDO', 'ATRIBUÍDO', 'ATENDENTE'],
-            'id': ['ID', 'CODIGO', 'CÓDIGO', 'NUMERO', 'NÚMERO', '#'],
-            'descricao': ['DESCRICAO', 'DESCRIÇÃO', 'ASSUNTO', 'TEMA', 'TITULO', 'TÍTULO']
-        }
-        
         # Tentar encontrar cada tipo de coluna
-        for tipo, possiveis_nomes in mapeamentos.items():
+        for tipo, possiveis_nomes in self.MAPEAMENTOS_COLUNAS.items():
             for nome in possiveis_nomes:
                 if nome in colunas_df:
                     colunas_mapeadas[tipo] = df.columns[colunas_df.index(nome)]
@@ -150,7 +159,10 @@ class AnalisadorExcel:
             
             # Converter coluna de data para datetime
             df_processado = df.copy()
-            df_processado[coluna_data] = df_processado[coluna_data].apply(self.corrigir_formato_data)
+            formatos = obter_formatos_padrao()
+            df_processado[coluna_data] = converter_datas(
+                df_processado[coluna_data],
+                formatos=formatos, chave=formatos.chave(self.file_path, nome_colaborador, coluna_data))
             
             # Remover linhas com data inválida
             df_processado = df_processado.dropna(subset=[coluna_data])
@@ -284,7 +296,7 @@ class AnalisadorExcel:
             print(f"Analisando arquivo {self.file_path}")
             
             # Verificar se o arquivo existe
-            if not os.path.exists(self.file_path):
+            if self.conteudo is None and not os.path.exists(self.file_path):
                 print(f"Arquivo não encontrado: {self.file_path}")
                 self.erros.append({
                     'arquivo': os.path.basename(self.file_path),
@@ -301,36 +313,24 @@ class AnalisadorExcel:
                 })
                 return []
             
-            # Ler todas as abas do arquivo Excel
+            # Abrir o arquivo Excel uma única vez (ou servir as abas do cache)
             try:
-                # Primeiro tentar com openpyxl (para .xlsx)
-                excel_file = pd.ExcelFile(self.file_path, engine='openpyxl')
-            except:
-                try:
-                    # Se falhar, tentar com xlrd (para .xls)
-                    excel_file = pd.ExcelFile(self.file_path, engine='xlrd')
-                except Exception as e:
-                    print(f"Erro ao abrir arquivo Excel: {str(e)}")
-                    self.erros.append({
-                        'arquivo': os.path.basename(self.file_path),
-                        'erro': f'Erro ao abrir arquivo: {str(e)}'
-                    })
-                    return []
+                abas = ler_abas(self.origem, colunas=self.projecao)
+            except Exception as e:
+                print(f"Erro ao abrir arquivo Excel: {str(e)}")
+                self.erros.append({
+                    'arquivo': os.path.basename(self.file_path),
+                    'erro': f'Erro ao abrir arquivo: {str(e)}'
+                })
+                return []
             
             # Processar cada aba como um colaborador separado
             nomes_colaboradores = []
             
-            for sheet_name in excel_file.sheet_names:
+            for sheet_name, df in abas:
                 try:
                     print(f"Analisando dados de: {sheet_name}")
                     
-                    # Ler dados da aba
-                    try:
-                        df = excel_file.parse(sheet_name)
-                    except Exception as e:
-                        print(f"Erro ao ler aba {sheet_name}: {str(e)}")
-                        continue
-                    
                     # Verificar se há dados
                     if df.empty:
                         print(f"Aba {sheet_name} está vazia.")
@@ -356,6 +356,8 @@ class AnalisadorExcel:
                     })
                     continue
             
+            print(obter_formatos_padrao().resumo())
+            
             # Calcular métricas comparativas
             self.calcular_metricas_comparativas()
             
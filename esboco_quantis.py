@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Esboço de Quantis
+=================
+Esboço KLL (Karnin, Lang e Liberty) para estimar quantis e postos de uma
+sequência de números com memória limitada. Os valores ficam em uma pilha de
+compactadores: quando um nível enche, ele é ordenado e metade dos valores
+(os de posição par ou ímpar, ao acaso) sobe para o nível seguinte com o
+dobro do peso. O erro de posto é da ordem de 1/k da quantidade de valores,
+e dois esboços podem ser mesclados (blocos, abas, processos) sem perder
+essa garantia.
+"""
+
+import math
+
+import numpy as np
+
+# Fator de decaimento da capacidade dos níveis inferiores
+FATOR_CAPACIDADE = 2 / 3
+
+# Menor capacidade de um nível
+CAPACIDADE_MINIMA = 2
+
+
+class EsbocoQuantis:
+    """Esboço KLL mesclável de uma sequência de números"""
+
+    def __init__(self, k=200, semente=None):
+        """
+        Args:
+            k (int): Capacidade do nível mais alto; o erro de posto fica
+                em torno de 1.7 / k (k=200: ~1% das posições)
+            semente (int, optional): Semente das escolhas aleatórias (reprodutibilidade)
+        """
+        self.k = k
+        self.niveis = [np.empty(0)]
+        self.total = 0
+        self._rng = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        profundidade = len(self.niveis) - nivel - 1
+        return max(CAPACIDADE_MINIMA, int(math.ceil(self.k * FATOR_CAPACIDADE ** profundidade)))
+
+    def _tamanho(self):
+        return sum(len(valores) for valores in self.niveis)
+
+    def _capacidade_total(self):
+        return sum(self._capacidade(nivel) for nivel in range(len(self.niveis)))
+
+    def _compactar(self):
+        """Compacta o primeiro nível cheio até o esboço caber na capacidade"""
+        while self._tamanho() > self._capacidade_total():
+            for nivel, valores in enumerate(self.niveis):
+                if len(valores) < self._capacidade(nivel):
+                    continue
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0))
+                valores = np.sort(valores)
+                # Com quantidade ímpar, o maior valor fica no nível
+                sobra = valores[-1:] if len(valores) % 2 else valores[:0]
+                pares = valores[:len(valores) - len(sobra)]
+                promovidos = pares[self._rng.integers(2)::2]
+                self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], promovidos])
+                self.niveis[nivel] = sobra
+                break
+
+    def adicionar(self, valores):
+        """
+        Acrescenta valores ao esboço.
+
+        Args:
+            valores (array-like): Números (NaN são ignorados)
+        """
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return
+        self.niveis[0] = np.concatenate([self.niveis[0], valores])
+        self.total += len(valores)
+        self._compactar()
+
+    def mesclar(self, outro):
+        """
+        Soma ao esboço os valores resumidos por outro esboço.
+
+        Args:
+            outro (EsbocoQuantis): Esboço de valores disjuntos dos deste
+        """
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append(np.empty(0))
+        for nivel, valores in enumerate(outro.niveis):
+            self.niveis[nivel] = np.concatenate([self.niveis[nivel], valores])
+        self.total += outro.total
+        self._compactar()
+        return self
+
+    def _valores_ponderados(self):
+        """Valores resumidos em ordem crescente e o peso acumulado de cada um"""
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(len(itens), 2 ** nivel) for nivel, itens in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind='stable')
+        return valores[ordem], np.cumsum(pesos[ordem])
+
+    def quantil(self, q):
+        """
+        Estima o quantil q (0 a 1).
+
+        Returns:
+            float | None: Valor estimado, ou None se o esboço estiver vazio
+        """
+        if self.total == 0:
+            return None
+        valores, acumulado = self._valores_ponderados()
+        alvo = q * acumulado[-1]
+        return float(valores[min(np.searchsorted(acumulado, alvo, side='left'), len(valores) - 1)])
+
+    def posto(self, valor, inclusivo=True):
+        """
+        Estima quantos valores são menores (ou menores ou iguais) a valor.
+
+        Returns:
+            int: Posto estimado
+        """
+        if self.total == 0:
+            return 0
+        lado = 'right' if inclusivo else 'left'
+        return int(sum(
+            np.searchsorted(np.sort(itens), valor, side=lado) * 2 ** nivel
+            for nivel, itens in enumerate(self.niveis)
+        ))
@@ -6,7 +6,17 @@ import seaborn as sns
 from scipy import stats
 import os
 
+from normalizador_datas import converter_com_formatos, obter_formatos_padrao
+
 class AnalisadorExcel:
+    # Formatos aceitos por normalizar_data, em ordem de prioridade
+    FORMATOS_DATA = [
+        '%d/%m/%Y',
+        '%d%m/%Y',
+        '%d/%m%Y',
+        '%d%m%Y'
+    ]
+    
     def __init__(self, file_path):
         self.file_path = file_path
         self.xls = pd.ExcelFile(file_path)
@@ -31,14 +41,7 @@ class AnalisadorExcel:
         """Normaliza diferentes formatos de data"""
         try:
             # Tenta diferentes formatos de data
-            formatos = [
-                '%d/%m/%Y',
-                '%d%m/%Y',
-                '%d/%m%Y',
-                '%d%m%Y'
-            ]
-            
-            for formato in formatos:
+            for formato in self.FORMATOS_DATA:
                 try:
                     return pd.to_datetime(data_str, format=formato)
                 except:
@@ -49,14 +52,23 @@ class AnalisadorExcel:
         except:
             return None
     
+    def converter_coluna_data(self, serie, nome, coluna):
+        """Converte uma coluna de datas com os formatos registrados para ela"""
+        formatos = obter_formatos_padrao()
+        chave = formatos.chave(self.file_path, nome, coluna, self.FORMATOS_DATA)
+        return converter_com_formatos(
+            serie, formatos, chave,
+            alternativo=lambda resto: resto.apply(self.normalizar_data),
+            candidatos=self.FORMATOS_DATA
+        )
+    
     def calcular_metricas_colaborador(self, df, nome):
         """Calcula métricas avançadas para um colaborador"""
         try:
-            # Normalização das datas
-            if 'DATA' in df.columns:
-                df['DATA'] = df['DATA'].apply(self.normalizar_data)
-            if 'RESOLUCAO' in df.columns:
-                df['RESOLUCAO'] = df['RESOLUCAO'].apply(self.normalizar_data)
+            # Normalização das datas (formatos detectados por coluna)
+            for coluna in ['DATA', 'RESOLUCAO']:
+                if coluna in df.columns:
+                    df[coluna] = self.converter_coluna_data(df[coluna], nome, coluna)
             
             # Remove linhas com datas inválidas
             df = df.dropna(subset=['DATA'])
@@ -0,0 +1,584 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Leitor de Planilhas Excel
+=========================
+Carregador compartilhado das planilhas de colaboradores.
+Abre cada arquivo uma única vez (zip, shared strings e estilos são lidos
+uma só vez) e entrega o DataFrame de cada aba a partir desse mesmo handle.
+Abas já lidas de um arquivo inalterado vêm do cache colunar (cache_planilhas).
+As impressões digitais por aba (impressoes_abas) permitem descobrir quais
+abas mudaram entre duas versões do arquivo sem passar pelo openpyxl.
+Abas muito grandes podem ser lidas em blocos de linhas (ler_aba_em_blocos),
+e prescan_planilha mede as abas antes da leitura para ordenar e estimar
+o trabalho.
+Com uma ProjecaoColunas só as colunas usadas pelas métricas são
+materializadas; as demais são descartadas logo após a leitura do cabeçalho.
+"""
+
+import io
+import re
+import json
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from itertools import islice
+
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from cache_planilhas import obter_cache_padrao
+
+# Sentinela: usar o cache compartilhado quando nenhum cache é informado
+CACHE_PADRAO = object()
+
+# Hashes dos textos compartilhados já calculados neste processo (ver impressoes_abas)
+_hashes_textos = {}
+
+_NS_PLANILHA = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_RELACOES = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PACOTE = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_REGEX_DIMENSAO = re.compile(rb'<dimension ref="[A-Z]+\d+(?::[A-Z]+(\d+))?"')
+# Índice de uma célula de shared string: <c ... t="s"><v>N</v>
+_REGEX_CELULA_COMPARTILHADA = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+
+# Linhas por bloco na leitura em streaming
+TAMANHO_BLOCO_PADRAO = 10000
+
+# Abas com mais linhas que isso são lidas em streaming (quando automático)
+LIMITE_STREAMING_PADRAO = 100000
+
+# Abas que não são de colaboradores (nomes em maiúsculas)
+ABAS_NAO_COLABORADOR = {'', 'TESTE', 'RELATÓRIO GERAL'}
+
+
+def conteudo_em_bytes(conteudo):
+    """
+    Conteúdo de um arquivo recebido em memória, como bytes.
+
+    Args:
+        conteudo (bytes | bytearray | memoryview | BytesIO): Arquivo em memória
+
+    Returns:
+        bytes: Conteúdo do arquivo
+    """
+    if isinstance(conteudo, bytes):
+        return conteudo
+    if isinstance(conteudo, io.BytesIO):
+        return conteudo.getvalue()
+    return bytes(conteudo)
+
+
+def _abrir_origem(origem):
+    """Caminho como está; conteúdo em memória como um arquivo novo (posição 0)"""
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        return io.BytesIO(origem)
+    return origem
+
+
+def abrir_planilha(origem):
+    """
+    Abre o arquivo Excel uma única vez.
+
+    Args:
+        origem (str | bytes | ExcelFile): Caminho do arquivo, conteúdo em
+            memória ou ExcelFile já aberto
+
+    Returns:
+        ExcelFile: Handle reutilizável para ler todas as abas
+    """
+    if isinstance(origem, pd.ExcelFile):
+        return origem
+
+    try:
+        # Primeiro tentar com openpyxl (para .xlsx)
+        return pd.ExcelFile(_abrir_origem(origem), engine='openpyxl')
+    except Exception:
+        # Se falhar, tentar com xlrd (para .xls)
+        return pd.ExcelFile(_abrir_origem(origem), engine='xlrd')
+
+
+def normalizar_nome_coluna(nome_coluna):
+    """Mesma normalização de nomes de coluna feita pelos analisadores"""
+    if not isinstance(nome_coluna, str):
+        return str(nome_coluna)
+    return re.sub(r'\s+', ' ', nome_coluna).strip().upper()
+
+
+class ProjecaoColunas:
+    """
+    Seleção das colunas de uma aba a partir de tabelas de apelidos.
+
+    Cada grupo lista os nomes possíveis de uma coluna lógica (ex.: DATA,
+    Data, DATA CRIACAO). Todas as colunas do cabeçalho cujo nome normalizado
+    coincide com algum apelido são mantidas, de modo que o analisador
+    encontra exatamente a mesma coluna que encontraria na aba completa.
+    Se algum grupo obrigatório não for encontrado a aba é lida inteira, para
+    que o analisador aplique a própria detecção (ou informe o erro).
+    """
+
+    def __init__(self, grupos, obrigatorios=None, normalizar=normalizar_nome_coluna):
+        """
+        Args:
+            grupos (dict): Coluna lógica -> lista de nomes possíveis
+            obrigatorios (list, optional): Colunas lógicas sem as quais a
+                projeção é abandonada; por padrão, todos os grupos
+            normalizar (callable, optional): Normalização aplicada aos nomes
+        """
+        self.grupos = {grupo: list(nomes) for grupo, nomes in grupos.items()}
+        self.obrigatorios = list(self.grupos if obrigatorios is None else obrigatorios)
+        self.normalizar = normalizar
+        self._apelidos = {
+            grupo: {normalizar(nome) for nome in nomes} for grupo, nomes in self.grupos.items()
+        }
+
+    @property
+    def identificador(self):
+        """Identifica a projeção nas entradas do cache colunar"""
+        texto = json.dumps([self.grupos, self.obrigatorios], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:12]
+
+    def selecionar(self, cabecalho):
+        """
+        Escolhe as colunas a ler.
+
+        Args:
+            cabecalho (list): Nomes das colunas da aba
+
+        Returns:
+            list | None: Colunas selecionadas, na ordem da aba, ou None para ler todas
+        """
+        normalizados = [self.normalizar(coluna) for coluna in cabecalho]
+        encontrados = {
+            grupo for grupo, apelidos in self._apelidos.items()
+            if any(nome in apelidos for nome in normalizados)
+        }
+        if any(grupo not in encontrados for grupo in self.obrigatorios):
+            return None
+
+        todos = set().union(*self._apelidos.values())
+        return [coluna for coluna, nome in zip(cabecalho, normalizados) if nome in todos]
+
+
+def _ler_aba(xls, nome_aba, colunas=None):
+    """Lê uma aba do arquivo aberto, apenas com as colunas da projeção"""
+    if colunas is None:
+        return xls.parse(nome_aba)
+
+    # Só o cabeçalho é lido antes de decidir quais colunas materializar
+    selecionadas = colunas.selecionar(list(xls.parse(nome_aba, nrows=0).columns))
+    if selecionadas is None:
+        return xls.parse(nome_aba)
+    selecionadas = set(selecionadas)
+    return xls.parse(nome_aba, usecols=lambda coluna: coluna in selecionadas)
+
+
+def _projetar(df, colunas):
+    """Aplica a projeção a uma aba já lida por completo"""
+    selecionadas = colunas.selecionar(list(df.columns))
+    if selecionadas is None:
+        return df
+    return df[selecionadas]
+
+
+def ler_abas(origem, filtro=None, erros=None, cache=CACHE_PADRAO, colunas=None, ordem=None):
+    """
+    Lê as abas de um arquivo Excel em uma única passada.
+
+    Quando a origem é um caminho ou conteúdo em memória (ex.: upload), as
+    abas são servidas pelo cache colunar
+    (hash do conteúdo + nome da aba); só as abas ausentes do cache são
+    lidas pelo openpyxl, e o arquivo é aberto no máximo uma vez.
+    Erros de abertura do arquivo são levantados já na chamada.
+    Com uma projeção, uma aba completa já presente no cache é apenas
+    recortada; caso contrário a aba projetada é lida e gravada à parte.
+
+    Args:
+        origem (str | bytes | ExcelFile): Caminho do arquivo, conteúdo em
+            memória ou ExcelFile já aberto
+        filtro (callable, optional): Função que recebe o nome da aba e indica se ela deve ser lida
+        erros (list, optional): Lista onde são registradas as abas que falharam
+        cache (CachePlanilhas, optional): Cache a usar; None desativa o cache
+        colunas (ProjecaoColunas, optional): Colunas a materializar; None lê todas
+        ordem (list, optional): Abas na ordem em que devem ser lidas; as que
+            não estiverem na lista são ignoradas. Por padrão, a ordem do arquivo
+
+    Returns:
+        generator: Pares (nome_aba, DataFrame) para cada aba lida com sucesso
+    """
+    if isinstance(origem, pd.ExcelFile):
+        cache = None
+    elif cache is CACHE_PADRAO:
+        cache = obter_cache_padrao()
+
+    if cache is None or not cache.disponivel:
+        xls = abrir_planilha(origem)
+        return _iterar_abas(_ordenar_abas(xls.sheet_names, ordem), lambda nome: _ler_aba(xls, nome, colunas),
+                            filtro, erros)
+
+    chave = cache.chave_arquivo(origem)
+    sheet_names = cache.obter_abas(chave)
+    xls = None
+    if sheet_names is None:
+        xls = abrir_planilha(origem)
+        sheet_names = xls.sheet_names
+        cache.salvar_abas(chave, sheet_names)
+
+    def ler_aba(nome_aba):
+        nonlocal xls
+        df = cache.obter(chave, nome_aba)
+        if df is not None:
+            return df if colunas is None else _projetar(df, colunas)
+
+        aba_projetada = None
+        if colunas is not None:
+            aba_projetada = f"{nome_aba}|colunas-{colunas.identificador}"
+            df = cache.obter(chave, aba_projetada)
+            if df is not None:
+                return df
+
+        # Abre o arquivo apenas se alguma aba não estiver em cache
+        if xls is None:
+            xls = abrir_planilha(origem)
+        df = _ler_aba(xls, nome_aba, colunas)
+        projetada = colunas is not None and colunas.selecionar(list(df.columns)) is not None
+        cache.salvar(chave, aba_projetada if projetada else nome_aba, df)
+        return df
+
+    return _iterar_abas(_ordenar_abas(sheet_names, ordem), ler_aba, filtro, erros)
+
+
+def _ordenar_abas(sheet_names, ordem):
+    """Abas do arquivo na ordem pedida"""
+    if ordem is None:
+        return sheet_names
+    existentes = set(sheet_names)
+    return [nome_aba for nome_aba in ordem if nome_aba in existentes]
+
+
+def _iterar_abas(sheet_names, ler_aba, filtro, erros):
+    """Percorre as abas selecionadas, registrando as que falharem"""
+    for nome_aba in sheet_names:
+        if filtro is not None and not filtro(nome_aba):
+            continue
+
+        try:
+            df = ler_aba(nome_aba)
+        except Exception as e:
+            print(f"Erro ao ler aba {nome_aba}: {str(e)}")
+            if erros is not None:
+                erros.append({
+                    'aba': nome_aba,
+                    'erro': f'Erro ao ler aba: {str(e)}'
+                })
+            continue
+
+        yield nome_aba, df
+
+
+def carregar_abas(origem, filtro=None, erros=None, cache=CACHE_PADRAO, colunas=None, ordem=None):
+    """
+    Carrega todas as abas selecionadas em um dicionário.
+
+    Args:
+        origem (str | bytes | ExcelFile): Caminho do arquivo, conteúdo em
+            memória ou ExcelFile já aberto
+        filtro (callable, optional): Função que recebe o nome da aba e indica se ela deve ser lida
+        erros (list, optional): Lista onde são registradas as abas que falharam
+        cache (CachePlanilhas, optional): Cache a usar; None desativa o cache
+        colunas (ProjecaoColunas, optional): Colunas a materializar; None lê todas
+        ordem (list, optional): Abas na ordem em que devem ser lidas (ver ler_abas)
+
+    Returns:
+        dict: Mapeamento nome_aba -> DataFrame, na ordem de leitura
+    """
+    return dict(ler_abas(origem, filtro=filtro, erros=erros, cache=cache, colunas=colunas, ordem=ordem))
+
+
+def impressoes_abas(origem, cache=CACHE_PADRAO):
+    """
+    Calcula uma impressão digital para cada aba de um arquivo .xlsx.
+
+    Parte do diretório central do zip (CRC-32 e tamanho de
+    xl/worksheets/sheetN.xml), sem interpretar as abas com o openpyxl.
+    A impressão também inclui o CRC de xl/styles.xml e o modo de data 1904,
+    que alteram a leitura das datas. O XML da aba guarda apenas os índices
+    das shared strings, e um texto pode mudar em xl/sharedStrings.xml sem
+    que a aba mude; por isso, quando o arquivo tem shared strings, a
+    impressão inclui um hash dos textos que a aba referencia (na ordem das
+    células), e só as abas cujos textos mudaram ganham impressão nova.
+
+    Esse hash exige ler sharedStrings.xml e o XML da aba, então fica guardado
+    pelo par (CRC da aba, CRC de sharedStrings.xml): enquanto nenhum dos dois
+    muda, a impressão sai só do diretório do zip. As shared strings só são
+    lidas quando alguma aba precisa do hash recalculado.
+
+    Args:
+        origem (str | bytes | file-like): Caminho ou conteúdo do arquivo
+        cache (CachePlanilhas, optional): Onde os hashes dos textos ficam
+            guardados entre execuções; None os guarda apenas neste processo
+
+    Returns:
+        dict | None: Mapeamento nome_aba -> impressão, na ordem do arquivo,
+            ou None se o arquivo não for um .xlsx (ex.: .xls)
+    """
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        origem = io.BytesIO(origem)
+    if cache is CACHE_PADRAO:
+        cache = obter_cache_padrao()
+
+    try:
+        with zipfile.ZipFile(origem) as pacote:
+            infos = {info.filename: info for info in pacote.infolist()}
+            workbook = ET.fromstring(pacote.read('xl/workbook.xml'))
+            caminhos = _caminhos_abas(pacote, workbook)
+
+            propriedades = workbook.find(f'{_NS_PLANILHA}workbookPr')
+            data_1904 = propriedades is not None and propriedades.get('date1904') in ('1', 'true')
+            estilos = infos.get('xl/styles.xml')
+            sufixo = f"{estilos.CRC if estilos else 0:08x}-{int(data_1904)}"
+            compartilhados = infos.get('xl/sharedStrings.xml')
+            textos = None
+
+            impressoes = {}
+            for nome_aba, caminho in caminhos.items():
+                info = infos.get(caminho)
+                if info is None:
+                    return None
+                impressoes[nome_aba] = f"{info.CRC:08x}-{info.file_size}-{sufixo}"
+                if compartilhados is None:
+                    continue
+
+                chave = (f"{info.CRC:08x}-{info.file_size}-"
+                         f"{compartilhados.CRC:08x}-{compartilhados.file_size}")
+                valor = _hashes_textos.get(chave)
+                if valor is None and cache is not None:
+                    valor = cache.obter_hash_textos(chave)
+                if valor is None:
+                    if textos is None:
+                        textos = _textos_compartilhados(pacote)
+                    valor = _hash_textos_aba(pacote, caminho, textos)
+                    if cache is not None:
+                        cache.salvar_hash_textos(chave, valor)
+                _hashes_textos[chave] = valor
+                impressoes[nome_aba] += f"-{valor}"
+            return impressoes
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return None
+
+
+def _textos_compartilhados(pacote):
+    """Textos de xl/sharedStrings.xml, na ordem dos índices"""
+    textos = []
+    with pacote.open('xl/sharedStrings.xml') as xml:
+        for _, elemento in ET.iterparse(xml):
+            if elemento.tag == f'{_NS_PLANILHA}si':
+                textos.append(''.join(elemento.itertext()))
+                elemento.clear()
+    return textos
+
+
+def _hash_textos_aba(pacote, caminho, textos, tamanho_bloco=1024 * 1024):
+    """Hash dos textos compartilhados referenciados por uma aba, na ordem das células"""
+    sha = hashlib.sha1()
+
+    def acumular(trecho):
+        for indice in _REGEX_CELULA_COMPARTILHADA.findall(trecho):
+            indice = int(indice)
+            sha.update(textos[indice].encode('utf-8') if indice < len(textos) else b'?')
+            sha.update(b'\x00')
+
+    with pacote.open(caminho) as xml:
+        resto = b''
+        for bloco in iter(lambda: xml.read(tamanho_bloco), b''):
+            trecho = resto + bloco
+            # A última célula do bloco pode estar cortada: fica para o próximo
+            corte = max(trecho.rfind(b'<c '), 0)
+            acumular(trecho[:corte])
+            resto = trecho[corte:]
+        acumular(resto)
+    return sha.hexdigest()[:16]
+
+
+def _caminhos_abas(pacote, workbook):
+    """Mapeia o nome de cada aba ao XML correspondente dentro do zip"""
+    relacoes = ET.fromstring(pacote.read('xl/_rels/workbook.xml.rels'))
+    destinos = {}
+    for relacao in relacoes.iter(f'{_NS_PACOTE}Relationship'):
+        destino = relacao.get('Target', '')
+        if destino.startswith('/'):
+            destino = destino.lstrip('/')
+        else:
+            destino = posixpath.normpath(posixpath.join('xl', destino))
+        destinos[relacao.get('Id')] = destino
+
+    return {
+        aba.get('name'): destinos.get(aba.get(f'{_NS_RELACOES}id'))
+        for aba in workbook.iter(f'{_NS_PLANILHA}sheet')
+    }
+
+
+def linhas_abas(origem, filtro=None):
+    """
+    Estima o número de linhas de cada aba de um arquivo .xlsx.
+
+    Usa a referência <dimension> da aba quando ela existe; caso contrário
+    conta as tags <row> do XML descompactado, sem interpretá-lo.
+
+    Args:
+        origem (str | bytes | file-like): Caminho ou conteúdo do arquivo
+        filtro (callable, optional): Função que recebe o nome da aba e indica se ela deve ser medida
+
+    Returns:
+        dict | None: Mapeamento nome_aba -> linhas, ou None se não for um .xlsx
+    """
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        origem = io.BytesIO(origem)
+
+    try:
+        with zipfile.ZipFile(origem) as pacote:
+            workbook = ET.fromstring(pacote.read('xl/workbook.xml'))
+            return {
+                nome_aba: _linhas_xml(pacote, caminho)
+                for nome_aba, caminho in _caminhos_abas(pacote, workbook).items()
+                if filtro is None or filtro(nome_aba)
+            }
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return None
+
+
+def aba_de_colaborador(nome_aba):
+    """Indica se a aba é de um colaborador (e não TESTE, RELATÓRIO GERAL ou nome interno _xlnm)"""
+    nome = str(nome_aba).strip().upper()
+    return nome not in ABAS_NAO_COLABORADOR and not nome.startswith('_XLNM')
+
+
+def prescan_planilha(origem):
+    """
+    Levantamento prévio das abas de um arquivo .xlsx, antes de qualquer leitura.
+
+    Lê apenas xl/workbook.xml e, para as abas de colaboradores, o tamanho
+    de cada aba (como em linhas_abas). Serve para ignorar as abas que não
+    são de colaboradores, ordenar as maiores primeiro e estimar o tempo
+    restante de uma análise.
+
+    Args:
+        origem (str | bytes | file-like): Caminho ou conteúdo do arquivo
+
+    Returns:
+        list | None: Dicionários {'aba', 'linhas', 'colaborador', 'oculta'}
+            na ordem do arquivo ('linhas' é None nas abas ignoradas), ou None
+            se o arquivo não for um .xlsx
+    """
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        origem = io.BytesIO(origem)
+
+    try:
+        with zipfile.ZipFile(origem) as pacote:
+            workbook = ET.fromstring(pacote.read('xl/workbook.xml'))
+            caminhos = _caminhos_abas(pacote, workbook)
+            estados = {aba.get('name'): aba.get('state', 'visible') for aba in workbook.iter(f'{_NS_PLANILHA}sheet')}
+            abas = []
+            for nome_aba, caminho in caminhos.items():
+                colaborador = aba_de_colaborador(nome_aba)
+                abas.append({
+                    'aba': nome_aba,
+                    'linhas': _linhas_xml(pacote, caminho) if colaborador else None,
+                    'colaborador': colaborador,
+                    'oculta': estados.get(nome_aba) != 'visible'
+                })
+            return abas
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return None
+
+
+def _linhas_xml(pacote, caminho, tamanho_bloco=1024 * 1024):
+    """Número de linhas de uma aba a partir do seu XML"""
+    with pacote.open(caminho) as xml:
+        inicio = xml.read(4096)
+        dimensao = _REGEX_DIMENSAO.search(inicio)
+        if dimensao and dimensao.group(1):
+            return int(dimensao.group(1))
+
+        # Sem <dimension> ou com ref de uma célula só (ref="A1", que o Excel
+        # grava em abas vazias e de uma célula): contar as linhas (o fim de um bloco pode cortar uma tag)
+        linhas = inicio.count(b'<row ') + inicio.count(b'<row>')
+        resto = inicio[-5:]
+        for bloco in iter(lambda: xml.read(tamanho_bloco), b''):
+            trecho = resto + bloco
+            linhas += trecho.count(b'<row ') + trecho.count(b'<row>')
+            resto = bloco[-5:]
+        return linhas
+
+
+def _converter_celula(valor):
+    """Mesma conversão de célula feita pelo leitor openpyxl do pandas"""
+    if valor is None:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def abrir_planilha_streaming(origem):
+    """
+    Abre o arquivo no modo somente leitura do openpyxl.
+
+    As linhas são lidas do XML sob demanda, sem carregar as abas inteiras.
+
+    Args:
+        origem (str | bytes): Caminho do arquivo ou conteúdo em memória
+    """
+    return openpyxl.load_workbook(_abrir_origem(origem), read_only=True, data_only=True)
+
+
+def ler_aba_em_blocos(planilha, nome_aba, tamanho_bloco=TAMANHO_BLOCO_PADRAO, colunas=None):
+    """
+    Lê uma aba em blocos de linhas de tamanho fixo.
+
+    Cada bloco passa pelo mesmo TextParser usado por pd.read_excel (nomes de
+    colunas, valores nulos e inferência de tipos), de modo que a memória
+    ocupada fica limitada ao tamanho do bloco. A inferência de tipos é feita
+    por bloco: uma coluna com números gravados como texto pode ser convertida
+    em um bloco e não em outro.
+
+    Args:
+        planilha (Workbook): Arquivo aberto por abrir_planilha_streaming
+        nome_aba (str): Nome da aba
+        tamanho_bloco (int, optional): Linhas por bloco
+        colunas (ProjecaoColunas, optional): Colunas a materializar; None lê todas
+
+    Returns:
+        generator: DataFrames com até tamanho_bloco linhas cada
+    """
+    linhas = planilha[nome_aba].iter_rows(values_only=True)
+    cabecalho = next(linhas, None)
+    if cabecalho is None:
+        return
+    cabecalho = [_converter_celula(valor) for valor in cabecalho]
+
+    indices = None
+    if colunas is not None:
+        # Os nomes passam pelo TextParser para receber o mesmo tratamento de duplicadas e vazias
+        nomes = list(TextParser([cabecalho], header=0, skip_blank_lines=False).read().columns)
+        selecionadas = colunas.selecionar(nomes)
+        if selecionadas is not None:
+            selecionadas = set(selecionadas)
+            indices = [i for i, nome in enumerate(nomes) if nome in selecionadas]
+            cabecalho = [cabecalho[i] for i in indices]
+
+    while True:
+        if indices is None:
+            bloco = [[_converter_celula(valor) for valor in linha] for linha in islice(linhas, tamanho_bloco)]
+        else:
+            bloco = [[_converter_celula(linha[i]) if i < len(linha) else '' for i in indices]
+                     for linha in islice(linhas, tamanho_bloco)]
+        if not bloco:
+            break
+
+        largura = max(len(cabecalho), max(len(linha) for linha in bloco))
+        dados = [linha + [''] * (largura - len(linha)) for linha in [cabecalho] + bloco]
+        yield TextParser(dados, header=0, skip_blank_lines=False).read()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memória Compartilhada
+=====================
+Entrega os DataFrames das abas aos processos de análise sem serializá-los.
+A aba é decomposta nas mesmas colunas planas do cache de planilhas
+(cache_planilhas.codificar_dataframe) e gravada uma única vez em um
+segmento de multiprocessing.shared_memory. O processo de análise anexa o
+segmento pelo nome: colunas de tipo fixo (números, datas, códigos de tipo)
+viram arrays NumPy sobre o próprio segmento, sem cópia; textos seguem no
+formato de strings do Arrow e só viram objetos str no processo que os usa.
+"""
+
+import logging
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from cache_planilhas import codificar_dataframe, _decodificar_coluna_mista
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow acompanha o streamlit
+    pa = None
+
+# Alinhamento de cada buffer dentro do segmento (o mesmo usado pelo Arrow)
+ALINHAMENTO = 64
+
+
+class SegmentoDataFrame:
+    """DataFrame publicado em memória compartilhada, do lado de quem o criou"""
+
+    def __init__(self, memoria, descritor):
+        self.memoria = memoria
+        self.descritor = descritor
+
+    def liberar(self):
+        """Fecha e remove o segmento (os processos que o anexaram mantêm a própria cópia do mapeamento)"""
+        if self.memoria is None:
+            return
+        try:
+            self.memoria.close()
+            self.memoria.unlink()
+        except FileNotFoundError:
+            pass
+        self.memoria = None
+
+
+def _buffers_coluna(nome, valores):
+    """Buffers de uma coluna plana e a descrição usada para reconstruí-la"""
+    if valores.dtype != object:
+        return [np.ascontiguousarray(valores)], {'nome': nome, 'tipo': 'fixo', 'dtype': valores.dtype.str}
+
+    # Apenas as faixas de texto das colunas mistas são object
+    if not nome.endswith('__texto'):
+        return None, None
+    textos = pa.array(valores, type=pa.large_string(), from_pandas=True)
+    validade, deslocamentos, dados = textos.buffers()
+    return [validade, deslocamentos, dados], {'nome': nome, 'tipo': 'texto', 'nulos': textos.null_count}
+
+
+def publicar_dataframe(df):
+    """
+    Copia um DataFrame para um novo segmento de memória compartilhada.
+
+    Args:
+        df (DataFrame): Dados da aba
+
+    Returns:
+        SegmentoDataFrame | None: Segmento publicado, ou None se a aba não
+            puder ser codificada (nesse caso ela deve seguir por pickle)
+    """
+    if pa is None:
+        return None
+
+    plano, metadados = codificar_dataframe(df)
+    if plano is None:
+        return None
+
+    colunas = []
+    buffers = []
+    tamanho = 0
+    for nome, serie in plano.items():
+        partes, coluna = _buffers_coluna(nome, serie.to_numpy())
+        if partes is None:
+            return None
+        coluna['buffers'] = []
+        for parte in partes:
+            if parte is None:
+                coluna['buffers'].append(None)
+                continue
+            dados = np.frombuffer(parte, dtype=np.uint8)
+            tamanho = -(-tamanho // ALINHAMENTO) * ALINHAMENTO
+            coluna['buffers'].append((tamanho, len(dados)))
+            buffers.append((tamanho, dados))
+            tamanho += len(dados)
+        colunas.append(coluna)
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(tamanho, 1))
+    try:
+        destino = np.ndarray(memoria.size, dtype=np.uint8, buffer=memoria.buf)
+        for inicio, dados in buffers:
+            destino[inicio:inicio + len(dados)] = dados
+        del destino
+    except Exception:
+        memoria.close()
+        memoria.unlink()
+        raise
+
+    descritor = {
+        'nome': memoria.name,
+        'colunas': colunas,
+        'metadados': metadados
+    }
+    return SegmentoDataFrame(memoria, descritor)
+
+
+def _reconstruir_coluna(buf, coluna, linhas):
+    """Array da coluna plana apoiado diretamente no segmento"""
+    if coluna['tipo'] == 'fixo':
+        inicio, _ = coluna['buffers'][0]
+        return np.ndarray(linhas, dtype=np.dtype(coluna['dtype']), buffer=buf, offset=inicio)
+
+    partes = [
+        None if parte is None else pa.py_buffer(buf[parte[0]:parte[0] + parte[1]])
+        for parte in coluna['buffers']
+    ]
+    textos = pa.Array.from_buffers(pa.large_string(), linhas, partes, null_count=coluna['nulos'])
+    return textos.to_numpy(zero_copy_only=False)
+
+
+@contextmanager
+def anexar_dataframe(descritor):
+    """
+    Anexa um segmento publicado por publicar_dataframe.
+
+    As colunas de tipo fixo do DataFrame entregue são views do segmento;
+    ele deve ser usado (e descartado) dentro do bloco with.
+
+    Args:
+        descritor (dict): SegmentoDataFrame.descritor
+
+    Yields:
+        DataFrame: Mesmo conteúdo do DataFrame publicado
+    """
+    memoria = shared_memory.SharedMemory(name=descritor['nome'])
+    df = tabela = dados = None
+    try:
+        metadados = descritor['metadados']
+        linhas = metadados['linhas']
+        tabela = {
+            coluna['nome']: pd.Series(_reconstruir_coluna(memoria.buf, coluna, linhas), copy=False)
+            for coluna in descritor['colunas']
+        }
+
+        dados = {}
+        for posicao, coluna in enumerate(metadados['colunas']):
+            prefixo = f'c{posicao}'
+            if coluna['codificacao'] == 'mista':
+                dados[posicao] = _decodificar_coluna_mista(tabela, prefixo)
+            else:
+                dados[posicao] = tabela[prefixo].to_numpy()
+
+        df = pd.DataFrame(dados, index=pd.RangeIndex(linhas), copy=False)
+        df.columns = [coluna['nome'] for coluna in metadados['colunas']]
+        yield df
+    finally:
+        df = tabela = dados = None
+        try:
+            memoria.close()
+        except BufferError:
+            # Quem usou o DataFrame ainda guarda views do segmento; o mapeamento é desfeito quando forem coletadas
+            logger.debug(f"Segmento {descritor['nome']} ainda em uso ao sair do bloco")
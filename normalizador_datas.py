@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Normalizador de Datas
+=====================
+Conversão colunar das colunas de data das planilhas (DATA, RESOLUCAO).
+Produz os mesmos valores que AnalisadorExcel.corrigir_formato_data aplicado
+célula a célula, mas trabalhando por grupos:
+
+- números de série do Excel são convertidos em uma única operação NumPy;
+- células que já são datetime passam direto;
+- textos distintos são limpos uma vez e testados formato a formato, cada
+  formato aplicado de uma só vez sobre os textos ainda não convertidos;
+- falhas são contadas por categoria em vez de impressas linha a linha.
+
+Os formatos dominantes de cada coluna (arquivo + aba + coluna) são
+detectados uma vez, a partir de uma amostra, e gravados em FormatosDatas;
+nas execuções seguintes a coluna vai direto para o parse de formato fixo e
+só os valores que não casam seguem pelo caminho lento.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Formatos testados, na ordem, sobre o texto limpo
+FORMATOS_DATA = [
+    '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d/%m/%y',
+    '%d-%m-%y', '%Y/%m/%d', '%d/%m/%Y %H:%M:%S',
+    '%d-%m-%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S'
+]
+
+# O Excel conta dias desde 30/12/1899 (com o bug de 1900 não ser bissexto)
+ORIGEM_EXCEL = pd.Timestamp('1899-12-30')
+
+# Faixa de números de série convertida em lote sem risco de overflow;
+# valores fora dela seguem pelo caminho escalar (e normalmente falham)
+_SERIAL_MINIMO = -80000
+_SERIAL_MAXIMO = 106000
+
+# Categorias de falha contabilizadas
+FALHA_TEXTO_VAZIO = 'texto sem dígitos'
+FALHA_TEXTO = 'texto não reconhecido'
+FALHA_NUMERO = 'número fora da faixa'
+FALHA_TIPO = 'tipo não reconhecido'
+
+
+def _limpar_textos(textos):
+    """Mantém apenas dígitos e separadores, como corrigir_formato_data"""
+    return pd.Index(textos, dtype=object).str.replace(r'[^\d/\-:]', '', regex=True).str.strip()
+
+
+def detectar_formatos(textos, candidatos=FORMATOS_DATA, tamanho_amostra=200):
+    """
+    Detecta os formatos presentes em uma amostra dos textos de uma coluna.
+
+    Args:
+        textos (array-like): Textos da coluna
+        candidatos (list, optional): Formatos aceitos, em ordem de prioridade
+        tamanho_amostra (int, optional): Quantidade de textos distintos testados
+
+    Returns:
+        list: Formatos que casaram com algum texto da amostra, na ordem de candidatos
+    """
+    distintos = pd.unique(np.asarray(textos, dtype=object))
+    if len(distintos) > tamanho_amostra:
+        distintos = distintos[np.linspace(0, len(distintos) - 1, tamanho_amostra).astype(int)]
+
+    pendentes = pd.Index(distintos, dtype=object)
+    encontrados = []
+    for formato in candidatos:
+        if len(pendentes) == 0:
+            break
+        ok = np.asarray(pd.to_datetime(pendentes, format=formato, errors='coerce').notna())
+        if ok.any():
+            encontrados.append(formato)
+            pendentes = pendentes[~ok]
+    return encontrados
+
+
+def _converter_textos(textos, limpos, preferidos=None):
+    """
+    Converte textos distintos.
+
+    Os formatos preferidos (detectados para a coluna) são testados primeiro;
+    os demais formatos e a inferência do pandas só recebem o que sobrar.
+    Como os formatos de FORMATOS_DATA não casam com o mesmo texto limpo,
+    a ordem não altera o resultado.
+
+    Returns:
+        tuple: (array object com Timestamp ou None,
+                array com a categoria de falha ou None,
+                array bool indicando os textos que seguiram pelo caminho lento,
+                lista dos formatos não preferidos que casaram com algum texto)
+    """
+    resultado = np.full(len(textos), None, dtype=object)
+    motivos = np.full(len(textos), None, dtype=object)
+    lentos = np.zeros(len(textos), dtype=bool)
+
+    vazios = np.asarray(limpos == '', dtype=bool)
+    motivos[vazios] = FALHA_TEXTO_VAZIO
+
+    if preferidos is None:
+        etapas = [(formato, False) for formato in FORMATOS_DATA]
+    else:
+        etapas = [(formato, False) for formato in FORMATOS_DATA if formato in preferidos]
+        etapas += [(formato, True) for formato in FORMATOS_DATA if formato not in preferidos]
+
+    novos = []
+    pendentes = np.flatnonzero(~vazios)
+    for formato, lento in etapas:
+        if len(pendentes) == 0:
+            break
+        if lento:
+            lentos[pendentes] = True
+        convertidas = pd.to_datetime(limpos[pendentes], format=formato, errors='coerce')
+        ok = np.asarray(convertidas.notna())
+        if ok.any():
+            resultado[pendentes[ok]] = convertidas[ok].astype(object)
+            pendentes = pendentes[~ok]
+            if lento:
+                novos.append(formato)
+
+    # Deixar o pandas inferir o texto original, como no caminho escalar
+    lentos[pendentes] = preferidos is not None
+    for i in pendentes:
+        try:
+            resultado[i] = pd.to_datetime(textos[i])
+        except Exception:
+            motivos[i] = FALHA_TEXTO
+    return resultado, motivos, lentos, novos
+
+
+def _converter_seriais(numeros, falhas):
+    """Converte números de série do Excel; retorna array object"""
+    resultado = np.full(len(numeros), None, dtype=object)
+    dias = numeros.astype(float)
+
+    em_faixa = np.isfinite(dias) & (dias > _SERIAL_MINIMO) & (dias < _SERIAL_MAXIMO)
+    if em_faixa.any():
+        # Mesma aritmética de pd.Timedelta(days=...): dias -> horas -> segundos -> ns, truncado
+        nanossegundos = np.trunc(((dias[em_faixa] * 24) * 3600) * 1e9).astype(np.int64)
+        datas = ORIGEM_EXCEL + pd.to_timedelta(nanossegundos, unit='ns')
+        resultado[em_faixa] = datas.astype(object)
+
+    for i in np.flatnonzero(~em_faixa):
+        try:
+            resultado[i] = ORIGEM_EXCEL + pd.Timedelta(days=float(dias[i]))
+        except Exception:
+            falhas[FALHA_NUMERO] += 1
+    return resultado
+
+
+def converter_datas(serie, falhas=None, formatos=None, chave=None):
+    """
+    Converte uma coluna de datas em lote.
+
+    Args:
+        serie (Series): Coluna com datas em texto, datetime ou número de série
+        falhas (Counter, optional): Contador atualizado com as falhas por categoria
+        formatos (FormatosDatas, optional): Registro dos formatos detectados por coluna
+        chave (str, optional): Chave da coluna no registro (FormatosDatas.chave)
+
+    Returns:
+        Series: Mesmos valores de serie.apply(corrigir_formato_data)
+    """
+    if falhas is None:
+        falhas = Counter()
+
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return serie.copy()
+
+    valores = serie.to_numpy(dtype=object)
+    resultado = np.full(len(valores), None, dtype=object)
+
+    preenchidos = ~np.asarray(pd.isna(valores), dtype=bool)
+    eh_data = preenchidos & np.array([isinstance(v, datetime) for v in valores], dtype=bool)
+    eh_texto = preenchidos & np.array([isinstance(v, str) for v in valores], dtype=bool)
+    eh_numero = preenchidos & ~eh_data & ~eh_texto & np.array(
+        [isinstance(v, (int, float)) for v in valores], dtype=bool)
+    outros = preenchidos & ~(eh_data | eh_texto | eh_numero)
+
+    resultado[eh_data] = valores[eh_data]
+
+    if eh_texto.any():
+        # Cada texto distinto é convertido uma única vez
+        posicoes, textos = pd.factorize(valores[eh_texto])
+        textos = np.asarray(textos, dtype=object)
+        limpos = _limpar_textos(textos)
+        preferidos = None
+        if formatos is not None:
+            preferidos = formatos.obter(chave, limpos[limpos != ''])
+
+        convertidos, motivos, lentos, novos = _converter_textos(textos, limpos, preferidos)
+        resultado[eh_texto] = convertidos[posicoes]
+        falhas.update(motivo for motivo in motivos[posicoes] if motivo is not None)
+        if formatos is not None:
+            formatos.valores_lentos += int(lentos[posicoes].sum())
+            if novos:
+                formatos.registrar(chave, [f for f in FORMATOS_DATA if f in preferidos or f in novos])
+
+    if eh_numero.any():
+        resultado[eh_numero] = _converter_seriais(valores[eh_numero], falhas)
+
+    if outros.any():
+        falhas[FALHA_TIPO] += int(outros.sum())
+
+    return pd.Series(resultado, index=serie.index, name=serie.name)
+
+
+def resumir_falhas(falhas, coluna):
+    """Monta a mensagem agregada das falhas de conversão de uma coluna"""
+    total = sum(falhas.values())
+    if not total:
+        return None
+    detalhes = ', '.join(f'{categoria}: {quantidade}' for categoria, quantidade in falhas.most_common())
+    return f"{total} valores de {coluna} não convertidos para data ({detalhes})"
+
+
+def converter_com_formatos(serie, formatos, chave, alternativo, candidatos=FORMATOS_DATA):
+    """
+    Converte uma coluna usando os formatos registrados para ela.
+
+    Os textos são convertidos com os formatos detectados (um parse de formato
+    fixo por formato); células que não são texto e textos que não casam com
+    nenhum deles seguem para a conversão alternativa original do chamador.
+    Só os textos que não casam contam como caminho lento.
+
+    Args:
+        serie (Series): Coluna a converter
+        formatos (FormatosDatas): Registro dos formatos detectados por coluna
+        chave (str): Chave da coluna no registro
+        alternativo (callable): Converte a Series com as células restantes
+        candidatos (list, optional): Formatos aceitos, em ordem de prioridade
+
+    Returns:
+        Series: Coluna convertida
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return alternativo(serie)
+
+    valores = serie.to_numpy(dtype=object)
+    eh_texto = np.array([isinstance(v, str) for v in valores], dtype=bool)
+    resultado = np.full(len(valores), None, dtype=object)
+    pendentes = ~eh_texto
+
+    if eh_texto.any():
+        textos = pd.Index(valores[eh_texto], dtype=object)
+        preferidos = formatos.obter(chave, textos, candidatos)
+        convertidos = np.full(len(textos), None, dtype=object)
+        restantes = np.arange(len(textos))
+        for formato in (f for f in candidatos if f in preferidos):
+            if len(restantes) == 0:
+                break
+            datas = pd.to_datetime(textos[restantes], format=formato, errors='coerce')
+            ok = np.asarray(datas.notna())
+            convertidos[restantes[ok]] = datas[ok].astype(object)
+            restantes = restantes[~ok]
+
+        resultado[eh_texto] = convertidos
+        pendentes[np.flatnonzero(eh_texto)[restantes]] = True
+        formatos.valores_lentos += len(restantes)
+
+        # Formatos que não apareceram na amostra original passam a ser registrados
+        if len(restantes):
+            novos = detectar_formatos(textos[restantes], [f for f in candidatos if f not in preferidos])
+            if novos:
+                formatos.registrar(chave, [f for f in candidatos if f in preferidos or f in novos])
+
+    if pendentes.any():
+        resto = alternativo(serie[pendentes])
+        resultado[pendentes] = resto.to_numpy(dtype=object)
+
+    return pd.Series(resultado, index=serie.index, name=serie.name)
+
+
+class FormatosDatas:
+    """
+    Registro persistente dos formatos de data detectados por coluna.
+
+    Contadores:
+        acertos: colunas cujos formatos já estavam registrados
+        falhas: colunas que precisaram de detecção
+        valores_lentos: células que seguiram pelo caminho lento
+    """
+
+    def __init__(self, arquivo=os.path.join('cache_planilhas', 'formatos_datas.json')):
+        self.arquivo = arquivo
+        self.acertos = 0
+        self.falhas = 0
+        self.valores_lentos = 0
+        self._registros = {}
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                self._registros = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Registro de formatos de data inválido: {str(e)}")
+
+    def chave(self, arquivo, aba, coluna, candidatos=FORMATOS_DATA):
+        """
+        Monta a chave de uma coluna.
+
+        O caminho completo identifica a planilha: continua o mesmo quando a
+        lista cresce, mas duas planilhas com o mesmo nome em pastas
+        diferentes não compartilham formatos. Os candidatos entram na chave
+        porque cada leitor aceita formatos próprios.
+        """
+        perfil = hashlib.sha1('|'.join(candidatos).encode('utf-8')).hexdigest()[:8]
+        caminho = os.path.normcase(os.path.abspath(str(arquivo)))
+        return f"{caminho}|{aba}|{coluna}|{perfil}"
+
+    def obter(self, chave, textos, candidatos=FORMATOS_DATA):
+        """
+        Retorna os formatos da coluna, detectando-os se ainda não registrados.
+
+        Args:
+            chave (str): Chave da coluna
+            textos (array-like): Textos da coluna (usados só na detecção)
+            candidatos (list, optional): Formatos aceitos, em ordem de prioridade
+
+        Returns:
+            list: Formatos dominantes da coluna
+        """
+        if chave in self._registros:
+            self.acertos += 1
+            return self._registros[chave]
+
+        self.falhas += 1
+        encontrados = detectar_formatos(textos, candidatos)
+        if len(textos):
+            self.registrar(chave, encontrados)
+        return encontrados
+
+    def registrar(self, chave, formatos):
+        """Grava os formatos de uma coluna"""
+        self._registros[chave] = list(formatos)
+        temporario = f'{self.arquivo}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.arquivo) or '.', exist_ok=True)
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self._registros, f, ensure_ascii=False, indent=2)
+            os.replace(temporario, self.arquivo)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar registro de formatos de data: {str(e)}")
+
+    def resumo(self):
+        """Resumo dos contadores, para acompanhar o uso do caminho lento"""
+        return (f"Formatos de data: {self.acertos} colunas do registro, "
+                f"{self.falhas} detectadas, {self.valores_lentos} valores pelo caminho lento")
+
+
+_formatos_padrao = None
+
+
+def obter_formatos_padrao():
+    """
+    Retorna o registro de formatos compartilhado.
+
+    Fica dentro do diretório do cache de planilhas (CACHE_PLANILHAS_DIR).
+    """
+    global _formatos_padrao
+    if _formatos_padrao is None:
+        _formatos_padrao = FormatosDatas(
+            os.path.join(os.environ.get('CACHE_PLANILHAS_DIR', 'cache_planilhas'), 'formatos_datas.json')
+        )
+    return _formatos_padrao
@@ -4,6 +4,9 @@ from datetime import datetime
 import logging
 from typing import Dict, Any, List
 
+from leitor_excel import ler_abas, ProjecaoColunas
+from normalizador_datas import converter_com_formatos, obter_formatos_padrao
+
 # Configuração do logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -52,32 +55,26 @@ class AnalisadorExcel:
         """Analisa um arquivo Excel e retorna os dados processados"""
         try:
             logger.info(f"Analisando: {caminho}")
-            excel_file = pd.ExcelFile(caminho)
+            # Apenas as colunas mapeadas em COLUNAS são lidas de cada aba
+            abas = ler_abas(caminho, filtro=lambda nome: nome.upper() != 'RELATÓRIO GERAL',
+                            colunas=ProjecaoColunas(self.COLUNAS))
             resultados = {}
             
-            for nome in excel_file.sheet_names:
-                if nome.upper() == 'RELATÓRIO GERAL':
-                    continue
-                    
-                df = excel_file.parse(nome)
-                
+            for nome, df in abas:
                 # Validar e obter mapeamento de colunas
                 valido, colunas = self.validate_columns(df)
                 if not valido:
                     logger.error(f"Estrutura inválida na aba {nome}")
                     continue
                 
-                # Processar datas
-                df['data_criacao'] = pd.to_datetime(
-                    df[colunas['DATA_CRIACAO']], 
-                    format='mixed', 
-                    errors='coerce'
-                )
-                df['data_resolucao'] = pd.to_datetime(
-                    df[colunas['DATA_RESOLUCAO']], 
-                    format='mixed', 
-                    errors='coerce'
-                )
+                # Processar datas (formatos detectados por coluna; o restante vai para 'mixed')
+                formatos = obter_formatos_padrao()
+                for destino, coluna in [('data_criacao', colunas['DATA_CRIACAO']),
+                                        ('data_resolucao', colunas['DATA_RESOLUCAO'])]:
+                    df[destino] = converter_com_formatos(
+                        df[coluna], formatos, formatos.chave(caminho, nome, coluna),
+                        alternativo=lambda resto: pd.to_datetime(resto, format='mixed', errors='coerce')
+                    )
                 
                 # Registrar datas inválidas
                 for col in ['data_criacao', 'data_resolucao']:
@@ -10,9 +10,10 @@ from concurrent.futures import ThreadPoolExecutor
 
 # Importando os módulos criados anteriormente
 from validacao_metricas import validar_metricas_qualidade
-from analise_detalhada import analisar_detalhes_colaborador
+from analise_detalhada import analisar_detalhes_colaborador, calcular_qualidade_detalhada
 from analise_paralela import analisar_arquivo_paralelo
 from debug_excel import AnalisadorExcel
+from leitor_excel import ler_abas
 
 class DashboardPipeline:
     def __init__(self):
@@ -154,11 +155,13 @@ class DashboardPipeline:
                 print(f"Arquivo não encontrado: {arquivo}")
                 continue
                 
-            xls = pd.ExcelFile(arquivo)
-            for sheet in xls.sheet_names:
-                if sheet.lower() not in ['resumo', 'índice', 'index', 'summary']:
-                    df = pd.read_excel(arquivo, sheet_name=sheet)
-                    resultados[sheet] = analisar_detalhes_colaborador(df, sheet)
+            abas = list(ler_abas(str(arquivo), filtro=lambda aba: aba.lower() not in ['resumo', 'índice', 'index', 'summary']))
+            # Métricas de qualidade de todas as abas do arquivo em uma única passada
+            qualidade = calcular_qualidade_detalhada(abas)
+            for sheet, df in abas:
+                resultados[sheet] = analisar_detalhes_colaborador(
+                    df, sheet, qualidade.loc[sheet] if sheet in qualidade.index else None
+                )
         
         return resultados
     
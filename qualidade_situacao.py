@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Qualidade da SITUAÇÃO
+=====================
+Score de qualidade do preenchimento da coluna SITUAÇÃO, calculado para todos
+os colaboradores de uma vez. As abas são empilhadas em um único DataFrame
+(uma coluna identifica o colaborador) e cada componente do score é obtido
+com contagens agrupadas do NumPy (bincount sobre os códigos do colaborador):
+
+- preenchimento: fração de registros com SITUAÇÃO preenchida;
+- padronização: fração dos valores distintos que pertencem ao vocabulário;
+- consistência diária: 1 - min(1, desvio / média) das atualizações por dia.
+
+score = (0.4 * preenchimento + 0.3 * padronização + 0.3 * consistência) * 100
+"""
+
+import numpy as np
+import pandas as pd
+
+from vocabulario_status import SITUACOES_PADRONIZADAS
+
+# Valores aceitos na coluna SITUAÇÃO
+VALORES_PADRONIZADOS = SITUACOES_PADRONIZADAS
+
+# Pesos dos componentes do score
+PESO_PREENCHIMENTO = 0.4
+PESO_PADRONIZACAO = 0.3
+PESO_CONSISTENCIA = 0.3
+
+
+def colunas_situacao_data(colunas):
+    """
+    Localiza as colunas usadas no score de uma aba.
+
+    Args:
+        colunas (iterable): Nomes das colunas da aba
+
+    Returns:
+        tuple: (coluna SITUAÇÃO, última coluna cujo nome contém DATA);
+            cada item é None quando a coluna não existe
+    """
+    coluna_situacao = None
+    coluna_data = None
+    for col in colunas:
+        nome = str(col).strip().upper()
+        if nome in ('SITUACAO', 'SITUAÇÃO', 'SITUAÇÂO'):
+            coluna_situacao = col
+        elif 'DATA' in nome:
+            coluna_data = col
+    return coluna_situacao, coluna_data
+
+
+def empilhar_abas(abas, seletor=colunas_situacao_data, coluna_grupo='COLABORADOR'):
+    """
+    Empilha as abas dos colaboradores no formato usado por calcular_qualidade.
+
+    Args:
+        abas (iterable): Pares (nome da aba, DataFrame)
+        seletor (callable): Recebe as colunas de uma aba e devolve
+            (coluna SITUAÇÃO, coluna de data); abas sem SITUAÇÃO são ignoradas
+        coluna_grupo (str): Nome da coluna que identifica o colaborador
+
+    Returns:
+        DataFrame: Colunas coluna_grupo (categórica, na ordem das abas),
+            'SITUACAO' e 'DATA' (datetime; NaT quando a aba não tem data)
+    """
+    nomes = []
+    partes = []
+    for nome, df in abas:
+        coluna_situacao, coluna_data = seletor(df.columns)
+        if coluna_situacao is None:
+            continue
+        datas = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+        if coluna_data is not None:
+            try:
+                datas = pd.to_datetime(df[coluna_data], errors='coerce')
+            except Exception:
+                pass
+        nomes.append(nome)
+        partes.append(pd.DataFrame({
+            coluna_grupo: nome,
+            'SITUACAO': df[coluna_situacao].to_numpy(dtype=object),
+            'DATA': datas.to_numpy()
+        }))
+
+    if partes:
+        empilhado = pd.concat(partes, ignore_index=True)
+    else:
+        empilhado = pd.DataFrame({coluna_grupo: [], 'SITUACAO': [], 'DATA': pd.Series([], dtype='datetime64[ns]')})
+    empilhado[coluna_grupo] = pd.Categorical(empilhado[coluna_grupo], categories=list(dict.fromkeys(nomes)))
+    return empilhado
+
+
+def _codigos_grupo(grupos):
+    """Códigos inteiros dos grupos (-1 para nulos) e os nomes na ordem dos códigos"""
+    if isinstance(grupos.dtype, pd.CategoricalDtype):
+        # Categorias sem registros (abas vazias) também entram na tabela
+        return np.asarray(grupos.cat.codes), list(grupos.cat.categories)
+    codigos, nomes = pd.factorize(grupos, sort=False)
+    return codigos, list(nomes)
+
+
+def calcular_qualidade(df, coluna_grupo='COLABORADOR', coluna_situacao='SITUACAO', coluna_data='DATA',
+                       valores_padronizados=VALORES_PADRONIZADOS, ddof=1, minimo_dias=2):
+    """
+    Calcula o score de qualidade da SITUAÇÃO de todos os colaboradores.
+
+    Args:
+        df (DataFrame): Registros empilhados de todos os colaboradores
+        coluna_grupo (str): Coluna que identifica o colaborador
+        coluna_situacao (str): Coluna SITUAÇÃO
+        coluna_data (str, optional): Coluna datetime com a data de cada
+            registro; sem ela, a consistência diária é 0
+        valores_padronizados (tuple): Vocabulário aceito na SITUAÇÃO
+        ddof (int): Graus de liberdade do desvio padrão diário
+            (1 como no pandas, 0 como no np.std)
+        minimo_dias (int): Dias com data necessários para medir a consistência
+
+    Returns:
+        DataFrame: Uma linha por colaborador (índice = colaborador) com
+            total_registros, registros_vazios, valores_unicos,
+            valores_nao_padronizados (lista), taxa_preenchimento,
+            taxa_padronizacao, dias_com_data, consistencia_diaria
+            (taxas entre 0 e 1) e score_qualidade (0 a 100)
+    """
+    codigos, nomes = _codigos_grupo(df[coluna_grupo])
+    quantidade = len(nomes)
+    validos = codigos >= 0
+    situacoes = df[coluna_situacao].to_numpy(dtype=object)
+    preenchidos = pd.notna(situacoes)
+
+    # Preenchimento
+    total = np.bincount(codigos[validos], minlength=quantidade)
+    com_situacao = np.bincount(codigos[validos & preenchidos], minlength=quantidade)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taxa_preenchimento = np.where(total > 0, com_situacao / total, 0.0)
+
+    # Padronização: pares distintos (colaborador, valor) na ordem em que aparecem
+    linhas = validos & preenchidos
+    codigos_valor, valores = pd.factorize(situacoes[linhas], sort=False)
+    padronizado = np.array([valor in valores_padronizados for valor in valores], dtype=bool)
+    chaves = codigos[linhas].astype(np.int64) * max(len(valores), 1) + codigos_valor
+    pares, primeiras = np.unique(chaves, return_index=True)
+    pares = pares[np.argsort(primeiras, kind='stable')]
+    grupo_par = pares // max(len(valores), 1)
+    valor_par = pares % max(len(valores), 1)
+    valores_unicos = np.bincount(grupo_par, minlength=quantidade)
+    unicos_padronizados = np.bincount(grupo_par, weights=padronizado[valor_par], minlength=quantidade)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taxa_padronizacao = np.where(valores_unicos > 0, unicos_padronizados / valores_unicos, 0.0)
+    nao_padronizados = [[] for _ in range(quantidade)]
+    for grupo, valor in zip(grupo_par[~padronizado[valor_par]], valor_par[~padronizado[valor_par]]):
+        nao_padronizados[grupo].append(valores[valor])
+
+    # Consistência diária: atualizações (SITUAÇÃO preenchida) por dia com data
+    dias_com_data = np.zeros(quantidade, dtype=np.int64)
+    consistencia = np.zeros(quantidade)
+    if coluna_data is not None and coluna_data in df.columns:
+        datas = pd.to_datetime(df[coluna_data], errors='coerce').to_numpy()
+        com_data = validos & ~np.isnat(datas)
+        if com_data.any():
+            dias = datas[com_data].astype('datetime64[D]').astype(np.int64)
+            grupo_dia, inversa = np.unique(np.column_stack([codigos[com_data], dias]), axis=0, return_inverse=True)
+            inversa = inversa.ravel()
+            atualizacoes = np.bincount(inversa, weights=preenchidos[com_data], minlength=len(grupo_dia))
+            grupo_dia = grupo_dia[:, 0]
+
+            dias_com_data = np.bincount(grupo_dia, minlength=quantidade)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                media = np.bincount(grupo_dia, weights=atualizacoes, minlength=quantidade) / dias_com_data
+                desvios = (atualizacoes - media[grupo_dia]) ** 2
+                desvio = np.sqrt(np.bincount(grupo_dia, weights=desvios, minlength=quantidade) / (dias_com_data - ddof))
+                medido = (dias_com_data >= max(minimo_dias, 1)) & (dias_com_data > ddof) & (media > 0)
+                consistencia = np.where(medido, 1 - np.minimum(1, desvio / media), 0.0)
+
+    score = (
+        PESO_PREENCHIMENTO * taxa_preenchimento +
+        PESO_PADRONIZACAO * taxa_padronizacao +
+        PESO_CONSISTENCIA * consistencia
+    ) * 100
+
+    return pd.DataFrame({
+        'total_registros': total,
+        'registros_vazios': total - com_situacao,
+        'valores_unicos': valores_unicos,
+        'valores_nao_padronizados': nao_padronizados,
+        'taxa_preenchimento': taxa_preenchimento,
+        'taxa_padronizacao': taxa_padronizacao,
+        'dias_com_data': dias_com_data,
+        'consistencia_diaria': consistencia,
+        'score_qualidade': score
+    }, index=pd.Index(nomes, name=coluna_grupo))
+
+
+def calcular_qualidade_abas(abas, seletor=colunas_situacao_data, **opcoes):
+    """
+    Empilha as abas e calcula o score de todos os colaboradores em uma passada.
+
+    Args:
+        abas (iterable): Pares (nome da aba, DataFrame)
+        seletor (callable): Ver empilhar_abas
+        **opcoes: Repassadas a calcular_qualidade
+
+    Returns:
+        DataFrame: Tabela de calcular_qualidade (uma linha por aba com SITUAÇÃO)
+    """
+    return calcular_qualidade(empilhar_abas(abas, seletor=seletor), **opcoes)
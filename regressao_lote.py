@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Regressão em Lote
+=================
+Regressão linear simples (y = slope * x + intercept) de várias séries de
+uma só vez. As séries são empilhadas em uma matriz (uma linha por série,
+completada com NaN) e todas as somas são feitas por linha com NumPy, sem
+construir um modelo por colaborador nem importar o scikit-learn.
+"""
+
+import numpy as np
+
+
+def empilhar_series(series):
+    """
+    Empilha séries de tamanhos diferentes em uma matriz completada com NaN.
+
+    Args:
+        series (list): Sequências de números (uma por série)
+
+    Returns:
+        ndarray: Matriz float (séries x maior tamanho)
+    """
+    tamanho = max((len(serie) for serie in series), default=0)
+    matriz = np.full((len(series), tamanho), np.nan)
+    for linha, serie in enumerate(series):
+        matriz[linha, :len(serie)] = serie
+    return matriz
+
+
+def regressao_em_lote(y, x=None):
+    """
+    Ajusta uma reta por série, para todas as séries em uma passada vetorizada.
+
+    Args:
+        y (ndarray | list): Matriz séries x pontos (NaN = ponto ausente) ou
+            lista de séries de tamanhos diferentes
+        x (ndarray | list, optional): Abscissas no mesmo formato de y; por
+            padrão, a posição de cada ponto (0, 1, 2, ...)
+
+    Returns:
+        dict: Arrays com um valor por série:
+            'n' (pontos usados), 'slope', 'intercept',
+            'correlacao' (Pearson; NaN se x ou y forem constantes),
+            'r2' (NaN se y for constante)
+    """
+    y = empilhar_series(y) if isinstance(y, list) else np.asarray(y, dtype=float)
+    if y.ndim == 1:
+        y = y[np.newaxis, :]
+    if x is None:
+        x = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    else:
+        x = empilhar_series(x) if isinstance(x, list) else np.asarray(x, dtype=float)
+        x = np.broadcast_to(x, y.shape)
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    n = validos.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media_x = np.where(validos, x, 0).sum(axis=1) / n
+        media_y = np.where(validos, y, 0).sum(axis=1) / n
+        dx = np.where(validos, x - media_x[:, np.newaxis], 0)
+        dy = np.where(validos, y - media_y[:, np.newaxis], 0)
+        sxx = (dx * dx).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+
+        slope = np.where(sxx > 0, sxy / sxx, 0.0)
+        intercept = media_y - slope * media_x
+        correlacao = np.where((sxx > 0) & (syy > 0), sxy / np.sqrt(sxx * syy), np.nan)
+        residuos = np.where(validos, y - (slope[:, np.newaxis] * x + intercept[:, np.newaxis]), 0)
+        r2 = np.where(syy > 0, 1 - (residuos * residuos).sum(axis=1) / syy, np.nan)
+
+    return {
+        'n': n,
+        'slope': slope,
+        'intercept': intercept,
+        'correlacao': np.clip(correlacao, -1, 1),
+        'r2': r2
+    }
@@ -8,7 +8,7 @@ from analise_avancada import AnalisadorAvancado
 
 class RelatorioAvancado:
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = DatabaseManager('analise_historica.db')
         self.analisador = AnalisadorAvancado()
         
     def gerar_relatorio(self):
@@ -37,33 +37,35 @@ class RelatorioAvancado:
         
     def mostrar_metricas_historicas(self, dias, grupo):
         """Mostra gráficos históricos das principais métricas"""
-        df = self.db.obter_historico_metricas(dias)
-        
-        if grupo != "Todos":
-            df = df[df['grupo'] == grupo]
+        # Os grupos são gravados como 'Julio'/'Leandro'. Os rollups devolvem um
+        # ponto por dia, semana ou mês (conforme a janela), não uma linha por execução
+        grupo = None if grupo == "Todos" else grupo.capitalize()
+        df = pd.DataFrame(self.db.get_efficiency_rollup(dias, grupo=grupo, per_collaborator=True))
+        df_grupos = pd.DataFrame(self.db.get_efficiency_rollup(dias, grupo=grupo))
         
         if not df.empty:
             # Gráfico de eficiência ao longo do tempo
             fig = px.line(df, 
-                         x='data_analise', 
+                         x='inicio', 
                          y='taxa_eficiencia',
                          color='colaborador',
                          title='Evolução da Taxa de Eficiência')
             st.plotly_chart(fig)
             
-            # Gráfico de tempo médio de resolução
-            fig = px.box(df, 
-                        x='grupo', 
-                        y='tempo_medio_resolucao',
-                        title='Distribuição do Tempo Médio de Resolução por Grupo')
+            # Eficiência média por grupo
+            fig = px.line(df_grupos,
+                         x='inicio',
+                         y='taxa_eficiencia',
+                         color='grupo',
+                         title='Taxa de Eficiência Média por Grupo')
             st.plotly_chart(fig)
             
-            # Heatmap de casos pendentes por colaborador
+            # Heatmap de registros por colaborador
             pivot = df.pivot_table(
-                values='casos_pendentes',
+                values='total_registros',
                 index='colaborador',
-                columns='data_analise',
-                aggfunc='mean'
+                columns='inicio',
+                aggfunc='sum'
             )
             fig = go.Figure(data=go.Heatmap(
                 z=pivot.values,
@@ -71,7 +73,7 @@ class RelatorioAvancado:
                 y=pivot.index,
                 colorscale='RdYlGn_r'
             ))
-            fig.update_layout(title='Heatmap de Casos Pendentes por Colaborador')
+            fig.update_layout(title='Heatmap de Registros por Colaborador')
             st.plotly_chart(fig)
     
     def mostrar_correlacoes(self):
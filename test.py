@@ -2,11 +2,9 @@ import pandas as pd
 from datetime import datetime
 import os
 
-STATUS_COLUMNS = [
-    'VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE', 
-    'PRIORIDADE TOTAL', 'APROVADO', 'QUITADO', 'APREENDIDO', 
-    'CANCELADO'
-]
+from vocabulario_status import STATUS_RELATORIO, obter_vocabulario_padrao
+
+STATUS_COLUMNS = list(STATUS_RELATORIO)
 
 class ProcessadorRelatorios:
     def __init__(self, file_path):
@@ -72,12 +70,14 @@ class ProcessadorRelatorios:
                     if resolucao_col:
                         df[resolucao_col] = pd.to_datetime(df[resolucao_col], errors='coerce')
                     
-                    # Converter situação
+                    # Converter situação em códigos do vocabulário (uma vez por aba)
+                    codigos = None
                     if situacao_col:
-                        df[situacao_col] = df[situacao_col].fillna('').str.strip().str.upper()
+                        codigos = obter_vocabulario_padrao().codificar(df[situacao_col])
                     
                     self.dados_colaboradores[sheet_name] = {
                         'df': df,
+                        'codigos_situacao': codigos,
                         'colunas': {
                             'data': data_col,
                             'situacao': situacao_col,
@@ -93,17 +93,17 @@ class ProcessadorRelatorios:
         df = dados['df']
         colunas = dados['colunas']
         
-        if tipo == "DIARIO" and colunas['data']:
-            # Filtrar apenas registros do dia atual
-            df_filtrado = df[df[colunas['data']].dt.date == self.data_atual]
-        else:
-            df_filtrado = df
+        codigos = dados['codigos_situacao']
         
         # Contar ocorrências de cada status
         if colunas['situacao']:
-            contagem = df_filtrado[colunas['situacao']].value_counts()
-            for status in STATUS_COLUMNS:
-                relatorio[status] = int(contagem.get(status, 0))
+            if tipo == "DIARIO" and colunas['data']:
+                # Apenas registros do dia atual
+                codigos = codigos[(df[colunas['data']].dt.date == self.data_atual).to_numpy()]
+            # Os status do relatório ocupam os primeiros códigos do vocabulário
+            contagem = obter_vocabulario_padrao().contar(codigos)
+            for codigo, status in enumerate(STATUS_COLUMNS):
+                relatorio[status] = int(contagem[codigo])
         
         # Calcular total
         relatorio['TOTAL'] = sum(relatorio.values())
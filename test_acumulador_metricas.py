@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from debug_excel import AnalisadorExcel
+from acumulador_metricas import AcumuladorMetricas, acumular_por_grupo, tendencias_em_lote, cubo_dataframe
+
+
+def planilha_longa(linhas=300, semente=0):
+    """Registros de vários colaboradores em uma única aba (formato longo)"""
+    rng = np.random.default_rng(semente)
+    inicio = pd.Timestamp('2025-01-01')
+    datas = inicio + pd.to_timedelta(rng.integers(0, 60, linhas), unit='D')
+    df = pd.DataFrame({
+        'DATA': datas,
+        'STATUS': rng.choice(['PENDENTE', 'VERIFICADO', 'QUITADO', 'ANÁLISE', None], linhas),
+        'COLABORADOR': rng.choice(['ANA', 'IGOR', 'NUNO', None], linhas),
+        'RESOLUCAO': datas + pd.to_timedelta(rng.integers(-2, 20, linhas), unit='D')
+    })
+    df.loc[df.index % 7 == 0, 'RESOLUCAO'] = pd.NaT
+    return df
+
+
+def test_metricas_agrupadas_iguais_ao_filtro_por_colaborador(tmp_path, monkeypatch):
+    import normalizador_datas
+    monkeypatch.setattr(normalizador_datas, '_formatos_padrao',
+                        normalizador_datas.FormatosDatas(str(tmp_path / 'formatos.json')))
+    analisador = AnalisadorExcel('LISTAS.xlsx', cache_metricas=None)
+    df = planilha_longa()
+    # Datas em texto no meio das datas reais (coluna object, como em planilhas exportadas)
+    df['DATA'] = df['DATA'].astype(object)
+    df.loc[df.index % 5 == 0, 'DATA'] = df.loc[df.index % 5 == 0, 'DATA'].map(lambda d: d.strftime('%d/%m/%Y'))
+
+    for dados in (planilha_longa(semente=1), df):
+        esperado = {}
+        for colaborador in dados['COLABORADOR'].dropna().unique():
+            metricas = analisador.calcular_metricas_colaborador(dados[dados['COLABORADOR'] == colaborador], colaborador)
+            if metricas:
+                esperado[colaborador] = metricas
+
+        assert analisador.calcular_metricas_por_colaborador(dados, 'COLABORADOR', 'Planilha1') == esperado
+
+    # Formatos registrados pela aba, não pela coluna de colaborador
+    registros = normalizador_datas._formatos_padrao._registros
+    assert normalizador_datas._formatos_padrao.chave('LISTAS.xlsx', 'Planilha1', 'DATA') in registros
+    assert not any('|COLABORADOR|' in chave for chave in registros)
+
+
+def test_acumular_por_grupo_ignora_grupo_nulo():
+    df = pd.DataFrame({
+        'DATA': pd.to_datetime(['2025-02-17', '2025-02-18', '2025-02-18']),
+        'STATUS': ['PENDENTE', 'QUITADO', 'QUITADO'],
+        'COLABORADOR': ['ANA', None, 'IGOR']
+    })
+
+    acumuladores = acumular_por_grupo(df, 'COLABORADOR')
+
+    assert list(acumuladores) == ['ANA', 'IGOR']
+    assert acumuladores['IGOR'].metricas('IGOR')['distribuicao_status'] == {'QUITADO': 1}
+    assert acumuladores['ANA'].nao_pendentes == 0
+
+
+def test_tendencias_em_lote_detecta_volume_crescente():
+    df = pd.DataFrame({
+        'DATA': pd.to_datetime(['2025-02-17'] + ['2025-02-18'] * 2 + ['2025-02-20'] * 4
+                               + ['2025-02-17', '2025-02-18', '2025-02-19']),
+        'STATUS': ['PENDENTE'] * 10,
+        'COLABORADOR': ['ANA'] * 7 + ['IGOR'] * 3
+    })
+    acumuladores = acumular_por_grupo(df, 'COLABORADOR')
+
+    ana, igor = tendencias_em_lote(list(acumuladores.values()))
+
+    assert ana['direcao'] == 'crescente' and ana['slope'] > 0
+    assert igor == {'direcao': 'estável', 'correlacao': 0.0, 'r2': 0.0, 'slope': 0.0, 'intercept': 1.0}
+    assert acumuladores['ANA'].metricas('ANA')['tendencia'] == ana
+
+
+def test_mesclar_blocos_igual_a_acumular_tudo():
+    df = planilha_longa().dropna(subset=['COLABORADOR'])
+    inteiro = AcumuladorMetricas()
+    inteiro.adicionar(df)
+
+    mesclado = AcumuladorMetricas()
+    for inicio in range(0, len(df), 70):
+        bloco = AcumuladorMetricas()
+        bloco.adicionar(df.iloc[inicio:inicio + 70])
+        mesclado.mesclar(bloco)
+
+    assert mesclado.metricas('ANA') == inteiro.metricas('ANA')
+
+
+def test_quantis_pelo_esboco_proximos_dos_exatos():
+    df = planilha_longa(linhas=3000, semente=3)
+    exato = AcumuladorMetricas()
+    exato.adicionar(df)
+    esboco = AcumuladorMetricas(quantis_exatos=False)
+    for inicio in range(0, len(df), 500):
+        bloco = AcumuladorMetricas(quantis_exatos=False)
+        bloco.adicionar(df.iloc[inicio:inicio + 500])
+        esboco.mesclar(bloco)
+
+    metricas_exatas = exato.metricas('ANA')
+    metricas_esboco = esboco.metricas('ANA')
+    assert metricas_esboco['tempo_medio_resolucao'] == metricas_exatas['tempo_medio_resolucao']
+    assert abs(metricas_esboco['tempo_mediano_resolucao'] - metricas_exatas['tempo_mediano_resolucao']) <= 1
+    assert abs(metricas_esboco['outliers_resolucao'] - metricas_exatas['outliers_resolucao']) <= 0.02 * len(df)
+
+    agrupados = acumular_por_grupo(df, 'COLABORADOR', quantis_exatos=False)
+    assert all(acumulador.esboco_resolucao.total > 0 for acumulador in agrupados.values())
+
+
+def test_cubo_dia_status_alimenta_medias_e_padrao_semanal():
+    df = pd.DataFrame({
+        'DATA': pd.to_datetime(['2025-02-17 08:00', '2025-02-17 15:30', '2025-02-18 09:00', '2025-02-18 10:00', '2025-02-24 11:00']),
+        'STATUS': ['PENDENTE', 'quitado', 'PENDENTE', None, 'PENDENTE']
+    })
+    acumulador = AcumuladorMetricas()
+    acumulador.adicionar(df)
+
+    metricas = acumulador.metricas('ANA', incluir_cubo=True)
+    assert 'cubo_dia_status' not in acumulador.metricas('ANA')
+    cubo = cubo_dataframe(metricas['cubo_dia_status'])
+
+    assert list(cubo.index) == list(pd.to_datetime(['2025-02-17', '2025-02-18', '2025-02-24']))
+    assert cubo.to_dict('list') == {None: [0, 1, 0], 'PENDENTE': [1, 1, 1], 'QUITADO': [1, 0, 0]}
+    assert metricas['medias_diarias'] == {'PENDENTE': 1.0, 'QUITADO': 1.0}
+    assert metricas['padrao_semanal'] == {'Monday': 3, 'Tuesday': 2}
+    assert int(cubo.to_numpy().sum()) == metricas['total_registros']
@@ -0,0 +1,152 @@
+import pandas as pd
+import analise_paralela
+from analise_paralela import analisar_arquivo_paralelo
+
+
+def gerar_planilha(caminho, colaboradores):
+    with pd.ExcelWriter(caminho) as writer:
+        for i, nome in enumerate(colaboradores):
+            pd.DataFrame({
+                'DATA': pd.date_range('2025-02-17', periods=6 + i, freq='D'),
+                'SITUAÇÃO': (['PENDENTE', 'VERIFICADO', 'QUITADO'] * 4)[:6 + i]
+            }).to_excel(writer, sheet_name=nome, index=False)
+        pd.DataFrame({'TOTAL': [1]}).to_excel(writer, sheet_name='Resumo', index=False)
+
+
+def sem_grafico(resultados):
+    return {chave: {**r, 'dados': {k: v for k, v in r['dados'].items() if k != 'grafico_path'}}
+            for chave, r in resultados.items()}
+
+
+def test_paralelo_igual_ao_sequencial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gerar_planilha(tmp_path / 'a.xlsx', ['ANA', 'IGOR'])
+    gerar_planilha(tmp_path / 'b.xlsx', ['NUNO'])
+    arquivos = {'julio': str(tmp_path / 'a.xlsx'), 'leandro': str(tmp_path / 'b.xlsx')}
+
+    sequencial = analisar_arquivo_paralelo(arquivos, jobs=1)
+    paralelo = analisar_arquivo_paralelo(arquivos, jobs=2)
+
+    assert list(paralelo) == ['julio_ANA', 'julio_IGOR', 'leandro_NUNO']
+    assert sem_grafico(paralelo) == sem_grafico(sequencial)
+    assert all(r['dados']['status'] == 'SUCESSO' for r in paralelo.values())
+
+
+def falhar_para_igor(nome_arquivo, nome_aba, df=None):
+    if nome_aba == 'IGOR':
+        raise RuntimeError('processo interrompido')
+    return {'colaborador': nome_aba, 'status': 'SUCESSO'}
+
+
+def test_falha_em_uma_aba_nao_interrompe_as_demais(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gerar_planilha(tmp_path / 'a.xlsx', ['ANA', 'IGOR', 'NUNO'])
+    monkeypatch.setattr(analise_paralela, 'analisar_situacao_colaborador', falhar_para_igor)
+
+    resultados = analisar_arquivo_paralelo({'julio': str(tmp_path / 'a.xlsx')}, jobs=2)
+
+    assert {chave: r['dados']['status'] for chave, r in resultados.items()} == {
+        'julio_ANA': 'SUCESSO', 'julio_IGOR': 'FALHA', 'julio_NUNO': 'SUCESSO'}
+    assert resultados['julio_IGOR']['dados']['erro'] == 'processo interrompido'
+
+
+def test_maiores_abas_primeiro_e_progresso(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gerar_planilha(tmp_path / 'a.xlsx', ['ANA', 'IGOR', 'TESTE'])
+    gerar_planilha(tmp_path / 'b.xlsx', ['NUNO', 'LUARA', 'FELIPE'])
+    analisadas = []
+    original = analise_paralela.analisar_situacao_colaborador
+
+    def analisar_registrando(nome_arquivo, nome_aba, df=None):
+        analisadas.append(nome_aba)
+        return original(nome_arquivo, nome_aba, df=df)
+
+    monkeypatch.setattr(analise_paralela, 'analisar_situacao_colaborador', analisar_registrando)
+    situacoes = []
+    resultados = analisar_arquivo_paralelo({'julio': str(tmp_path / 'a.xlsx'), 'leandro': str(tmp_path / 'b.xlsx')},
+                                           jobs=1, progresso=situacoes.append)
+
+    # Abas com 6, 7 e 8 registros; TESTE é ignorada
+    assert analisadas == ['FELIPE', 'IGOR', 'LUARA', 'ANA', 'NUNO']
+    assert list(resultados) == ['julio_ANA', 'julio_IGOR', 'leandro_NUNO', 'leandro_LUARA', 'leandro_FELIPE']
+    assert [s['abas_concluidas'] for s in situacoes] == [1, 2, 3, 4, 5]
+    assert all(s['total_abas'] == 5 for s in situacoes)
+    assert situacoes[-1]['percentual'] == 100.0 and situacoes[-1]['eta_segundos'] == 0
+
+
+def test_tarefas_em_andamento_limitadas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gerar_planilha(tmp_path / 'a.xlsx', [f'COLAB{i}' for i in range(7)])
+    eventos = []
+    vivos = set()
+    maximo = []
+    original = analise_paralela.publicar_dataframe
+
+    def publicar_contando(df):
+        segmento = original(df)
+        liberar = segmento.liberar
+
+        def liberar_contando():
+            vivos.discard(id(segmento))
+            liberar()
+
+        segmento.liberar = liberar_contando
+        vivos.add(id(segmento))
+        maximo.append(len(vivos))
+        eventos.append('enviada')
+        return segmento
+
+    monkeypatch.setattr(analise_paralela, 'publicar_dataframe', publicar_contando)
+    resultados = analisar_arquivo_paralelo({'julio': str(tmp_path / 'a.xlsx')}, jobs=2,
+                                           progresso=lambda situacao: eventos.append('concluida'))
+
+    assert len(resultados) == 7 and all(r['dados']['status'] == 'SUCESSO' for r in resultados.values())
+    assert max(maximo) <= analise_paralela.TAREFAS_POR_PROCESSO * 2
+    # Resultados chegam enquanto as abas ainda estão sendo lidas
+    assert eventos.index('concluida') < len(eventos) - 1 - eventos[::-1].index('enviada')
+    assert not vivos
+
+
+def test_aba_com_dimensao_de_uma_celula_entra_no_lote(tmp_path, monkeypatch):
+    import re
+    import zipfile
+    monkeypatch.chdir(tmp_path)
+    caminho = tmp_path / 'a.xlsx'
+    gerar_planilha(caminho, ['ANA', 'IGOR'])
+    # Excel grava <dimension ref="A1"/> em abas vazias ou de uma célula
+    with zipfile.ZipFile(caminho) as pacote:
+        conteudo = {nome: pacote.read(nome) for nome in pacote.namelist()}
+    conteudo['xl/worksheets/sheet2.xml'] = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"',
+                                                  conteudo['xl/worksheets/sheet2.xml'])
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        for nome, dados in conteudo.items():
+            pacote.writestr(nome, dados)
+
+    resultados = analisar_arquivo_paralelo({'julio': str(caminho)}, jobs=1)
+
+    assert list(resultados) == ['julio_ANA', 'julio_IGOR']
+    assert all(r['dados']['status'] == 'SUCESSO' for r in resultados.values())
+
+
+def test_falha_no_prescan_nao_descarta_o_arquivo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gerar_planilha(tmp_path / 'a.xlsx', ['ANA', 'IGOR'])
+
+    def prescan_quebrado(origem):
+        raise TypeError('dimensão inválida')
+
+    monkeypatch.setattr(analise_paralela, 'prescan_planilha', prescan_quebrado)
+    resultados = analisar_arquivo_paralelo({'julio': str(tmp_path / 'a.xlsx')}, jobs=1)
+
+    assert list(resultados) == ['julio_ANA', 'julio_IGOR']
+
+
+def test_concluido_continua_fora_do_vocabulario_da_situacao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.DataFrame({'DATA': pd.date_range('2025-02-17', periods=4, freq='D'),
+                       'SITUACAO': ['PENDENTE', 'CONCLUIDO', 'QUITADO', 'CONCLUIDO']})
+
+    resultado = analise_paralela.analisar_situacao_colaborador('a.xlsx', 'ANA', df)
+
+    assert resultado['valores_nao_padronizados'] == ['CONCLUIDO']
+    assert round(resultado['taxa_padronizacao'], 1) == 66.7  # 2 de 3 valores distintos
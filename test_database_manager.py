@@ -0,0 +1,324 @@
+import re
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+from acumulador_metricas import AcumuladorMetricas
+from database_manager import DatabaseManager, SCHEMA_MIGRATIONS
+
+
+def test_conexoes_reutilizadas_em_modo_wal(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analise.db'), pool_size=2)
+
+    with db._connection() as conn:
+        primeira = conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    db.save_configuration('limite', {'dias': 30})
+
+    with db._connection() as conn:
+        assert conn is primeira
+    assert db.get_configuration('limite') == {'dias': 30}
+    assert db._open_connections == 1
+    db.close()
+    assert db._open_connections == 0
+
+
+def test_leituras_e_escritas_concorrentes(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analise.db'), pool_size=3)
+    erros = []
+
+    def gravar(indice):
+        for rodada in range(20):
+            if not db.store_metrics(f'COLAB{indice}', 'Julio', datetime(2025, 3, 1), rodada, 0.5, 'estável'):
+                erros.append(indice)
+            db.get_metrics_history(colaborador=f'COLAB{indice}')
+
+    threads = [threading.Thread(target=gravar, args=(indice,)) for indice in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert erros == []
+    assert db._open_connections <= 3
+    assert db.get_group_comparison()['total_records'] == {'Julio': 6 * sum(range(20))}
+
+
+def test_lote_gravado_em_uma_transacao(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analise.db'))
+    data = datetime(2025, 3, 1, 18, 0)
+    registros = [
+        {'colaborador': f'COLAB{indice}', 'grupo': 'Leandro', 'data': data,
+         'total_registros': indice, 'taxa_eficiencia': indice / 10, 'tendencia': 'estável'}
+        for indice in range(50)
+    ]
+
+    assert db.store_metrics_bulk(registros)
+    assert len(db.get_metrics_history(grupo='Leandro', limit=100)) == 50
+
+    # Um registro inválido descarta o lote inteiro
+    assert not db.store_metrics_bulk(registros[:3] + [{'colaborador': 'X'}])
+    assert len(db.get_metrics_history(limit=100)) == 50
+
+
+def test_banco_antigo_migrado_preserva_dados(tmp_path):
+    caminho = str(tmp_path / 'analise.db')
+    conn = sqlite3.connect(caminho)
+    conn.execute('''CREATE TABLE metricas (id INTEGER PRIMARY KEY AUTOINCREMENT, colaborador TEXT NOT NULL,
+                    grupo TEXT NOT NULL, data TIMESTAMP NOT NULL, total_registros INTEGER NOT NULL,
+                    taxa_eficiencia REAL NOT NULL, tendencia TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    conn.execute("INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia) "
+                 "VALUES ('ANA', 'Julio', '2025-03-01T18:00:00', 10, 0.5, 'estável')")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(caminho)
+
+    with db._connection() as conn:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_MIGRATIONS[-1][0]
+        indices = {linha[1] for linha in conn.execute('PRAGMA index_list(metricas)')}
+    assert {'idx_metricas_colaborador_data', 'idx_metricas_grupo_data'} <= indices
+    assert db.get_metrics_history(colaborador='ANA')[0]['total_registros'] == 10
+
+
+def test_processos_abrindo_o_banco_ao_mesmo_tempo_migram_uma_vez(tmp_path, caplog):
+    caminho = str(tmp_path / 'analise.db')
+    barreira = threading.Barrier(8)
+    versoes = []
+
+    def abrir():
+        barreira.wait()
+        db = DatabaseManager(caminho, pool_size=1)
+        with db._connection() as conn:
+            versoes.append(conn.execute('PRAGMA user_version').fetchone()[0])
+
+    threads = [threading.Thread(target=abrir) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert versoes == [SCHEMA_MIGRATIONS[-1][0]] * 8
+    assert 'Database initialization failed' not in caplog.text
+
+
+TABELAS_HISTORICO = {'metricas', 'analise_historica', 'execucoes', 'execucao_colaborador',
+                     'execucao_status', 'execucao_diaria'}
+
+
+def test_consultas_publicas_usam_indice(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analise.db'), pool_size=1)
+    consultas = []
+    with db._connection() as conn:
+        conn.set_trace_callback(consultas.append)
+
+    db.get_metrics_history()
+    db.get_metrics_history(colaborador='ANA', start_date=datetime(2025, 1, 1))
+    db.get_metrics_history(grupo='Julio', start_date=datetime(2025, 1, 1), end_date=datetime(2025, 2, 1))
+    db.get_efficiency_trend('ANA', days=30)
+    db.get_group_comparison()
+    db.get_configuration('limite')
+    db.get_collaborator_history('ANA', runs=90)
+    db.get_status_mix(grupo='Julio', start_date=datetime(2025, 1, 1))
+    db.get_status_mix(start_date=datetime(2025, 1, 1), end_date=datetime(2025, 2, 1))
+    db.get_efficiency_rollup(days=30, grupo='Julio')
+    db.get_efficiency_rollup(days=90, per_collaborator=True)
+    db.get_efficiency_rollup(days=365, colaborador='ANA')
+    db.get_efficiency_summary(datetime(2025, 1, 29), datetime(2025, 4, 2), grupo='Julio')
+    db.get_efficiency_summary(datetime(2025, 1, 29), datetime(2025, 4, 2), colaborador='ANA')
+
+    with db._connection() as conn:
+        conn.set_trace_callback(None)
+        selects = [sql for sql in consultas if sql.lstrip().upper().startswith(('SELECT', 'WITH'))]
+        assert len(selects) >= 16
+        for sql in selects:
+            plano = [linha[3] for linha in conn.execute('EXPLAIN QUERY PLAN ' + sql)]
+            # Leituras de CTEs já materializadas não tocam as tabelas
+            ctes = {passo.split()[1] for passo in plano if passo.startswith('MATERIALIZE')}
+            acessos = [passo for passo in plano if passo.startswith(('SCAN', 'SEARCH')) and passo.split()[1] not in ctes]
+            assert acessos and all('USING' in passo for passo in acessos), (sql, plano)
+            # Nas tabelas de histórico, só uma leitura em ordem de índice
+            # interrompida pelo LIMIT pode percorrer a tabela
+            apelidos = {apelido or tabela: tabela
+                        for tabela, apelido in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?!WHERE|JOIN|ON|GROUP|ORDER)(\w+))?',
+                                                          sql, flags=re.IGNORECASE)}
+            varreduras = [passo for passo in acessos if passo.startswith('SCAN')
+                          and apelidos.get(passo.split()[1], passo.split()[1]) in TABELAS_HISTORICO]
+            assert not varreduras or ' LIMIT ' in sql.upper(), (sql, plano)
+
+
+def metricas_colaborador(nome, status):
+    acumulador = AcumuladorMetricas()
+    acumulador.adicionar(pd.DataFrame({
+        'DATA': pd.to_datetime(['2025-02-17', '2025-02-17', '2025-02-18'][:len(status)]),
+        'STATUS': status
+    }))
+    return acumulador.metricas(nome, incluir_cubo=True)
+
+
+def test_historico_normalizado_e_backfill_dos_blobs(tmp_path):
+    caminho = str(tmp_path / 'analise.db')
+    conn = sqlite3.connect(caminho)
+    conn.execute('''CREATE TABLE analise_historica (id INTEGER PRIMARY KEY AUTOINCREMENT, data TIMESTAMP NOT NULL,
+                    grupo TEXT NOT NULL, metricas TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    antigo = {'ANA': metricas_colaborador('ANA', ['PENDENTE', 'QUITADO', 'QUITADO']), 'IGOR': {}}
+    conn.execute('INSERT INTO analise_historica (data, grupo, metricas) VALUES (?, ?, ?)',
+                 ('2025-02-18T18:00:00', 'Julio', json.dumps(antigo, ensure_ascii=False)))
+    conn.execute("INSERT INTO analise_historica (data, grupo, metricas) VALUES ('2025-02-19', 'Julio', 'corrompido')")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(caminho)
+    assert db.store_analysis_history(datetime(2025, 2, 25, 18, 0), 'Julio',
+                                     {'ANA': metricas_colaborador('ANA', ['PENDENTE', 'PENDENTE'])})
+
+    historico = db.get_collaborator_history('ANA')
+    assert [linha['data'] for linha in historico] == ['2025-02-25T18:00:00', '2025-02-18T18:00:00']
+    assert historico[1]['total_registros'] == 3
+    assert historico[1]['taxa_eficiencia'] == antigo['ANA']['taxa_eficiencia']
+    # 17/02 vem da execução mais recente; 18/02 só da primeira
+    assert db.get_status_mix(grupo='Julio') == [
+        {'grupo': 'Julio', 'semana': '2025-02-17', 'status': 'PENDENTE', 'quantidade': 2},
+        {'grupo': 'Julio', 'semana': '2025-02-17', 'status': 'QUITADO', 'quantidade': 1},
+    ]
+    with db._connection() as conn:
+        diarias = conn.execute("SELECT dia, status, quantidade FROM execucao_diaria WHERE colaborador = 'ANA' "
+                               "ORDER BY execucao_id, dia, status").fetchall()
+    assert diarias == [('2025-02-17', 'PENDENTE', 1), ('2025-02-17', 'QUITADO', 1), ('2025-02-18', 'QUITADO', 1),
+                       ('2025-02-17', 'PENDENTE', 2)]
+
+    # Reabrir não repete o backfill
+    DatabaseManager(caminho)
+    assert len(db.get_collaborator_history('ANA')) == 2
+
+
+def test_execucoes_repetidas_nao_multiplicam_o_mix_de_status(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analise.db'))
+    ana = metricas_colaborador('ANA', ['PENDENTE', 'QUITADO', 'QUITADO'])
+    for hora in (9, 13, 18):
+        assert db.store_analysis_history(datetime(2025, 2, 18, hora, 0), 'Julio', {'ANA': ana})
+    # Outro grupo com o mesmo nome de colaborador não interfere
+    assert db.store_analysis_history(datetime(2025, 2, 18, 18, 0), 'Leandro', {'ANA': ana})
+
+    assert db.get_status_mix(grupo='Julio') == [
+        {'grupo': 'Julio', 'semana': '2025-02-17', 'status': 'PENDENTE', 'quantidade': 1},
+        {'grupo': 'Julio', 'semana': '2025-02-17', 'status': 'QUITADO', 'quantidade': 2},
+    ]
+    assert len(db.get_status_mix(start_date=date(2025, 2, 18), end_date=date(2025, 2, 18))) == 2
+    with db._connection() as conn:
+        # Só a primeira execução de cada grupo grava os dias
+        assert conn.execute("SELECT COUNT(*) FROM execucao_diaria").fetchone()[0] == 6
+
+
+def registros_aleatorios(quantidade=400, semente=0, fim=None):
+    rng = np.random.default_rng(semente)
+    fim = fim or datetime(2025, 4, 2, 23, 0)
+    return [
+        {'colaborador': str(rng.choice(['ANA', 'IGOR', 'NUNO'])), 'grupo': str(rng.choice(['Julio', 'Leandro'])),
+         'data': fim - timedelta(hours=int(rng.integers(0, 24 * 120))),
+         'total_registros': int(rng.integers(0, 100)), 'taxa_eficiencia': float(rng.random()),
+         'tendencia': 'estável'}
+        for _ in range(quantidade)
+    ]
+
+
+def test_rollups_iguais_a_agregacao_das_linhas(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analise.db'))
+    registros = registros_aleatorios()
+    assert db.store_metrics_bulk(registros[:300])
+    for registro in registros[300:]:
+        assert db.store_metrics(**registro)
+
+    df = pd.DataFrame(registros)
+    janela = df[(df['data'] >= datetime(2025, 1, 29)) & (df['grupo'] == 'Julio')]
+    resumo = db.get_efficiency_summary(date(2025, 1, 29), date(2025, 4, 2), grupo='Julio')
+
+    assert resumo['registros'] == len(janela)
+    assert resumo['total_registros'] == janela['total_registros'].sum()
+    assert abs(resumo['taxa_eficiencia'] - janela['taxa_eficiencia'].mean()) < 1e-9
+    # 2 meses + 5 dias, em vez de ~600 linhas
+    assert resumo['buckets'] <= 2 + 5
+
+    ana = df[(df['colaborador'] == 'ANA') & (df['data'] >= datetime(2025, 3, 1))]
+    resumo_ana = db.get_efficiency_summary(date(2025, 3, 1), date(2025, 4, 2), colaborador='ANA')
+    assert resumo_ana['registros'] == len(ana)
+    assert db.get_efficiency_summary(date(2030, 1, 1), date(2030, 1, 31))['taxa_eficiencia'] is None
+
+
+def test_banco_existente_recebe_rollups_e_escolhe_o_periodo(tmp_path):
+    caminho = str(tmp_path / 'analise.db')
+    fim = datetime.combine(date.today(), datetime.min.time()) + timedelta(hours=12)
+    registros = registros_aleatorios(semente=1, fim=fim)
+    db = DatabaseManager(caminho)
+    db.store_metrics_bulk(registros)
+    # Simula um banco gravado antes dos rollups: apaga-os e volta a versão
+    with db._connection() as conn:
+        conn.executescript('''DROP TRIGGER trg_metricas_rollup; DROP TABLE metricas_rollup_colaborador;
+                              DROP TABLE metricas_rollup_grupo; PRAGMA user_version=4;''')
+    db.close()
+
+    db = DatabaseManager(caminho)
+
+    semanas = db.get_efficiency_rollup(days=60, grupo='Leandro')
+    assert {linha['periodo'] for linha in semanas} == {'semana'}
+    assert [linha['inicio'] for linha in semanas] == sorted(linha['inicio'] for linha in semanas)
+    df = pd.DataFrame(registros)
+    inicio = date.today() - timedelta(days=60)
+    inicio -= timedelta(days=inicio.weekday())
+    leandro = df[(df['grupo'] == 'Leandro') & (df['data'] >= datetime.combine(inicio, datetime.min.time()))]
+    assert sum(linha['registros'] for linha in semanas) == len(leandro)
+
+    dias = db.get_efficiency_rollup(days=7, colaborador='NUNO')
+    assert {linha['periodo'] for linha in dias} == {'dia'} and {linha['colaborador'] for linha in dias} == {'NUNO'}
+    assert {linha['periodo'] for linha in db.get_efficiency_rollup(days=365)} == {'mes'}
+
+
+def test_pipeline_ignora_metrica_incompleta(tmp_path):
+    from types import SimpleNamespace
+    from data_analysis_pipeline import DataAnalysisPipeline
+    pipeline = DataAnalysisPipeline.__new__(DataAnalysisPipeline)
+    pipeline.db_manager = DatabaseManager(str(tmp_path / 'analise.db'))
+    ana = metricas_colaborador('ANA', ['PENDENTE', 'QUITADO', 'QUITADO'])
+    # Aba sem coluna STATUS: a eficiência não pôde ser calculada
+    igor = {**ana, 'taxa_eficiencia': None, 'tendencia': None}
+    pipeline.analisador = SimpleNamespace(metricas_julio={'ANA': ana, 'IGOR': igor, 'NUNO': {}},
+                                          metricas_leandro={'LUARA': {**ana, 'total_registros': None}})
+
+    pipeline._store_results()
+
+    historico = pipeline.db_manager.get_metrics_history(limit=10)
+    assert sorted((linha['colaborador'], linha['total_registros']) for linha in historico) == [('ANA', 3), ('LUARA', 0)]
+
+
+def test_backfill_ignora_entradas_invalidas_sem_travar_migracoes(tmp_path):
+    caminho = str(tmp_path / 'analise.db')
+    conn = sqlite3.connect(caminho)
+    conn.execute('''CREATE TABLE analise_historica (id INTEGER PRIMARY KEY AUTOINCREMENT, data TIMESTAMP NOT NULL,
+                    grupo TEXT NOT NULL, metricas TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    ana = metricas_colaborador('ANA', ['PENDENTE', 'QUITADO', 'QUITADO'])
+    blobs = [
+        {'ANA': {**ana, 'distribuicao_status': {'PENDENTE': None, 'QUITADO': 2},
+                 'tendencia': {'direcao': ['crescente']}}},
+        {'IGOR': {**ana, 'cubo_dia_status': {'dias': ['2025-02-17'], 'status': ['PENDENTE'], 'contagens': 5}}},
+        {'NUNO': ana},
+    ]
+    for blob in blobs:
+        conn.execute('INSERT INTO analise_historica (data, grupo, metricas) VALUES (?, ?, ?)',
+                     ('2025-02-18T18:00:00', 'Julio', json.dumps(blob)))
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(caminho)
+
+    with db._connection() as conn:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_MIGRATIONS[-1][0]
+        status = conn.execute("SELECT colaborador, status, quantidade FROM execucao_status ORDER BY 1, 2").fetchall()
+    # IGOR (cubo inválido) fica de fora por inteiro; as demais entradas são copiadas
+    assert status == [('ANA', 'QUITADO', 2), ('NUNO', 'PENDENTE', 1), ('NUNO', 'QUITADO', 2)]
+    assert db.get_collaborator_history('ANA')[0]['tendencia'] is None
+    assert db.get_collaborator_history('IGOR') == []
+    assert db.get_efficiency_rollup(days=30) == []
@@ -0,0 +1,42 @@
+import pickle
+import numpy as np
+from esboco_quantis import EsbocoQuantis
+
+
+def erro_de_posto(ordenados, valor, q):
+    """Distância entre q e o intervalo de postos ocupado pelo valor"""
+    inferior = np.searchsorted(ordenados, valor, side='left') / len(ordenados)
+    superior = np.searchsorted(ordenados, valor, side='right') / len(ordenados)
+    return max(0.0, inferior - q, q - superior)
+
+
+def test_quantis_dentro_do_erro_com_memoria_limitada():
+    valores = np.random.default_rng(0).exponential(20, 200000).round()
+    esboco = EsbocoQuantis(k=200, semente=1)
+    for inicio in range(0, len(valores), 5000):
+        esboco.adicionar(valores[inicio:inicio + 5000])
+
+    ordenados = np.sort(valores)
+    assert esboco.total == len(valores)
+    assert sum(len(nivel) for nivel in esboco.niveis) < 1000
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert erro_de_posto(ordenados, esboco.quantil(q), q) < 0.02
+    assert abs(esboco.posto(40) / len(valores) - np.mean(valores <= 40)) < 0.02
+
+
+def test_esbocos_mesclados_e_serializados():
+    valores = np.random.default_rng(2).normal(50, 10, 60000)
+    partes = [EsbocoQuantis(k=200, semente=i) for i in range(6)]
+    for i, parte in enumerate(partes):
+        parte.adicionar(valores[i::6])
+
+    # Esboços vindos de outros processos chegam serializados
+    mesclado = pickle.loads(pickle.dumps(partes[0]))
+    for parte in partes[1:]:
+        mesclado.mesclar(pickle.loads(pickle.dumps(parte)))
+
+    ordenados = np.sort(valores)
+    assert mesclado.total == len(valores)
+    for q in (0.25, 0.5, 0.75):
+        assert erro_de_posto(ordenados, mesclado.quantil(q), q) < 0.02
+    assert EsbocoQuantis().quantil(0.5) is None
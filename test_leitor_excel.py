@@ -0,0 +1,472 @@
+import os
+import pytest
+import openpyxl
+import pandas as pd
+from datetime import datetime
+from cache_planilhas import CachePlanilhas
+from cache_metricas import CacheMetricas
+from leitor_excel import (abrir_planilha, ler_abas, carregar_abas, impressoes_abas, linhas_abas,
+                          abrir_planilha_streaming, ler_aba_em_blocos, ProjecaoColunas, prescan_planilha,
+                          aba_de_colaborador)
+
+
+@pytest.fixture
+def planilha(tmp_path):
+    """Gera uma planilha com abas de colaboradores e uma aba de teste"""
+    caminho = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    with pd.ExcelWriter(caminho) as writer:
+        pd.DataFrame({'DATA': ['2025-02-17'], 'SITUAÇÃO': ['PENDENTE']}).to_excel(writer, sheet_name='TESTE', index=False)
+        pd.DataFrame({'DATA': ['2025-02-17', '2025-02-18'], 'SITUAÇÃO': ['PENDENTE', 'QUITADO']}).to_excel(writer, sheet_name='ANA', index=False)
+        pd.DataFrame({'DATA': ['2025-02-18'], 'SITUAÇÃO': ['VERIFICADO']}).to_excel(writer, sheet_name='IGOR', index=False)
+    return caminho
+
+
+def test_ler_abas_abre_arquivo_uma_vez(planilha, monkeypatch):
+    aberturas = []
+    original = openpyxl.load_workbook
+
+    def load_workbook_contado(*args, **kwargs):
+        aberturas.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(openpyxl, 'load_workbook', load_workbook_contado)
+    abas = dict(ler_abas(str(planilha), cache=None))
+
+    assert list(abas) == ['TESTE', 'ANA', 'IGOR']
+    assert len(aberturas) == 1
+    assert len(abas['ANA']) == 2
+
+
+def test_carregar_abas_com_filtro(planilha):
+    xls = abrir_planilha(str(planilha))
+    abas = carregar_abas(xls, filtro=lambda aba: aba != 'TESTE')
+
+    assert list(abas) == ['ANA', 'IGOR']
+    assert abas['IGOR']['SITUAÇÃO'].tolist() == ['VERIFICADO']
+
+
+def test_ler_abas_usa_cache_para_arquivo_inalterado(planilha, tmp_path, monkeypatch):
+    cache = CachePlanilhas(str(tmp_path / 'cache'))
+    primeira = carregar_abas(str(planilha), cache=cache)
+
+    def falhar(*args, **kwargs):
+        raise AssertionError("o arquivo não deveria ser reaberto")
+
+    monkeypatch.setattr(openpyxl, 'load_workbook', falhar)
+    segunda = carregar_abas(str(planilha), cache=cache)
+
+    assert list(segunda) == list(primeira)
+    for aba in primeira:
+        pd.testing.assert_frame_equal(segunda[aba], primeira[aba])
+    assert cache.acertos == 3
+
+
+def test_cache_preserva_colunas_mistas(tmp_path):
+    cache = CachePlanilhas(str(tmp_path / 'cache'))
+    df = pd.DataFrame({
+        'DATA': [datetime(2025, 2, 17), 'SEM DATA', 45705, float('nan')],
+        'CÓD': [58.1, datetime(8003, 1, 1), 'N°', 102],
+        'VALOR': [1.5, 2.0, float('nan'), 4.0],
+    })
+
+    assert cache.salvar('chave', 'ANA', df)
+    lido = cache.obter('chave', 'ANA')
+
+    pd.testing.assert_frame_equal(lido, df)
+    assert [type(v) for v in lido['CÓD']] == [type(v) for v in df['CÓD']]
+
+
+def test_cache_remove_entradas_menos_usadas(tmp_path):
+    df = pd.DataFrame({'SITUAÇÃO': ['PENDENTE'] * 200})
+    cache = CachePlanilhas(str(tmp_path / 'cache'), limite_bytes=10**9)
+    cache.salvar('a', 'ANA', df)
+    tamanho = cache.tamanho_total()
+    cache.limite_bytes = tamanho * 2
+
+    antiga = cache._caminho('a', 'ANA')
+    os.utime(antiga, (1, 1))
+    cache.salvar('b', 'IGOR', df)
+    cache.salvar('c', 'NUNO', df)
+
+    assert not os.path.exists(antiga)
+    assert cache.obter('c', 'NUNO') is not None
+
+
+def test_impressoes_mudam_apenas_para_aba_editada(planilha):
+    antes = impressoes_abas(str(planilha))
+
+    wb = openpyxl.load_workbook(planilha)
+    wb['IGOR']['B2'] = 'QUITADO'
+    wb.save(planilha)
+    depois = impressoes_abas(str(planilha))
+
+    assert list(depois) == ['TESTE', 'ANA', 'IGOR']
+    assert depois['TESTE'] == antes['TESTE']
+    assert depois['ANA'] == antes['ANA']
+    assert depois['IGOR'] != antes['IGOR']
+
+
+def test_analisador_recalcula_apenas_abas_alteradas(tmp_path, monkeypatch):
+    from debug_excel import AnalisadorExcel
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    with pd.ExcelWriter(planilha) as writer:
+        for nome in ['ANA', 'IGOR', 'NUNO']:
+            pd.DataFrame({
+                'DATA': pd.to_datetime(['2025-02-17', '2025-02-18']),
+                'STATUS': ['PENDENTE', 'VERIFICADO']
+            }).to_excel(writer, sheet_name=nome, index=False)
+    # Gravar uma vez pelo openpyxl para que os estilos fiquem estáveis entre edições
+    openpyxl.load_workbook(planilha).save(planilha)
+    import cache_planilhas
+    monkeypatch.setattr(cache_planilhas, '_cache_padrao', CachePlanilhas(str(tmp_path / 'cache')))
+    cache_metricas = CacheMetricas(str(tmp_path / 'metricas'))
+
+    calculadas = []
+    original = AnalisadorExcel.calcular_metricas_colaborador
+
+    def calcular_contado(self, df, nome, *args):
+        calculadas.append(nome)
+        return original(self, df, nome, *args)
+
+    monkeypatch.setattr(AnalisadorExcel, 'calcular_metricas_colaborador', calcular_contado)
+    primeira = AnalisadorExcel(str(planilha), cache_metricas=cache_metricas)
+    assert primeira.analisar_arquivo() == ['ANA', 'IGOR', 'NUNO']
+    assert calculadas == ['ANA', 'IGOR', 'NUNO']
+
+    wb = openpyxl.load_workbook(planilha)
+    wb['IGOR']['B2'] = 'QUITADO'
+    wb.save(planilha)
+
+    calculadas.clear()
+    segunda = AnalisadorExcel(str(planilha), cache_metricas=cache_metricas)
+    assert segunda.analisar_arquivo() == ['ANA', 'IGOR', 'NUNO']
+    assert calculadas == ['IGOR']
+    assert segunda.colaboradores['ANA'] == primeira.colaboradores['ANA']
+    assert segunda.colaboradores['IGOR']['distribuicao_status'] == {'QUITADO': 1, 'VERIFICADO': 1}
+
+
+def test_linhas_abas_conta_linhas_de_cada_aba(planilha):
+    assert linhas_abas(str(planilha)) == {'TESTE': 2, 'ANA': 3, 'IGOR': 2}
+    assert linhas_abas(str(planilha), filtro=lambda nome: nome == 'ANA') == {'ANA': 3}
+
+
+def test_ler_aba_em_blocos_igual_a_leitura_completa(planilha):
+    planilha_streaming = abrir_planilha_streaming(str(planilha))
+    try:
+        blocos = list(ler_aba_em_blocos(planilha_streaming, 'ANA', tamanho_bloco=1))
+    finally:
+        planilha_streaming.close()
+
+    assert len(blocos) == 2
+    pd.testing.assert_frame_equal(pd.concat(blocos, ignore_index=True), pd.read_excel(planilha, sheet_name='ANA'))
+
+
+def test_metricas_em_streaming_iguais_as_em_memoria(tmp_path, monkeypatch):
+    from debug_excel import AnalisadorExcel
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    datas = pd.date_range('2025-01-01', periods=60, freq='13h')
+    pd.DataFrame({
+        'DATA': datas,
+        'STATUS': (['PENDENTE', 'VERIFICADO', 'QUITADO'] * 20),
+        'RESOLUCAO': datas + pd.to_timedelta([i % 9 for i in range(60)], unit='D')
+    }).to_excel(planilha, sheet_name='ANA', index=False)
+    import cache_planilhas
+    monkeypatch.setattr(cache_planilhas, '_cache_padrao', CachePlanilhas(str(tmp_path / 'cache')))
+
+    em_memoria = AnalisadorExcel(str(planilha), cache_metricas=None, streaming=False)
+    em_blocos = AnalisadorExcel(str(planilha), cache_metricas=None, streaming=True, tamanho_bloco=7)
+    assert em_memoria.analisar_arquivo() == em_blocos.analisar_arquivo() == ['ANA']
+    assert em_blocos.colaboradores['ANA'] == em_memoria.colaboradores['ANA']
+    assert em_blocos.colaboradores['ANA']['tempo_medio_resolucao'] is not None
+
+
+def test_projecao_le_apenas_colunas_mapeadas(tmp_path):
+    caminho = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    pd.DataFrame({
+        'Data ': ['2025-02-17', None], 'CONTRATO': [1, 2], 'SITUAÇÃO': ['PENDENTE', 'QUITADO'], 'OBS': ['a', 'b']
+    }).to_excel(caminho, sheet_name='ANA', index=False)
+    projecao = ProjecaoColunas({'data': ['DATA'], 'status': ['STATUS', 'SITUAÇÃO'], 'banco': ['BANCO']},
+                               obrigatorios=['data', 'status'])
+
+    df = carregar_abas(str(caminho), cache=None, colunas=projecao)['ANA']
+    assert list(df.columns) == ['Data ', 'SITUAÇÃO']
+    assert len(df) == 2
+
+    planilha_streaming = abrir_planilha_streaming(str(caminho))
+    try:
+        blocos = list(ler_aba_em_blocos(planilha_streaming, 'ANA', colunas=projecao))
+    finally:
+        planilha_streaming.close()
+    pd.testing.assert_frame_equal(blocos[0], df)
+
+    # Sem uma coluna obrigatória a aba é lida inteira
+    sem_status = ProjecaoColunas({'data': ['DATA'], 'status': ['STATUS']})
+    assert len(carregar_abas(str(caminho), cache=None, colunas=sem_status)['ANA'].columns) == 4
+
+
+def test_projecao_recorta_aba_completa_do_cache(planilha, tmp_path):
+    cache = CachePlanilhas(str(tmp_path / 'cache'))
+    projecao = ProjecaoColunas({'situacao': ['SITUAÇÃO']})
+
+    completa = carregar_abas(str(planilha), cache=cache)
+    projetada = carregar_abas(str(planilha), cache=cache, colunas=projecao)
+
+    assert cache.acertos == 3
+    pd.testing.assert_frame_equal(projetada['ANA'], completa['ANA'][['SITUAÇÃO']])
+
+
+def test_prescan_classifica_e_mede_abas(planilha):
+    assert prescan_planilha(str(planilha)) == [
+        {'aba': 'TESTE', 'linhas': None, 'colaborador': False, 'oculta': False},
+        {'aba': 'ANA', 'linhas': 3, 'colaborador': True, 'oculta': False},
+        {'aba': 'IGOR', 'linhas': 2, 'colaborador': True, 'oculta': False},
+    ]
+    assert not aba_de_colaborador('_xlnm._FilterDatabase')
+    assert not aba_de_colaborador('Relatório Geral ')
+
+
+def test_ler_abas_na_ordem_pedida(planilha):
+    assert list(carregar_abas(str(planilha), cache=None, ordem=['IGOR', 'ANA'])) == ['IGOR', 'ANA']
+
+
+def test_analisador_le_upload_da_memoria(tmp_path, monkeypatch):
+    from debug_excel import AnalisadorExcel
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    pd.DataFrame({
+        'DATA': pd.date_range('2025-01-01', periods=12, freq='D'),
+        'STATUS': ['PENDENTE', 'VERIFICADO', 'QUITADO'] * 4
+    }).to_excel(planilha, sheet_name='ANA', index=False)
+    import cache_planilhas
+    monkeypatch.setattr(cache_planilhas, '_cache_padrao', CachePlanilhas(str(tmp_path / 'cache')))
+    conteudo = planilha.read_bytes()
+
+    do_disco = AnalisadorExcel(str(planilha), cache_metricas=None)
+    assert do_disco.analisar_arquivo() == ['ANA']
+    for streaming in (False, True):
+        # O nome não existe em disco: tudo vem do conteúdo
+        da_memoria = AnalisadorExcel('uploads/LISTAS.xlsx', cache_metricas=None, streaming=streaming,
+                                     conteudo=memoryview(conteudo))
+        assert da_memoria.analisar_arquivo() == ['ANA']
+        assert da_memoria.colaboradores['ANA'] == do_disco.colaboradores['ANA']
+
+
+def test_arquivamento_grava_upload_em_segundo_plano(tmp_path):
+    from arquivamento import arquivar_em_segundo_plano
+    destino = tmp_path / 'uploads' / 'LISTAS.xlsx'
+
+    assert arquivar_em_segundo_plano(b'conteudo', str(destino)).result(timeout=10) is True
+    assert destino.read_bytes() == b'conteudo'
+    assert not (tmp_path / 'uploads' / 'LISTAS.xlsx.tmp').exists()
+
+
+def test_analisador_processa_apenas_linhas_novas(tmp_path, monkeypatch):
+    from debug_excel import AnalisadorExcel
+    from acumulador_metricas import AcumuladorMetricas
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    datas = pd.date_range('2025-01-01', periods=40, freq='17h')
+    registros = pd.DataFrame({
+        'DATA': datas,
+        'STATUS': ['PENDENTE', 'VERIFICADO', 'QUITADO', 'ANÁLISE'] * 10,
+        'RESOLUCAO': datas + pd.to_timedelta([i % 6 for i in range(40)], unit='D')
+    })
+    registros.iloc[:30].to_excel(planilha, sheet_name='ANA', index=False)
+    import cache_planilhas
+    monkeypatch.setattr(cache_planilhas, '_cache_padrao', CachePlanilhas(str(tmp_path / 'cache')))
+    cache_metricas = CacheMetricas(str(tmp_path / 'metricas'))
+
+    adicionadas = []
+    original = AcumuladorMetricas.adicionar
+
+    def adicionar_contado(self, df):
+        adicionadas.append(len(df))
+        return original(self, df)
+
+    monkeypatch.setattr(AcumuladorMetricas, 'adicionar', adicionar_contado)
+    AnalisadorExcel(str(planilha), cache_metricas=cache_metricas).analisar_arquivo()
+    assert adicionadas == [30]
+
+    # A lista cresceu: só as 10 linhas novas são processadas
+    registros.to_excel(planilha, sheet_name='ANA', index=False)
+    adicionadas.clear()
+    incremental = AnalisadorExcel(str(planilha), cache_metricas=cache_metricas)
+    incremental.analisar_arquivo()
+    assert adicionadas == [10]
+
+    completo = AnalisadorExcel(str(planilha), cache_metricas=None)
+    completo.analisar_arquivo()
+    assert incremental.colaboradores['ANA'] == completo.colaboradores['ANA']
+
+    # Linha antiga editada: a aba inteira é recalculada
+    registros.loc[3, 'STATUS'] = 'QUITADO'
+    registros.to_excel(planilha, sheet_name='ANA', index=False)
+    adicionadas.clear()
+    AnalisadorExcel(str(planilha), cache_metricas=cache_metricas).analisar_arquivo()
+    assert adicionadas == [40]
+
+
+def test_limite_conta_todo_o_diretorio_do_cache(tmp_path):
+    diretorio = tmp_path / 'cache'
+    cache = CachePlanilhas(str(diretorio), limite_bytes=10**9)
+    metricas = CacheMetricas(str(diretorio / 'metricas'), cache_planilhas=cache)
+    cache.salvar('a', 'ANA', pd.DataFrame({'SITUAÇÃO': ['PENDENTE'] * 200}))
+    cache.salvar_abas('a', ['ANA'])
+    (diretorio / 'mapeamento_status.json').write_text('{}' + ' ' * 5000)
+    metricas.salvar('antiga', {'total_registros': list(range(2000))})
+    os.utime(metricas._caminho('antiga'), (1, 1))
+    assert cache.tamanho_total() > os.path.getsize(metricas._caminho('antiga')) + 5000
+
+    cache.limite_bytes = cache.tamanho_total() - 1
+    metricas.salvar('nova', {'total_registros': 1})
+
+    assert not os.path.exists(metricas._caminho('antiga'))
+    assert metricas.obter('nova') == (True, {'total_registros': 1})
+    assert (diretorio / 'mapeamento_status.json').exists()
+
+    cache.limite_bytes = 0
+    cache.aplicar_limite()
+    assert [p.name for p in diretorio.rglob('*') if p.is_file()] == ['mapeamento_status.json']
+
+
+def usar_textos_compartilhados(caminho):
+    """Converte as strings inline do openpyxl em shared strings, como grava o Excel"""
+    import re
+    import zipfile
+    with zipfile.ZipFile(caminho) as pacote:
+        conteudo = {nome: pacote.read(nome) for nome in pacote.namelist()}
+    textos = []
+
+    def compartilhar(celula):
+        texto = celula.group(2)
+        if texto not in textos:
+            textos.append(texto)
+        return celula.group(1) + b't="s"><v>' + str(textos.index(texto)).encode() + b'</v>'
+
+    for nome in [nome for nome in conteudo if nome.startswith('xl/worksheets/')]:
+        conteudo[nome] = re.sub(rb'(<c [^>]*)t="inlineStr"><is><t>(.*?)</t></is>', compartilhar, conteudo[nome])
+    conteudo['xl/sharedStrings.xml'] = (
+        b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        + b''.join(b'<si><t>' + texto + b'</t></si>' for texto in textos) + b'</sst>')
+    conteudo['xl/_rels/workbook.xml.rels'] = conteudo['xl/_rels/workbook.xml.rels'].replace(
+        b'</Relationships>', b'<Relationship Id="rIdSst" Target="sharedStrings.xml" Type="http://schemas.'
+        b'openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>')
+    conteudo['[Content_Types].xml'] = conteudo['[Content_Types].xml'].replace(
+        b'</Types>', b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-'
+        b'officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        for nome, dados in conteudo.items():
+            pacote.writestr(nome, dados)
+
+
+def trocar_texto_compartilhado(caminho, antigo, novo):
+    """Edita xl/sharedStrings.xml no lugar, sem tocar no XML das abas"""
+    import zipfile
+    with zipfile.ZipFile(caminho) as pacote:
+        conteudo = {info: pacote.read(info.filename) for info in pacote.infolist()}
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        for info, dados in conteudo.items():
+            if info.filename == 'xl/sharedStrings.xml':
+                dados = dados.replace(antigo.encode(), novo.encode())
+            pacote.writestr(info, dados)
+
+
+def test_texto_compartilhado_alterado_invalida_metricas(tmp_path, monkeypatch):
+    from debug_excel import AnalisadorExcel
+    import cache_planilhas
+    import zipfile
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    with pd.ExcelWriter(planilha) as writer:
+        pd.DataFrame({'DATA': pd.to_datetime(['2025-02-17', '2025-02-18', '2025-02-18']),
+                      'STATUS': ['PENDENTE', 'QUITADO', 'PENDENTE']}).to_excel(writer, sheet_name='ANA', index=False)
+        pd.DataFrame({'DATA': pd.to_datetime(['2025-02-17']),
+                      'STATUS': ['QUITADO']}).to_excel(writer, sheet_name='IGOR', index=False)
+    usar_textos_compartilhados(planilha)
+    with zipfile.ZipFile(planilha) as pacote:
+        assert b'PENDENTE' in pacote.read('xl/sharedStrings.xml')
+        abas_antes = {nome: pacote.read(nome) for nome in pacote.namelist() if nome.startswith('xl/worksheets/')}
+    monkeypatch.setattr(cache_planilhas, '_cache_padrao', CachePlanilhas(str(tmp_path / 'cache')))
+    cache_metricas = CacheMetricas(str(tmp_path / 'metricas'))
+    impressoes = impressoes_abas(str(planilha))
+
+    primeira = AnalisadorExcel(str(planilha), cache_metricas=cache_metricas)
+    primeira.analisar_arquivo()
+    assert primeira.colaboradores['ANA']['distribuicao_status'] == {'PENDENTE': 2, 'QUITADO': 1}
+
+    trocar_texto_compartilhado(planilha, 'PENDENTE', 'APROVADO')
+    with zipfile.ZipFile(planilha) as pacote:
+        assert {nome: pacote.read(nome) for nome in abas_antes} == abas_antes
+    depois = impressoes_abas(str(planilha))
+    assert depois['ANA'] != impressoes['ANA'] and depois['IGOR'] == impressoes['IGOR']
+
+    segunda = AnalisadorExcel(str(planilha), cache_metricas=cache_metricas)
+    segunda.analisar_arquivo()
+    assert segunda.colaboradores['ANA']['distribuicao_status'] == {'APROVADO': 2, 'QUITADO': 1}
+    assert segunda.colaboradores['ANA']['taxa_eficiencia'] == 1.0
+
+    # Outro arquivo com as mesmas abas não reaproveita as métricas deste
+    copia = tmp_path / "OUTRA LISTA.xlsx"
+    copia.write_bytes(planilha.read_bytes())
+    outra = AnalisadorExcel(str(copia), cache_metricas=cache_metricas)
+    assert outra._chave_metricas('ANA', depois['ANA']) != segunda._chave_metricas('ANA', depois['ANA'])
+
+
+def test_hash_dos_textos_reaproveitado_entre_execucoes(tmp_path, monkeypatch):
+    import leitor_excel
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    with pd.ExcelWriter(planilha) as writer:
+        for nome, status in [('ANA', 'PENDENTE'), ('IGOR', 'QUITADO')]:
+            pd.DataFrame({'DATA': pd.to_datetime(['2025-02-17']), 'STATUS': [status]}).to_excel(
+                writer, sheet_name=nome, index=False)
+    usar_textos_compartilhados(planilha)
+    cache = CachePlanilhas(str(tmp_path / 'cache'))
+    monkeypatch.setattr(leitor_excel, '_hashes_textos', {})
+    antes = impressoes_abas(str(planilha), cache=cache)
+
+    # Nova execução (memória do processo vazia): nada além do diretório do zip é lido
+    monkeypatch.setattr(leitor_excel, '_hashes_textos', {})
+    lidas = []
+    original = leitor_excel._textos_compartilhados
+    monkeypatch.setattr(leitor_excel, '_textos_compartilhados', lambda pacote: lidas.append(1) or original(pacote))
+    assert impressoes_abas(str(planilha), cache=cache) == antes
+    assert lidas == []
+
+    trocar_texto_compartilhado(planilha, 'PENDENTE', 'APROVADO')
+    depois = impressoes_abas(str(planilha), cache=cache)
+    assert lidas == [1]
+    assert depois['ANA'] != antes['ANA'] and depois['IGOR'] == antes['IGOR']
+
+
+def reduzir_dimensao(caminho, aba):
+    """Grava <dimension ref="A1"/> na aba, como o Excel faz em abas vazias ou de uma célula"""
+    import re
+    import zipfile
+    with zipfile.ZipFile(caminho) as pacote:
+        workbook = pacote.read('xl/workbook.xml').decode()
+        indice = re.findall(r'<sheet [^>]*name="([^"]+)"', workbook).index(aba) + 1
+        conteudo = {nome: pacote.read(nome) for nome in pacote.namelist()}
+    xml = f'xl/worksheets/sheet{indice}.xml'
+    conteudo[xml] = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', conteudo[xml])
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        for nome, dados in conteudo.items():
+            pacote.writestr(nome, dados)
+
+
+def test_dimensao_de_uma_celula_conta_as_linhas(tmp_path, monkeypatch):
+    from debug_excel import AnalisadorExcel
+    import cache_planilhas
+    planilha = tmp_path / "LISTAS INDIVIDUAIS.xlsx"
+    with pd.ExcelWriter(planilha) as writer:
+        pd.DataFrame({'DATA': pd.to_datetime(['2025-02-17', '2025-02-18']),
+                      'STATUS': ['PENDENTE', 'QUITADO']}).to_excel(writer, sheet_name='ANA', index=False)
+        pd.DataFrame({'DATA': pd.to_datetime(['2025-02-18']),
+                      'STATUS': ['QUITADO']}).to_excel(writer, sheet_name='IGOR', index=False)
+        pd.DataFrame().to_excel(writer, sheet_name='VAZIA', index=False)
+    reduzir_dimensao(planilha, 'ANA')
+    reduzir_dimensao(planilha, 'VAZIA')
+
+    assert linhas_abas(str(planilha)) == {'ANA': 3, 'IGOR': 2, 'VAZIA': 0}
+    assert [aba['linhas'] for aba in prescan_planilha(str(planilha))] == [3, 2, 0]
+
+    monkeypatch.setattr(cache_planilhas, '_cache_padrao', CachePlanilhas(str(tmp_path / 'cache')))
+    analisador = AnalisadorExcel(str(planilha), cache_metricas=None)
+    assert analisador.analisar_arquivo() == ['ANA', 'IGOR']
+    assert analisador.colaboradores['ANA']['total_registros'] == 2
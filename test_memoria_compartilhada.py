@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, time
+from multiprocessing import shared_memory
+import analise_paralela
+import memoria_compartilhada
+from memoria_compartilhada import publicar_dataframe, anexar_dataframe
+
+
+@pytest.fixture
+def aba():
+    return pd.DataFrame({
+        'DATA': pd.to_datetime(['2025-02-17', None, '2025-02-19', '2025-02-20']),
+        'SITUAÇÃO': ['PENDENTE', 'QUITADO', np.nan, 'PENDENTE'],
+        'RESOLUÇÃO': ['18/02/2025', datetime(2025, 2, 19), 45708, time(10, 0)],
+        'VALOR': [1.5, np.nan, 3.0, 4.0],
+        'CÓD': [1, 2, 3, 4],
+    })
+
+
+def test_dataframe_anexado_igual_ao_publicado(aba):
+    segmento = publicar_dataframe(aba)
+    try:
+        with anexar_dataframe(segmento.descritor) as df:
+            pd.testing.assert_frame_equal(df, aba)
+            df = None
+    finally:
+        segmento.liberar()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=segmento.descritor['nome'])
+
+
+def test_analises_aceitam_dataframe_anexado(aba):
+    from debug_excel import AnalisadorExcel
+    analisador = AnalisadorExcel('LISTAS.xlsx', cache_metricas=None)
+    metricas = pd.DataFrame({'DATA': aba['DATA'], 'STATUS': aba['SITUAÇÃO'].fillna('PENDENTE')})
+
+    segmento = publicar_dataframe(metricas)
+    try:
+        with anexar_dataframe(segmento.descritor) as df:
+            esperado = analisador.calcular_metricas_colaborador(metricas.copy(), 'ANA')
+            assert analisador.calcular_metricas_colaborador(df, 'ANA') == esperado
+            df = None
+    finally:
+        segmento.liberar()
+
+
+def test_lote_remove_todos_os_segmentos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pd.ExcelWriter(tmp_path / 'a.xlsx') as writer:
+        for nome in ['ANA', 'IGOR']:
+            pd.DataFrame({
+                'DATA': pd.date_range('2025-02-17', periods=4, freq='D'),
+                'SITUAÇÃO': ['PENDENTE', 'VERIFICADO', 'QUITADO', 'PENDENTE'],
+                'OBSERVAÇÃO': ['a', 'b', 'c', 'd']
+            }).to_excel(writer, sheet_name=nome, index=False)
+
+    publicados = []
+    original = memoria_compartilhada.publicar_dataframe
+
+    def publicar_registrando(df):
+        segmento = original(df)
+        publicados.append((list(df.columns), segmento.descritor['nome']))
+        return segmento
+
+    monkeypatch.setattr(analise_paralela, 'publicar_dataframe', publicar_registrando)
+    resultados = analise_paralela.analisar_arquivo_paralelo({'julio': str(tmp_path / 'a.xlsx')}, jobs=2)
+
+    assert [r['dados']['status'] for r in resultados.values()] == ['SUCESSO', 'SUCESSO']
+    assert [colunas for colunas, _ in publicados] == [['DATA', 'SITUAÇÃO']] * 2
+    for _, nome in publicados:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nome)
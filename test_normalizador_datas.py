@@ -0,0 +1,100 @@
+import warnings
+import numpy as np
+import pandas as pd
+from collections import Counter
+from datetime import datetime, time
+from debug_excel_fixed import AnalisadorExcel
+from normalizador_datas import (converter_datas, converter_com_formatos, resumir_falhas, FormatosDatas,
+                                FALHA_TEXTO_VAZIO, FALHA_TIPO)
+
+
+def corrigir_celula_a_celula(serie):
+    analisador = AnalisadorExcel.__new__(AnalisadorExcel)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return serie.apply(analisador.corrigir_formato_data)
+
+
+def test_converter_datas_igual_ao_caminho_escalar():
+    valores = [
+        '17/02/2025', '1/2/2025', '2025-02-17', '17-02-25', '2025/02/17',
+        '17/02/2025 10:30:00', 'SEM DATA', '', '12/13/2025', '01/01/8003',
+        45705, 45705.5, 38474.8738417905, 1e9, float('inf'), True,
+        None, np.nan, datetime(2025, 1, 1, 12), pd.Timestamp('2024-05-05'),
+        datetime(8003, 1, 1), time(10, 0),
+    ]
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        serie = pd.Series([valores[i] for i in rng.integers(0, len(valores), 30)], dtype=object)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            obtido = converter_datas(serie)
+        pd.testing.assert_series_equal(obtido, corrigir_celula_a_celula(serie))
+
+
+def test_converter_datas_conta_falhas():
+    serie = pd.Series(['17/02/2025', 'SEM DATA', 'SEM DATA', time(10, 0), 45705], dtype=object)
+    falhas = Counter()
+
+    resultado = converter_datas(serie, falhas)
+
+    assert resultado.tolist()[0] == pd.Timestamp('2025-02-17')
+    assert resultado.tolist()[4] == pd.Timestamp('2025-02-17')
+    assert falhas == Counter({FALHA_TEXTO_VAZIO: 2, FALHA_TIPO: 1})
+    assert resumir_falhas(falhas, 'DATA').startswith('3 valores de DATA')
+
+
+def test_formatos_detectados_sao_registrados_e_reaproveitados(tmp_path):
+    arquivo = str(tmp_path / 'formatos.json')
+    serie = pd.Series(['17/02/2025', '18/02/2025', '2025-02-19', 'SEM DATA', 45705], dtype=object)
+
+    formatos = FormatosDatas(arquivo)
+    chave = formatos.chave('LISTAS.xlsx', 'ANA', 'DATA')
+    primeira = converter_datas(serie, formatos=formatos, chave=chave)
+    assert (formatos.acertos, formatos.falhas) == (0, 1)
+
+    # Nova execução: os formatos vêm do disco, sem detecção
+    formatos = FormatosDatas(arquivo)
+    segunda = converter_datas(serie, formatos=formatos, chave=chave)
+    assert (formatos.acertos, formatos.falhas) == (1, 0)
+    assert formatos.valores_lentos == 0
+    pd.testing.assert_series_equal(segunda, primeira)
+    pd.testing.assert_series_equal(segunda, corrigir_celula_a_celula(serie))
+
+
+def test_planilhas_com_o_mesmo_nome_nao_compartilham_formatos(tmp_path):
+    formatos = FormatosDatas(str(tmp_path / 'formatos.json'))
+    julio = formatos.chave(str(tmp_path / 'julio' / 'LISTAS.xlsx'), 'ANA', 'DATA')
+    leandro = formatos.chave(str(tmp_path / 'leandro' / 'LISTAS.xlsx'), 'ANA', 'DATA')
+    converter_datas(pd.Series(['02/03/2025']), formatos=formatos, chave=julio)
+
+    assert julio != leandro
+    assert formatos.chave(str(tmp_path / 'julio' / '.' / 'LISTAS.xlsx'), 'ANA', 'DATA') == julio
+    converter_datas(pd.Series(['2025-03-02']), formatos=formatos, chave=leandro)
+    assert (formatos.acertos, formatos.falhas) == (0, 2)
+
+
+def test_formato_novo_vai_para_caminho_lento_e_passa_a_ser_registrado(tmp_path):
+    formatos = FormatosDatas(str(tmp_path / 'formatos.json'))
+    chave = formatos.chave('LISTAS.xlsx', 'ANA', 'DATA')
+    converter_datas(pd.Series(['17/02/2025']), formatos=formatos, chave=chave)
+
+    serie = pd.Series(['18/02/2025', '2025-02-19'])
+    pd.testing.assert_series_equal(
+        converter_datas(serie, formatos=formatos, chave=chave), corrigir_celula_a_celula(serie))
+    assert formatos.valores_lentos == 1
+
+    converter_datas(serie, formatos=formatos, chave=chave)
+    assert formatos.valores_lentos == 1
+
+
+def test_converter_com_formatos_usa_alternativo_para_o_restante(tmp_path):
+    formatos = FormatosDatas(str(tmp_path / 'formatos.json'))
+    serie = pd.Series(['17/02/2025', '18/02/2025', 'Feb 19 2025', datetime(2025, 2, 20), None], dtype=object)
+    alternativo = lambda resto: pd.to_datetime(resto, format='mixed', errors='coerce')
+
+    resultado = converter_com_formatos(serie, formatos, 'chave', alternativo)
+
+    assert resultado.tolist()[:4] == [pd.Timestamp(f'2025-02-{dia}') for dia in (17, 18, 19, 20)]
+    assert pd.isna(resultado.iloc[4])
+    assert formatos.valores_lentos == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from qualidade_situacao import VALORES_PADRONIZADOS, calcular_qualidade, calcular_qualidade_abas
+
+
+def score_por_aba(df, ddof, minimo_dias):
+    """Cálculo original, uma aba por vez"""
+    total = len(df)
+    vazios = df['SITUACAO'].isna().sum()
+    unicos = df['SITUACAO'].dropna().unique()
+    nao_padronizados = [v for v in unicos if v not in VALORES_PADRONIZADOS]
+    preenchimento = (total - vazios) / total if total > 0 else 0
+    padronizacao = (len(unicos) - len(nao_padronizados)) / len(unicos) if len(unicos) > 0 else 0
+    consistencia = 0
+    atualizacoes = df.groupby(df['DATA'].dt.date)['SITUACAO'].count()
+    if len(atualizacoes) >= minimo_dias:
+        desvio = np.std(atualizacoes.to_numpy(), ddof=ddof)
+        if atualizacoes.mean() > 0:
+            consistencia = 1 - min(1, desvio / atualizacoes.mean())
+    return nao_padronizados, (0.4 * preenchimento + 0.3 * padronizacao + 0.3 * consistencia) * 100
+
+
+def abas_aleatorias(semente=0):
+    rng = np.random.default_rng(semente)
+    abas = []
+    for indice in range(12):
+        linhas = int(rng.integers(0, 40))
+        abas.append((f'COLAB{indice}', pd.DataFrame({
+            'Situação ': rng.choice(['PENDENTE', 'QUITADO', 'quitado', 'EM ANALISE', None], linhas),
+            'DATA': pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 4, linhas), unit='D'),
+            'VALOR': rng.random(linhas)
+        })))
+        abas[-1][1].loc[abas[-1][1].index % 6 == 5, 'DATA'] = pd.NaT
+    return abas
+
+
+@pytest.mark.parametrize('ddof,minimo_dias', [(1, 2), (0, 1)])
+def test_score_agrupado_igual_ao_calculo_por_aba(ddof, minimo_dias):
+    abas = abas_aleatorias()
+
+    tabela = calcular_qualidade_abas(abas, ddof=ddof, minimo_dias=minimo_dias)
+
+    assert list(tabela.index) == [nome for nome, _ in abas]
+    for nome, df in abas:
+        df = df.rename(columns={'Situação ': 'SITUACAO'})
+        nao_padronizados, score = score_por_aba(df, ddof, minimo_dias)
+        assert tabela.loc[nome, 'valores_nao_padronizados'] == nao_padronizados
+        assert tabela.loc[nome, 'score_qualidade'] == pytest.approx(score)
+
+
+def test_abas_sem_situacao_ficam_fora_e_sem_data_nao_tem_consistencia():
+    abas = [
+        ('ANA', pd.DataFrame({'SITUACAO': ['PENDENTE', 'QUITADO']})),
+        ('IGOR', pd.DataFrame({'STATUS': ['PENDENTE']})),
+        ('NUNO', pd.DataFrame({'SITUACAO': [], 'DATA': []}))
+    ]
+
+    tabela = calcular_qualidade_abas(abas)
+
+    assert list(tabela.index) == ['ANA', 'NUNO']
+    assert tabela.loc['ANA', 'consistencia_diaria'] == 0
+    assert tabela.loc['ANA', 'score_qualidade'] == pytest.approx(70.0)
+    assert tabela.loc['NUNO', 'total_registros'] == 0 and tabela.loc['NUNO', 'score_qualidade'] == 0
+
+
+def test_formato_longo_ignora_colaborador_nulo():
+    df = pd.DataFrame({
+        'COLABORADOR': ['ANA', 'ANA', None, 'IGOR'],
+        'SITUACAO': ['PENDENTE', 'XPTO', 'XPTO', None],
+        'DATA': pd.to_datetime(['2025-03-01', '2025-03-02', '2025-03-02', '2025-03-01'])
+    })
+
+    tabela = calcular_qualidade(df)
+
+    assert tabela['total_registros'].to_dict() == {'ANA': 2, 'IGOR': 1}
+    assert tabela.loc['ANA', 'taxa_padronizacao'] == 0.5
+    assert tabela.loc['ANA', 'consistencia_diaria'] == 1.0
+    assert tabela.loc['IGOR', 'valores_unicos'] == 0
@@ -0,0 +1,33 @@
+import numpy as np
+from regressao_lote import regressao_em_lote, empilhar_series
+
+
+def test_regressao_em_lote_igual_ao_ajuste_individual():
+    rng = np.random.default_rng(0)
+    series_y = [rng.poisson(5, rng.integers(2, 30)).astype(float) for _ in range(50)]
+    series_x = [np.cumsum(rng.integers(1, 4, len(y))).astype(float) for y in series_y]
+
+    ajuste = regressao_em_lote(series_y, series_x)
+
+    for linha, (x, y) in enumerate(zip(series_x, series_y)):
+        slope, intercept = np.polyfit(x, y, 1)
+        assert ajuste['n'][linha] == len(y)
+        assert np.isclose(ajuste['slope'][linha], slope)
+        assert np.isclose(ajuste['intercept'][linha], intercept)
+        if y.std() > 0:
+            corr = np.corrcoef(x, y)[0, 1]
+            assert np.isclose(ajuste['correlacao'][linha], corr)
+            assert np.isclose(ajuste['r2'][linha], corr ** 2)
+
+
+def test_regressao_em_lote_com_matriz_completada_e_series_constantes():
+    y = empilhar_series([[1, 2, 3], [4, 4, 4, 4], [7]])
+    assert np.isnan(y[0, 3]) and np.isnan(y[2, 1])
+
+    ajuste = regressao_em_lote(y)
+
+    assert ajuste['n'].tolist() == [3, 4, 1]
+    assert np.allclose(ajuste['slope'], [1, 0, 0])
+    assert np.allclose(ajuste['intercept'], [1, 4, 7])
+    assert ajuste['correlacao'][0] == 1
+    assert np.isnan(ajuste['correlacao'][1]) and np.isnan(ajuste['r2'][1])
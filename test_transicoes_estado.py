@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from collections import Counter
+from transicoes_estado import contar_transicoes, contar_transicoes_por_grupo
+
+
+def transicoes_linha_a_linha(situacoes):
+    """Laço original sobre iterrows"""
+    transicoes = []
+    situacao_anterior = None
+    for situacao_atual in situacoes:
+        if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
+            transicoes.append((situacao_anterior, situacao_atual))
+        situacao_anterior = situacao_atual
+    return dict(Counter(transicoes))
+
+
+def test_contar_transicoes_igual_ao_laco_original():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        situacoes = pd.Series(rng.choice(['PENDENTE', 'VERIFICADO', 'QUITADO', None], rng.integers(0, 40)), dtype=object)
+
+        contagem, matriz = contar_transicoes(situacoes)
+
+        esperado = transicoes_linha_a_linha(situacoes)
+        assert list(contagem.items()) == list(esperado.items())
+        assert int(matriz.to_numpy().sum()) == sum(esperado.values())
+        for (de, para), n in esperado.items():
+            assert matriz.loc[de, para] == n
+
+
+def test_matriz_densa_tem_todos_os_estados():
+    contagem, matriz = contar_transicoes(['PENDENTE', 'QUITADO', 'QUITADO', None, 'VERIFICADO'])
+
+    assert contagem == {('PENDENTE', 'QUITADO'): 1}
+    assert list(matriz.index) == list(matriz.columns) == ['PENDENTE', 'QUITADO', 'VERIFICADO']
+    assert matriz.to_numpy().tolist() == [[0, 1, 0], [0, 0, 0], [0, 0, 0]]
+
+
+def test_transicoes_por_grupo_nao_cruzam_colaboradores():
+    df = pd.DataFrame({
+        'COLABORADOR': ['ANA', 'ANA', 'ANA', 'IGOR', 'IGOR', None, 'IGOR'],
+        'SITUACAO': ['PENDENTE', 'QUITADO', 'PENDENTE', 'VERIFICADO', 'QUITADO', 'PENDENTE', 'PENDENTE']
+    })
+
+    resultado = contar_transicoes_por_grupo(df['SITUACAO'], df['COLABORADOR'])
+
+    assert list(resultado) == ['ANA', 'IGOR']
+    for nome, linhas in df.groupby('COLABORADOR', sort=False):
+        contagem, matriz = resultado[nome]
+        # Mesmos eixos para todos os grupos
+        assert list(matriz.index) == ['PENDENTE', 'QUITADO', 'VERIFICADO']
+        if nome == 'ANA':
+            assert contagem == transicoes_linha_a_linha(linhas['SITUACAO'])
+    assert resultado['IGOR'][0] == {('VERIFICADO', 'QUITADO'): 1}
@@ -0,0 +1,151 @@
+import json
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+import vocabulario_status
+from acumulador_metricas import AcumuladorMetricas
+from cache_metricas import CacheMetricas
+from vocabulario_status import (STATUS_CANONICOS, VocabularioStatus, MapeamentoStatus,
+                                status_mais_proximo, distancia_edicao)
+
+
+def test_grafias_equivalentes_tem_o_mesmo_codigo():
+    vocabulario = VocabularioStatus()
+
+    codigos = vocabulario.codificar(['PENDENTE', ' pendente', 'Análise', 'ANALISE', None, 'EM  ANÁLISE', np.nan])
+
+    assert codigos.tolist() == [STATUS_CANONICOS.index('PENDENTE')] * 2 + [STATUS_CANONICOS.index('ANÁLISE')] * 2 \
+        + [-1, STATUS_CANONICOS.index('EM ANÁLISE'), -1]
+    assert len(vocabulario) == len(STATUS_CANONICOS)
+
+
+def test_desconhecidos_recebem_codigos_seguintes():
+    vocabulario = VocabularioStatus()
+
+    codigos = vocabulario.codificar(['OUTROS ACORDOS', 'QUITADO', 'outros  acordos', 'ACORDO'])
+
+    assert codigos.tolist() == [len(STATUS_CANONICOS), STATUS_CANONICOS.index('QUITADO'),
+                                len(STATUS_CANONICOS), len(STATUS_CANONICOS) + 1]
+    assert vocabulario.rotulo(len(STATUS_CANONICOS)) == 'OUTROS ACORDOS'
+    contagem = vocabulario.contar(codigos)
+    assert len(contagem) == len(vocabulario)
+    assert vocabulario.distribuicao(contagem) == {'OUTROS ACORDOS': 2, 'QUITADO': 1, 'ACORDO': 1}
+
+
+def test_contagens_de_colaboradores_somam_em_um_array():
+    vocabulario = VocabularioStatus()
+    ana = vocabulario.contar(vocabulario.codificar(['PENDENTE', 'QUITADO']))
+    igor = vocabulario.contar(vocabulario.codificar(['PENDENTE', 'NOVO STATUS']))
+
+    total = vocabulario.somar(ana, igor)
+
+    assert vocabulario.distribuicao(total) == {'PENDENTE': 2, 'QUITADO': 1, 'NOVO STATUS': 1}
+    assert vocabulario.pendentes()[vocabulario.codigo('PENDENTE')]
+
+
+def test_acumulador_serializado_remapeia_codigos(monkeypatch):
+    # Vocabulário do processo que gravou o estado: desconhecido com o primeiro código livre
+    monkeypatch.setattr(vocabulario_status, '_vocabulario_padrao', VocabularioStatus())
+    acumulador = AcumuladorMetricas()
+    acumulador.adicionar(pd.DataFrame({
+        'DATA': pd.to_datetime(['2025-02-17', '2025-02-18', '2025-02-18']),
+        'STATUS': ['ACORDO', 'PENDENTE', 'ACORDO']
+    }))
+    esperado = acumulador.metricas('ANA')
+    gravado = pickle.dumps(acumulador)
+
+    # Outro processo, em que outro desconhecido já ocupou aquele código
+    novo = VocabularioStatus()
+    novo.codigo('OUTROS ACORDOS')
+    monkeypatch.setattr(vocabulario_status, '_vocabulario_padrao', novo)
+    restaurado = pickle.loads(gravado)
+
+    assert restaurado.vocabulario is novo
+    assert restaurado.metricas('ANA') == esperado
+    assert esperado['distribuicao_status'] == {'ACORDO': 2, 'PENDENTE': 1}
+    assert esperado['taxa_eficiencia'] == round(2 / 3, 3)
+
+
+def test_grafias_aproximadas_resolvidas_uma_vez_por_instalacao(tmp_path):
+    arquivo = str(tmp_path / 'mapeamento.json')
+    vocabulario = VocabularioStatus(mapeamento=MapeamentoStatus(arquivo))
+
+    codigos = vocabulario.codificar(['EM ANALIZE', 'Verifcado', 'VERIFCADO', 'OUTROS ACORDOS', 'OK'])
+
+    assert [vocabulario.rotulo(codigo) for codigo in codigos] == \
+        ['EM ANÁLISE', 'VERIFICADO', 'VERIFICADO', 'OUTROS ACORDOS', 'OK']
+    assert vocabulario.canonico('Verifcado') == 'VERIFICADO' and vocabulario.canonico('OK') is None
+
+    # Outra execução: tudo vem do registro, sem nova aproximação
+    mapeamento = MapeamentoStatus(arquivo)
+    VocabularioStatus(mapeamento=mapeamento).codificar(['EM ANALIZE', 'VERIFCADO', 'OUTROS ACORDOS'])
+    assert (mapeamento.acertos, mapeamento.falhas) == (3, 0)
+    assert mapeamento.mapeamento(origem='aproximado')['VERIFCADO'] == {
+        'status': 'VERIFICADO', 'origem': 'aproximado', 'distancia': 1, 'exemplo': 'Verifcado'
+    }
+
+
+def test_entradas_fixadas_prevalecem(tmp_path):
+    mapeamento = MapeamentoStatus(str(tmp_path / 'mapeamento.json'))
+    mapeamento.fixar('Outros acordos', 'quitado')
+    mapeamento.fixar('QUITADA', None)
+
+    vocabulario = VocabularioStatus(mapeamento=mapeamento)
+
+    assert vocabulario.canonico('OUTROS ACORDOS') == 'QUITADO'
+    assert vocabulario.canonico('QUITADA') is None
+    with pytest.raises(ValueError):
+        mapeamento.fixar('X', 'INEXISTENTE')
+
+
+def test_empate_entre_status_nao_aproxima():
+    assert status_mais_proximo('PRIORIDADE TOTA') == ('PRIORIDADE TOTAL', 1)
+    assert status_mais_proximo('ABCE', canonicos=('ABCD', 'ABCF')) == (None, None)
+    assert status_mais_proximo('XXXX') == (None, None)
+    assert distancia_edicao('QUITADO', 'QUITADA') == 1
+    assert distancia_edicao('PENDENTE', 'CANCELADO', limite=2) == 3
+
+
+def test_plurais_e_femininos_continuam_status_proprios(tmp_path):
+    arquivo = tmp_path / 'mapeamento.json'
+    # Mapeamento gravado pela regra anterior, que associava o plural ao singular
+    arquivo.write_text(json.dumps({'VERIFICADOS': {'status': 'VERIFICADO', 'origem': 'aproximado',
+                                                   'distancia': 1, 'exemplo': 'VERIFICADOS'}}))
+    vocabulario = VocabularioStatus(mapeamento=MapeamentoStatus(str(arquivo)))
+
+    codigos = vocabulario.codificar(['VERIFICADOS', 'PENDENTES', 'QUITADA', 'CANCELADA', 'VERIFICADO'])
+
+    assert [vocabulario.rotulo(codigo) for codigo in codigos] == \
+        ['VERIFICADOS', 'PENDENTES', 'QUITADA', 'CANCELADA', 'VERIFICADO']
+    assert vocabulario.distribuicao(vocabulario.contar(codigos))['VERIFICADOS'] == 1
+    assert status_mais_proximo('VERIFICADOS') == (None, None)
+    assert status_mais_proximo('PRIORIDADES TOTAL') == (None, None)
+    assert MapeamentoStatus(str(arquivo)).mapeamento()['VERIFICADOS']['status'] is None
+
+
+def test_processos_mesclam_o_mapeamento_e_fixacoes_valem_em_execucao(tmp_path):
+    arquivo = str(tmp_path / 'mapeamento.json')
+    # Duas instâncias carregadas antes de qualquer gravação (processos distintos)
+    primeiro, segundo = MapeamentoStatus(arquivo), MapeamentoStatus(arquivo)
+    vocabulario = VocabularioStatus(mapeamento=primeiro)
+    cache = CacheMetricas(str(tmp_path / 'metricas'), mapeamento=primeiro)
+    chave_antes = cache.chave('origem', 'ANA', 'impressao')
+
+    assert vocabulario.canonico('OUTROS ACORDOS') is None
+    segundo.fixar('Outros acordos', 'QUITADO')
+    primeiro.resolver('VERIFCADO')
+
+    registros = MapeamentoStatus(arquivo).mapeamento()
+    assert registros['OUTROS ACORDOS']['origem'] == 'fixado'
+    assert registros['VERIFCADO']['status'] == 'VERIFICADO'
+
+    # A fixação vale no processo já em execução e invalida as métricas
+    codigos = vocabulario.codificar(['OUTROS ACORDOS', 'VERIFCADO', 'OK', 'OK'])
+    assert [vocabulario.rotulo(codigo) for codigo in codigos] == ['QUITADO', 'VERIFICADO', 'OK', 'OK']
+    assert cache.chave('origem', 'ANA', 'impressao') != chave_antes
+
+    # Uma aproximação tardia não sobrescreve a entrada fixada
+    MapeamentoStatus(arquivo)._gravar('OUTROS ACORDOS', {'status': None, 'origem': 'desconhecido',
+                                                         'distancia': None, 'exemplo': 'OUTROS ACORDOS'})
+    assert MapeamentoStatus(arquivo).mapeamento()['OUTROS ACORDOS']['status'] == 'QUITADO'
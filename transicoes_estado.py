@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Transições de Estado
+====================
+Contagem vetorizada das transições de SITUACAO entre registros consecutivos.
+Cada situação recebe o código do vocabulário de status (grafias
+equivalentes, como 'Pendente ' e 'PENDENTE', viram o mesmo estado) e os
+pares (anterior, atual) saem da comparação do array de códigos com ele
+mesmo deslocado de uma posição, sem percorrer as linhas em Python.
+
+Conta-se uma transição quando as duas situações estão preenchidas e são
+diferentes; um valor vazio no meio interrompe a sequência (A, vazio, B não
+conta A -> B), como no laço original sobre iterrows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from vocabulario_status import obter_vocabulario_padrao
+
+
+def _codigos_pares(situacoes, grupos):
+    """Códigos das situações e máscara dos pares (i-1, i) que contam como transição"""
+    vocabulario = obter_vocabulario_padrao()
+    codigos_status = vocabulario.codificar(situacoes)
+    # Estados renumerados na ordem de aparição (eixos das matrizes)
+    codigos = np.full(len(codigos_status), -1, dtype=np.int64)
+    preenchidos = codigos_status >= 0
+    codigos[preenchidos], usados = pd.factorize(codigos_status[preenchidos], sort=False)
+    estados = [vocabulario.rotulo(codigo) for codigo in usados]
+    anterior, atual = codigos[:-1], codigos[1:]
+    validos = (anterior >= 0) & (atual >= 0) & (anterior != atual)
+    if grupos is not None:
+        # Pares só dentro do mesmo grupo
+        validos &= (grupos[:-1] == grupos[1:]) & (grupos[1:] >= 0)
+    return codigos, estados, validos
+
+
+def _contagem_e_matriz(de, para, estados):
+    """Dicionário {(de, para): contagem} na ordem da primeira ocorrência e matriz densa estados x estados"""
+    total_estados = len(estados)
+    pares = de * total_estados + para
+    matriz = np.bincount(pares, minlength=total_estados * total_estados).reshape(total_estados, total_estados)
+    contagem = {
+        (estados[par // total_estados], estados[par % total_estados]): int(matriz.flat[par])
+        for par in pd.unique(pares)
+    }
+    return contagem, pd.DataFrame(matriz, index=estados, columns=estados)
+
+
+def contar_transicoes(situacoes):
+    """
+    Conta as transições de estado de uma sequência já ordenada (ex.: por data).
+
+    Args:
+        situacoes (Series | array): Situações na ordem cronológica
+
+    Returns:
+        tuple: (dict {(de, para): contagem} na ordem da primeira ocorrência,
+            DataFrame estados x estados com as contagens; linhas = de, colunas = para)
+    """
+    codigos, estados, validos = _codigos_pares(situacoes, None)
+    posicoes = np.flatnonzero(validos)
+    return _contagem_e_matriz(codigos[posicoes], codigos[posicoes + 1], estados)
+
+
+def contar_transicoes_por_grupo(situacoes, grupos):
+    """
+    Conta as transições de vários grupos (ex.: colaboradores) em uma única chamada.
+
+    As linhas devem estar ordenadas cronologicamente dentro de cada grupo,
+    com os registros de um grupo contíguos (ex.: df.sort_values([grupo, data])).
+    Todas as matrizes usam os mesmos eixos (as situações do conjunto inteiro),
+    para que possam ser comparadas ou somadas entre grupos.
+
+    Args:
+        situacoes (Series | array): Situações
+        grupos (Series | array): Grupo de cada linha; linhas sem grupo são ignoradas
+
+    Returns:
+        dict: (contagem, matriz) por grupo, como em contar_transicoes, na ordem de aparição
+    """
+    codigos_grupo, nomes_grupo = pd.factorize(np.asarray(grupos, dtype=object), sort=False)
+    codigos, estados, validos = _codigos_pares(situacoes, codigos_grupo)
+    posicoes = np.flatnonzero(validos)
+    de, para, grupo_par = codigos[posicoes], codigos[posicoes + 1], codigos_grupo[posicoes + 1]
+
+    # Pares agrupados por grupo sem embaralhar a ordem de ocorrência dentro de cada um
+    ordem = np.argsort(grupo_par, kind='stable')
+    limites = np.searchsorted(grupo_par[ordem], np.arange(len(nomes_grupo) + 1))
+    resultado = {}
+    for codigo, nome in enumerate(nomes_grupo):
+        selecionados = ordem[limites[codigo]:limites[codigo + 1]]
+        resultado[nome] = _contagem_e_matriz(de[selecionados], para[selecionados], estados)
+    return resultado
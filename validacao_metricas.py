@@ -5,6 +5,9 @@ from collections import defaultdict
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from leitor_excel import ler_abas
+from qualidade_situacao import colunas_situacao_data, calcular_qualidade_abas
+
 def validar_metricas_qualidade(arquivo_julio, arquivo_leandro):
     """
     Valida as métricas de qualidade dos colaboradores e gera provas visuais
@@ -49,88 +52,43 @@ def validar_metricas_qualidade(arquivo_julio, arquivo_leandro):
         
         print(f"Processando arquivo: {os.path.basename(arquivo)}")
         
-        # Ler todas as abas do Excel
-        xls = pd.ExcelFile(arquivo)
-        
-        for colaborador in colaboradores_validar:
-            if colaborador not in xls.sheet_names:
-                continue
-            
+        # Abrir o arquivo uma única vez e ler apenas as abas a validar
+        abas = []
+        for colaborador, df in ler_abas(arquivo, filtro=lambda aba: aba in colaboradores_validar):
             print(f"Validando métricas de: {colaborador}")
             
-            # Ler dados do colaborador
+            # Normalizar nomes das colunas
+            df.columns = [str(col).strip().upper() for col in df.columns]
+            
+            # Verificar se a coluna SITUACAO existe
+            if colunas_situacao_data(df.columns)[0] is None:
+                print(f"  ERRO: Coluna SITUACAO não encontrada para {colaborador}")
+                continue
+            abas.append((colaborador, df))
+        
+        # Calcular o score de todas as abas do arquivo em uma única passada
+        qualidade = calcular_qualidade_abas(abas)
+        
+        for colaborador, df in abas:
             try:
-                df = pd.read_excel(arquivo, sheet_name=colaborador)
-                
-                # Normalizar nomes das colunas
-                df.columns = [str(col).strip().upper() for col in df.columns]
-                
-                # Verificar se a coluna SITUACAO existe
-                if 'SITUACAO' not in df.columns and 'SITUAÇÃO' not in df.columns:
-                    print(f"  ERRO: Coluna SITUACAO não encontrada para {colaborador}")
-                    continue
-                
-                # Normalizar nome da coluna SITUACAO
-                if 'SITUAÇÃO' in df.columns:
-                    df = df.rename(columns={'SITUAÇÃO': 'SITUACAO'})
-                
-                # Calcular métricas
-                total_registros = len(df)
-                registros_vazios = df['SITUACAO'].isna().sum()
-                valores_unicos = df['SITUACAO'].dropna().unique()
-                
-                # Verificar padrões de preenchimento
-                valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE', 'CONCLUIDO']
-                valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
-                
-                # Calcular métricas de qualidade
-                taxa_preenchimento = (total_registros - registros_vazios) / total_registros if total_registros > 0 else 0
-                taxa_padronizacao = (len(valores_unicos) - len(valores_nao_padronizados)) / len(valores_unicos) if len(valores_unicos) > 0 else 0
-                
-                # Verificar consistência nas atualizações diárias
-                consistencia_diaria = 0
-                tem_data = False
-                
-                # Verificar se há coluna de data
-                for col in df.columns:
-                    if 'DATA' in col:
-                        tem_data = True
-                        try:
-                            df[col] = pd.to_datetime(df[col], errors='coerce')
-                            # Agrupar por data e contar atualizações de status
-                            atualizacoes = df.groupby(df[col].dt.date)['SITUACAO'].count()
-                            if len(atualizacoes) > 1:
-                                std_atualizacoes = atualizacoes.std()
-                                media_atualizacoes = atualizacoes.mean()
-                                
-                                # Coeficiente de variação (menor é melhor)
-                                if media_atualizacoes > 0:
-                                    consistencia_diaria = 1 - min(1, std_atualizacoes / media_atualizacoes)
-                        except:
-                            pass
-                
-                # Calcular score geral de qualidade
-                score_qualidade = (
-                    0.4 * taxa_preenchimento +  # 40% para preenchimento
-                    0.3 * taxa_padronizacao +   # 30% para padronização
-                    0.3 * consistencia_diaria   # 30% para consistência diária
-                ) * 100
+                metricas = qualidade.loc[colaborador]
+                score_qualidade = metricas['score_qualidade']
                 
                 # Armazenar métricas recalculadas
                 metricas_recalculadas[colaborador] = {
                     'grupo': grupo,
-                    'total_registros': total_registros,
-                    'registros_vazios': registros_vazios,
-                    'taxa_preenchimento': taxa_preenchimento * 100,
-                    'valores_nao_padronizados': valores_nao_padronizados,
-                    'taxa_padronizacao': taxa_padronizacao * 100,
-                    'consistencia_diaria': consistencia_diaria * 100,
+                    'total_registros': int(metricas['total_registros']),
+                    'registros_vazios': int(metricas['registros_vazios']),
+                    'taxa_preenchimento': metricas['taxa_preenchimento'] * 100,
+                    'valores_nao_padronizados': metricas['valores_nao_padronizados'],
+                    'taxa_padronizacao': metricas['taxa_padronizacao'] * 100,
+                    'consistencia_diaria': metricas['consistencia_diaria'] * 100,
                     'score_qualidade': score_qualidade
                 }
                 
                 # Gerar gráfico de distribuição de situações
                 plt.figure(figsize=(10, 6))
-                contagem_valores = df['SITUACAO'].value_counts()
+                contagem_valores = df[colunas_situacao_data(df.columns)[0]].value_counts()
                 sns.barplot(x=contagem_valores.index, y=contagem_valores.values)
                 plt.title(f'Distribuição de Situações - {colaborador}')
                 plt.xlabel('Situação')
@@ -143,7 +101,7 @@ def validar_metricas_qualidade(arquivo_julio, arquivo_leandro):
                 plt.savefig(grafico_path)
                 plt.close()
                 
-                print(f"  Score recalculado: {score_qualidade:.1f} pontos")
+                print(f"  {colaborador}: score recalculado {score_qualidade:.1f} pontos")
                 
                 # Comparar com resultados salvos
                 if colaborador in resultados_salvos.get(grupo, {}):
@@ -18,6 +18,8 @@ from collections import defaultdict, Counter
 
 # Importações locais
 from debug_excel import AnalisadorExcel
+from transicoes_estado import contar_transicoes
+from vocabulario_status import SITUACOES_SEM_CONCLUIDO
 from analise_360 import Analise360
 from data_analysis_pipeline import DataAnalysisPipeline
 
@@ -84,9 +86,8 @@ def analisar_colaborador(df, nome_aba):
             print(f"\nRegistros com SITUACAO vazia: {registros_vazios} ({registros_vazios/total_registros*100:.1f}%)")
         
         # Valores padronizados
-        valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE']
         valores_unicos = df['SITUACAO'].dropna().unique()
-        valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
+        valores_nao_padronizados = [v for v in valores_unicos if v not in SITUACOES_SEM_CONCLUIDO]
         
         if valores_nao_padronizados:
             print(f"\nValores não padronizados: {', '.join(valores_nao_padronizados)}")
@@ -109,18 +110,8 @@ def analisar_colaborador(df, nome_aba):
                     if 'SITUACAO' in df.columns:
                         df_ordenado = df.sort_values(by=col_data)
                         
-                        # Verificar transições de estado
-                        transicoes = []
-                        situacao_anterior = None
-                        
-                        for idx, row in df_ordenado.iterrows():
-                            situacao_atual = row['SITUACAO']
-                            if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
-                                transicoes.append((situacao_anterior, situacao_atual))
-                            situacao_anterior = situacao_atual
-                        
-                        # Contar transições
-                        contagem_transicoes = Counter(transicoes)
+                        # Contar transições de estado
+                        contagem_transicoes, _ = contar_transicoes(df_ordenado['SITUACAO'])
                         
                         if contagem_transicoes:
                             print("\n  Transições de Estado mais comuns:")
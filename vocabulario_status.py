@@ -0,0 +1,575 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Vocabulário de Status
+=====================
+Lista única dos status/situações conhecidos e a codificação dos valores
+brutos das planilhas (SITUAÇÃO/STATUS) em códigos inteiros pequenos.
+
+Cada valor bruto distinto é normalizado uma única vez (sem acentos, em
+maiúsculas e com espaços simples) e o resultado fica em uma tabela em
+memória; as linhas seguintes com o mesmo valor só consultam a tabela. Os
+status canônicos ocupam os primeiros códigos, sempre os mesmos; valores
+fora da lista recebem os códigos seguintes, na ordem em que aparecem.
+
+Grafias que a normalização não resolve (ex.: 'VERIFCADO', 'EM ANALIZE')
+são aproximadas do status canônico mais próximo por distância de edição.
+Plurais e femininos de um status (ex.: 'VERIFICADOS', 'QUITADA') não são
+erros de digitação: continuam como status próprios, que os relatórios
+leem pelo nome.
+O resultado fica em um mapeamento persistente (MapeamentoStatus), de modo
+que cada grafia é resolvida uma vez por instalação; o mapeamento pode ser
+revisado e ter entradas fixadas à mão:
+
+    python vocabulario_status.py
+    python vocabulario_status.py --fixar "EM ANDAMENTO" "ANÁLISE"
+
+Com os códigos, as contagens por status viram np.bincount e a
+distribuição de um colaborador é um array de tamanho fixo (um contador por
+código), que se soma entre colaboradores com uma única soma de arrays.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import argparse
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+# Status exibidos nos relatórios por colaborador, na ordem das colunas
+STATUS_RELATORIO = (
+    'VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE',
+    'PRIORIDADE TOTAL', 'APROVADO', 'QUITADO', 'APREENDIDO',
+    'CANCELADO'
+)
+
+# Vocabulário fixo: os status do relatório seguidos dos demais aceitos
+STATUS_CANONICOS = STATUS_RELATORIO + ('EM ANÁLISE', 'CONCLUIDO')
+
+# Status considerados pendentes no cálculo da taxa de eficiência
+STATUS_PENDENTES = ('PENDENTE', 'ANÁLISE', 'PRIORIDADE', 'PRIORIDADE TOTAL')
+
+# Valores aceitos como preenchimento padronizado da SITUAÇÃO (score de qualidade)
+SITUACOES_PADRONIZADAS = ('PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE', 'CONCLUIDO')
+
+# Os mesmos valores sem CONCLUIDO, como na análise de SITUAÇÃO por colaborador
+# e no painel interativo (CONCLUIDO conta como não padronizado nesses scores)
+SITUACOES_SEM_CONCLUIDO = tuple(situacao for situacao in SITUACOES_PADRONIZADAS if situacao != 'CONCLUIDO')
+
+# Grafias com menos caracteres que isso não são aproximadas
+TAMANHO_MINIMO_APROXIMACAO = 4
+
+# Distância de edição máxima aceita na aproximação
+DISTANCIA_MAXIMA = 2
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def chave_status(texto):
+    """
+    Forma normalizada de um status: sem acentos, em maiúsculas e com espaços simples.
+
+    Args:
+        texto (str): Valor bruto
+
+    Returns:
+        str: Chave usada para reconhecer grafias equivalentes
+    """
+    sem_acentos = ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.upper().split())
+
+
+def distancia_edicao(a, b, limite=None):
+    """
+    Distância de Levenshtein entre dois textos.
+
+    Args:
+        a (str): Primeiro texto
+        b (str): Segundo texto
+        limite (int, optional): Interrompe o cálculo assim que a distância
+            passar do limite (o retorno é então limite + 1)
+
+    Returns:
+        int: Quantidade mínima de inserções, remoções e trocas
+    """
+    if limite is not None and abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if limite is not None and min(atual) > limite:
+            return limite + 1
+        anterior = atual
+    return anterior[-1]
+
+
+def _radical(chave):
+    """Palavras sem a flexão de número e gênero (S final, depois A/O final)"""
+    palavras = []
+    for palavra in chave.split():
+        if len(palavra) > 3 and palavra.endswith('S'):
+            palavra = palavra[:-1]
+        if len(palavra) > 3 and palavra[-1] in 'AO':
+            palavra = palavra[:-1]
+        palavras.append(palavra)
+    return tuple(palavras)
+
+
+def _variante_flexionada(chave, canonico):
+    """Indica se a grafia é o status no plural ou no feminino (ex.: VERIFICADOS, QUITADA)"""
+    return chave != canonico and _radical(chave) == _radical(canonico)
+
+
+def status_mais_proximo(chave, canonicos=STATUS_CANONICOS):
+    """
+    Status canônico mais próximo de uma grafia já normalizada (chave_status).
+
+    Aceita-se até 1 edição a cada 5 caracteres (no máximo DISTANCIA_MAXIMA);
+    empates entre dois status, e plurais ou femininos de um status
+    (_variante_flexionada), deixam a grafia sem correspondência.
+
+    Returns:
+        tuple: (status canônico ou None, distância ou None)
+    """
+    if len(chave) < TAMANHO_MINIMO_APROXIMACAO:
+        return None, None
+    if any(_variante_flexionada(chave, chave_status(status)) for status in canonicos):
+        return None, None
+    limite = min(DISTANCIA_MAXIMA, max(1, len(chave) // 5))
+    distancias = sorted((distancia_edicao(chave, chave_status(status), limite), status) for status in canonicos)
+    distancia, status = distancias[0]
+    if distancia > limite or (len(distancias) > 1 and distancias[1][0] == distancia):
+        return None, None
+    return status, distancia
+
+
+@contextmanager
+def _trava_arquivo(caminho):
+    """Trava exclusiva entre processos (arquivo auxiliar caminho.lock)"""
+    with open(f'{caminho}.lock', 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class MapeamentoStatus:
+    """
+    Registro persistente das grafias de status resolvidas por aproximação.
+
+    Cada entrada (pela chave normalizada da grafia) guarda o status canônico
+    escolhido (None = status próprio), a origem ('aproximado', 'desconhecido'
+    ou 'fixado') e um exemplo da grafia original. Entradas fixadas nunca são
+    recalculadas.
+
+    O arquivo é compartilhado pelos processos (workers, aplicativos, linha de
+    comando): cada gravação relê o arquivo sob uma trava e acrescenta a
+    entrada nova às gravadas pelos demais, e atualizar() traz para a
+    instância as entradas gravadas depois que ela foi criada.
+
+    Contadores:
+        acertos: grafias já registradas
+        falhas: grafias que precisaram de aproximação
+    """
+
+    def __init__(self, arquivo=os.path.join('cache_planilhas', 'mapeamento_status.json'),
+                 canonicos=STATUS_CANONICOS):
+        self.arquivo = arquivo
+        self.canonicos = tuple(canonicos)
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+        self._assinatura = self._assinatura_arquivo()
+        self._registros = self._ler()
+
+    def _assinatura_arquivo(self):
+        try:
+            info = os.stat(self.arquivo)
+        except OSError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def _ler(self):
+        """Entradas gravadas no arquivo, sem as aproximações revogadas"""
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                registros = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Mapeamento de status inválido: {str(e)}")
+            return {}
+        # Aproximações gravadas por regras anteriores (ex.: plural associado
+        # ao singular) são descartadas e refeitas na próxima ocorrência
+        return {chave: registro for chave, registro in registros.items()
+                if registro.get('origem') != 'aproximado'
+                or status_mais_proximo(chave, self.canonicos)[0] == registro.get('status')}
+
+    def _mesclar(self, gravados):
+        """Entradas do arquivo acrescidas das que só esta instância conhece"""
+        registros = dict(gravados)
+        for chave, registro in self._registros.items():
+            registros.setdefault(chave, registro)
+        return registros
+
+    def atualizar(self):
+        """
+        Incorpora as entradas gravadas por outros processos (uma consulta
+        ao arquivo quando nada mudou).
+
+        Returns:
+            bool: True se o arquivo mudou desde a última leitura
+        """
+        assinatura = self._assinatura_arquivo()
+        if assinatura == self._assinatura:
+            return False
+        with self._trava:
+            self._registros = self._mesclar(self._ler())
+            self._assinatura = assinatura
+        return True
+
+    def versao(self):
+        """
+        Identifica as entradas fixadas; muda quando uma grafia é fixada.
+
+        As demais entradas seguem a regra de aproximação e não mudam o
+        resultado, por isso não entram na versão.
+
+        Returns:
+            str: Hash curto das entradas fixadas
+        """
+        self.atualizar()
+        fixadas = sorted((chave, registro['status']) for chave, registro in self._registros.items()
+                         if registro.get('origem') == 'fixado')
+        return hashlib.sha1(json.dumps(fixadas, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    def resolver(self, chave, exemplo=None):
+        """
+        Status canônico de uma grafia, aproximando-a se ainda não registrada.
+
+        Args:
+            chave (str): Grafia normalizada (chave_status)
+            exemplo (str, optional): Grafia original, guardada para revisão
+
+        Returns:
+            str | None: Status canônico, ou None se a grafia é um status próprio
+        """
+        registro = self._registros.get(chave)
+        if registro is not None:
+            self.acertos += 1
+            return registro['status']
+
+        self.falhas += 1
+        status, distancia = status_mais_proximo(chave, self.canonicos)
+        self._gravar(chave, {
+            'status': status,
+            'origem': 'aproximado' if status is not None else 'desconhecido',
+            'distancia': distancia,
+            'exemplo': chave if exemplo is None else exemplo
+        })
+        # Outro processo pode ter registrado (ou fixado) a grafia antes
+        return self._registros[chave]['status']
+
+    def fixar(self, grafia, status):
+        """
+        Fixa o status de uma grafia (vale para os vocabulários criados depois).
+
+        Args:
+            grafia (str): Grafia como aparece nas planilhas
+            status (str | None): Status canônico, ou None para manter a
+                grafia como status próprio
+        """
+        if status is not None:
+            # Aceita o status em qualquer grafia normalizável (ex.: 'analise')
+            canonicos = {chave_status(canonico): canonico for canonico in self.canonicos}
+            if chave_status(status) not in canonicos:
+                raise ValueError(f"Status fora do vocabulário: {status}")
+            status = canonicos[chave_status(status)]
+        self._gravar(chave_status(str(grafia)), {
+            'status': status,
+            'origem': 'fixado',
+            'distancia': None,
+            'exemplo': str(grafia)
+        }, substituir=True)
+
+    def mapeamento(self, origem=None):
+        """
+        Entradas registradas, para revisão.
+
+        Args:
+            origem (str, optional): Filtra pela origem (ex.: 'aproximado')
+
+        Returns:
+            dict: {chave: {'status', 'origem', 'distancia', 'exemplo'}}
+        """
+        return {chave: dict(registro) for chave, registro in self._registros.items()
+                if origem is None or registro['origem'] == origem}
+
+    def _gravar(self, chave, registro, substituir=False):
+        """
+        Grava uma entrada sem descartar as gravadas por outros processos.
+
+        Sob a trava do arquivo, o mapeamento é relido e mesclado antes de ser
+        regravado. Uma entrada já existente no arquivo (ex.: fixada por outro
+        processo) prevalece, a menos que substituir=True (fixar).
+        """
+        with self._trava:
+            try:
+                os.makedirs(os.path.dirname(self.arquivo) or '.', exist_ok=True)
+                with _trava_arquivo(self.arquivo):
+                    registros = self._mesclar(self._ler())
+                    if substituir:
+                        registros[chave] = registro
+                    else:
+                        registros.setdefault(chave, registro)
+                    temporario = f'{self.arquivo}.tmp'
+                    with open(temporario, 'w', encoding='utf-8') as f:
+                        json.dump(registros, f, ensure_ascii=False, indent=2)
+                    os.replace(temporario, self.arquivo)
+                    self._registros = registros
+                    self._assinatura = self._assinatura_arquivo()
+            except OSError as e:
+                logger.warning(f"Falha ao gravar mapeamento de status: {str(e)}")
+                if substituir:
+                    self._registros[chave] = registro
+                else:
+                    self._registros.setdefault(chave, registro)
+
+
+class VocabularioStatus:
+    """Códigos inteiros dos status (canônicos primeiro, desconhecidos em seguida)"""
+
+    def __init__(self, canonicos=STATUS_CANONICOS, pendentes=STATUS_PENDENTES, mapeamento=None):
+        """
+        Args:
+            canonicos (iterable): Status com códigos fixos 0, 1, 2, ...
+            pendentes (iterable): Status considerados pendentes
+            mapeamento (MapeamentoStatus, optional): Resolve grafias fora do
+                vocabulário; sem ele, só a normalização é aplicada
+        """
+        self.mapeamento = None
+        self.rotulos = []
+        self._por_chave = {}
+        # Grafias sem status canônico -> código próprio (reaproveitado se a
+        # grafia for resolvida de novo)
+        self._proprios = {}
+        # Tabela de normalização: valor bruto -> código
+        self._por_valor = {}
+        self._trava = threading.Lock()
+        for status in canonicos:
+            self.codigo(status)
+        self.total_canonicos = len(self.rotulos)
+        self._pendentes = {self.codigo(status) for status in pendentes}
+        self._canonicos = dict(self._por_chave)
+        self.mapeamento = mapeamento
+        self._versao_mapeamento = mapeamento.versao() if mapeamento is not None else None
+
+    def __len__(self):
+        return len(self.rotulos)
+
+    def codigo(self, valor):
+        """
+        Código de um valor bruto (registrando-o se for desconhecido).
+
+        Returns:
+            int: Código do status, ou -1 para valores vazios (None/NaN)
+        """
+        try:
+            return self._por_valor[valor]
+        except KeyError:
+            pass
+        except TypeError:
+            # Valor não hashable: usa o texto
+            valor = str(valor)
+        if pd.isna(valor):
+            return -1
+
+        texto = valor if isinstance(valor, str) else str(valor)
+        chave = chave_status(texto)
+        with self._trava:
+            codigo = self._por_chave.get(chave)
+            if codigo is None and self.mapeamento is not None:
+                status = self.mapeamento.resolver(chave, texto)
+                if status is not None:
+                    codigo = self._por_chave.get(chave_status(status))
+            if codigo is None:
+                codigo = self._proprios.get(chave)
+            if codigo is None:
+                codigo = len(self.rotulos)
+                # Desconhecidos são exibidos como a primeira grafia vista (sem espaços extras)
+                self.rotulos.append(' '.join(texto.split()) if isinstance(valor, str) else valor)
+                self._proprios[chave] = codigo
+            self._por_chave[chave] = codigo
+            self._por_valor[valor] = codigo
+        return codigo
+
+    def codificar(self, valores):
+        """
+        Converte uma coluna de status em códigos (um acesso à tabela por valor distinto).
+
+        Args:
+            valores (Series | array): Valores brutos
+
+        Returns:
+            ndarray: Códigos int64 (-1 nos valores vazios)
+        """
+        self._sincronizar()
+        posicoes, distintos = pd.factorize(np.asarray(valores, dtype=object), sort=False)
+        mapa = np.fromiter((self.codigo(valor) for valor in distintos), dtype=np.int64, count=len(distintos))
+        # O último elemento atende às posições vazias (-1 do factorize)
+        return np.append(mapa, -1)[posicoes]
+
+    def _sincronizar(self):
+        """Volta a resolver as grafias já vistas se alguma foi fixada desde então"""
+        if self.mapeamento is None:
+            return
+        versao = self.mapeamento.versao()
+        if versao == self._versao_mapeamento:
+            return
+        with self._trava:
+            self._versao_mapeamento = versao
+            self._por_chave = dict(self._canonicos)
+            self._por_valor = {}
+
+    def rotulo(self, codigo):
+        """Status exibido para um código"""
+        return self.rotulos[codigo]
+
+    def canonico(self, valor):
+        """
+        Status canônico de um valor bruto.
+
+        Returns:
+            str | None: Status do vocabulário fixo, ou None se o valor é vazio
+                ou não corresponde a nenhum
+        """
+        codigo = self.codigo(valor)
+        return self.rotulos[codigo] if 0 <= codigo < self.total_canonicos else None
+
+    def pendentes(self, tamanho=None):
+        """
+        Máscara dos códigos pendentes.
+
+        Args:
+            tamanho (int, optional): Tamanho da máscara (padrão: códigos atuais)
+
+        Returns:
+            ndarray: bool, True nos códigos de status pendentes
+        """
+        mascara = np.zeros(len(self) if tamanho is None else tamanho, dtype=bool)
+        mascara[[codigo for codigo in self._pendentes if codigo < len(mascara)]] = True
+        return mascara
+
+    def contar(self, codigos, pesos=None):
+        """
+        Contagem por código (códigos vazios são ignorados).
+
+        Returns:
+            ndarray: int64 com um contador por código do vocabulário
+        """
+        codigos = np.asarray(codigos)
+        validos = codigos >= 0
+        if pesos is not None:
+            pesos = np.asarray(pesos)[validos]
+        contagem = np.bincount(codigos[validos], weights=pesos, minlength=len(self))
+        return contagem.astype(np.int64) if pesos is None else contagem
+
+    def somar(self, *contagens):
+        """Soma contagens por código de tamanhos diferentes (vocabulário crescido entre elas)"""
+        total = np.zeros(max([len(self)] + [len(contagem) for contagem in contagens]), dtype=np.int64)
+        for contagem in contagens:
+            total[:len(contagem)] += contagem
+        return total
+
+    def distribuicao(self, contagem, ordem=None):
+        """
+        Dicionário {status: contagem} dos códigos com contagem positiva.
+
+        Args:
+            contagem (ndarray): Contagem por código
+            ordem (iterable, optional): Códigos na ordem de desempate; por
+                padrão, a ordem dos códigos
+
+        Returns:
+            dict: Status em ordem decrescente de contagem
+        """
+        if ordem is None:
+            ordem = range(len(contagem))
+        codigos = [codigo for codigo in ordem if codigo < len(contagem) and contagem[codigo] > 0]
+        codigos.sort(key=lambda codigo: -contagem[codigo])
+        return {self.rotulos[codigo]: int(contagem[codigo]) for codigo in codigos}
+
+
+_mapeamento_padrao = None
+_vocabulario_padrao = None
+
+
+def obter_mapeamento_padrao():
+    """
+    Retorna o mapeamento de grafias compartilhado.
+
+    Fica dentro do diretório do cache de planilhas (CACHE_PLANILHAS_DIR).
+    """
+    global _mapeamento_padrao
+    if _mapeamento_padrao is None:
+        _mapeamento_padrao = MapeamentoStatus(
+            os.path.join(os.environ.get('CACHE_PLANILHAS_DIR', 'cache_planilhas'), 'mapeamento_status.json')
+        )
+    return _mapeamento_padrao
+
+
+def obter_vocabulario_padrao():
+    """Retorna o vocabulário compartilhado pelo processo (com o mapeamento padrão)"""
+    global _vocabulario_padrao
+    if _vocabulario_padrao is None:
+        _vocabulario_padrao = VocabularioStatus(mapeamento=obter_mapeamento_padrao())
+    return _vocabulario_padrao
+
+
+def main():
+    """Exibe o mapeamento de grafias e permite fixar entradas"""
+    parser = argparse.ArgumentParser(description='Revisão do mapeamento de grafias de status')
+    parser.add_argument('--fixar', nargs=2, metavar=('GRAFIA', 'STATUS'),
+                        help='Fixa o status canônico de uma grafia')
+    parser.add_argument('--manter', metavar='GRAFIA',
+                        help='Fixa uma grafia como status próprio (sem aproximação)')
+    args = parser.parse_args()
+
+    mapeamento = obter_mapeamento_padrao()
+    if args.fixar:
+        mapeamento.fixar(*args.fixar)
+    if args.manter:
+        mapeamento.fixar(args.manter, None)
+
+    for chave, registro in sorted(mapeamento.mapeamento().items()):
+        status = registro['status'] or '(status próprio)'
+        print(f"{registro['exemplo']:30} -> {status:20} [{registro['origem']}]")
+
+
+if __name__ == "__main__":
+    main()